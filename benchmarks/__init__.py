@@ -0,0 +1,2 @@
+# SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
+# SPDX-License-Identifier: MIT
@@ -0,0 +1,136 @@
+# SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+import random
+import shutil
+from typing import List
+
+import onecode
+from onecode import Env
+
+_SKELETON = os.path.join(os.path.dirname(onecode.__file__), 'cli', 'skeleton')
+
+# Element statements cycled through when generating a flow, formatted with the element key.
+# `{out}` is the relative output path used by `file_output`: it may be an f-string expression.
+_ELEMENTS = [
+    "oc.slider('{key}', 0.5, min=0, max=1, step=0.1)",
+    "oc.number_input('{key}', 1.5, min=0, max=10)",
+    "oc.checkbox('{key}', True)",
+    "oc.dropdown('{key}', 'A', options=['A', 'B', 'C'])",
+    "oc.text_input('{key}', 'OneCode')",
+    "oc.radio_button('{key}', 'B', options=['A', 'B'])",
+    "oc.file_output('{key}', f'{out}', make_path=True)",
+]
+
+
+def _element_lines(
+    prefix: str,
+    count: int,
+    out_dir: str,
+    indent: str = '    '
+) -> List[str]:
+    lines = []
+    for j in range(count):
+        key = f'{prefix}_e{j}'
+        stmt = _ELEMENTS[j % len(_ELEMENTS)]
+
+        if 'file_output' in stmt:
+            # outputs re-use the flow input DataFrame so that archiving has real data to process
+            out = stmt.format(key=key, out=f'{out_dir}/{key}.csv')
+            lines.append(f"{indent}out_{j} = {out}")
+            lines.append(f"{indent}df.to_csv(out_{j}, index=False)")
+        else:
+            lines.append(f"{indent}{key} = {stmt.format(key=key)}")
+
+    return lines
+
+
+def generate_project(
+    path: str,
+    flows: int = 4,
+    elements: int = 14,
+    helpers: int = 2,
+    depth: int = 3,
+    csv_rows: int = 1000,
+    seed: int = 0
+) -> str:
+    """
+    Generate a synthetic OneCode project, typically used for benchmarking.
+
+    Each flow reads its own CSV input through `csv_reader`, then calls half of its elements
+    directly from `run()` and the other half at the bottom of a helper call chain of the given
+    depth, so that the call graph processing has something to walk through. Elements cycle
+    through the built-in input elements and `file_output`.
+
+    Args:
+        path: Path of the project folder to generate: it is overwritten if it already exists.
+        flows: Number of flows.
+        elements: Number of elements per flow (excluding the CSV reader).
+        helpers: Number of helper modules shared by the flows. If 0, all elements are called
+            directly from `run()`.
+        depth: Call depth of each helper module chain.
+        csv_rows: Number of rows of each flow CSV input.
+        seed: Random seed used to generate the CSV data.
+
+    Returns:
+        The path to the generated project.
+
+    """
+    if os.path.exists(path):
+        shutil.rmtree(path)
+
+    shutil.copytree(_SKELETON, path)
+    flows_dir = os.path.join(path, 'flows')
+    data_dir = os.path.join(path, 'data')
+
+    rng = random.Random(seed)
+    depth = max(depth, 1)
+
+    for k in range(helpers):
+        lines = ['import onecode as oc', '', '']
+        for d in range(depth - 1):
+            lines += [f'def level_{d}(df):', f'    return level_{d + 1}(df)', '', '']
+
+        # helpers are shared: element keys are scoped by helper so that they stay unique,
+        # outputs are scoped by the running flow so that they don't overwrite each others
+        lines.append(f'def level_{depth - 1}(df):')
+        lines += _element_lines(
+            f'h{k}',
+            elements - elements // 2,
+            '{oc.Project().current_flow}'
+        )
+        lines += ['    return df', '']
+
+        with open(os.path.join(flows_dir, f'helper_{k}.py'), 'w') as f:
+            f.write('\n'.join(lines))
+
+    config = []
+    for i in range(flows):
+        flow_id = f'flow_{i}'
+
+        with open(os.path.join(data_dir, f'input_{i}.csv'), 'w') as f:
+            f.write('x,y,z\n')
+            for _ in range(csv_rows):
+                f.write(f'{rng.random()},{rng.random()},{rng.randint(0, 100)}\n')
+
+        direct = elements if helpers == 0 else elements // 2
+        lines = ['import onecode as oc']
+        if helpers > 0:
+            lines += ['', f'from .helper_{i % helpers} import level_0']
+        lines += ['', '', 'def run():', f"    df = oc.csv_reader('f{i}_csv', 'input_{i}.csv')"]
+        lines += _element_lines(f'f{i}', direct, flow_id)
+        if helpers > 0:
+            lines.append('    level_0(df)')
+        lines.append('')
+
+        with open(os.path.join(flows_dir, f'{flow_id}.py'), 'w') as f:
+            f.write('\n'.join(lines))
+
+        config.append({"file": flow_id, "label": f'Flow {i}', "attributes": {}})
+
+    with open(os.path.join(path, Env.ONECODE_CONFIG_FILE), 'w') as f:
+        json.dump(config, f, indent=4)
+
+    return path
@@ -0,0 +1,591 @@
+# SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
+# SPDX-License-Identifier: MIT
+
+import argparse
+import contextlib
+import datetime
+import importlib.util
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import onecode
+from onecode import Env, Mode, Project
+from onecode.cli.batch import run_batch
+from onecode.cli.build import extract_gui
+from onecode.cli.extract import extract_json
+from onecode.cli.start import SOCKET_FILE, submit
+from onecode.cli.utils import process_call_graph
+from onecode.cli.zip import tar_output, zip_output
+
+from .generate import generate_project
+
+# Results are written with this schema version: bump it whenever the format changes so that
+# comparisons between incompatible result files can be detected.
+RESULTS_VERSION = 1
+
+BENCHMARKS: Dict[str, Callable[[Dict], Optional[float]]] = OrderedDict()
+
+
+def benchmark(name: str) -> Callable:
+    """
+    Register a benchmark function under the given name. Benchmarks run in registration order and
+    receive the context dictionnary holding `project_path`, `data_path` and `tmp_path`. They are
+    timed by the runner, unless they return their own measured time (in seconds).
+
+    Args:
+        name: Unique name of the benchmark, as written in the results file.
+
+    """
+    def _register(
+        func: Callable[[Dict], Optional[float]]
+    ) -> Callable[[Dict], Optional[float]]:
+        BENCHMARKS[name] = func
+        return func
+
+    return _register
+
+
+def _onecode_env() -> Dict[str, str]:
+    # environment of subprocesses importing this OneCode source tree
+    return {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(
+            [os.path.dirname(os.path.dirname(onecode.__file__)), os.environ.get('PYTHONPATH', '')]
+        ),
+    }
+
+
+def _import_time(statement: str) -> float:
+    # cumulative import time of the top-level onecode modules, as reported by -X importtime
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        env=_onecode_env(),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    total = 0
+    for line in result.stderr.splitlines():
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].startswith(' onecode'):
+            total += int(fields[1])
+
+    return total / 1e6
+
+
+@benchmark('import_onecode')
+def _bench_import_onecode(ctx: Dict) -> float:
+    return _import_time('import onecode')
+
+
+@benchmark('import_onecode_elements')
+def _bench_import_onecode_elements(ctx: Dict) -> float:
+    return _import_time('import onecode.elements')
+
+
+@benchmark('process_call_graph')
+def _bench_process_call_graph(ctx: Dict) -> None:
+    process_call_graph(ctx['project_path'])
+
+
+@benchmark('extract_json')
+def _bench_extract_json(ctx: Dict) -> None:
+    extract_json(ctx['project_path'], os.path.join(ctx['tmp_path'], 'params.json'), all=True)
+
+
+@benchmark('extract_gui')
+def _bench_extract_gui(ctx: Dict) -> None:
+    extract_gui(ctx['project_path'], os.path.join(ctx['tmp_path'], 'app_ui.json'))
+
+
+def _forget_flows() -> None:
+    for mod in [m for m in sys.modules if m.split('.')[0] in ('flows', 'onecode_ext')]:
+        del sys.modules[mod]
+
+
+@benchmark('main')
+def _bench_main(ctx: Dict) -> None:
+    # forget about previously imported flows so that each run starts from scratch
+    _forget_flows()
+
+    spec = importlib.util.spec_from_file_location(
+        '_onecode_bench_main',
+        os.path.join(ctx['project_path'], 'main.py')
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    Project().reset()
+    Project().mode = Mode.EXECUTE
+    module.main()
+
+
+@benchmark('zip_output')
+def _bench_zip_output(ctx: Dict) -> None:
+    zip_output(
+        ctx['project_path'],
+        ctx['data_path'],
+        os.path.join(ctx['tmp_path'], 'data.zip'),
+        6
+    )
+
+
+@benchmark('zip_output_parallel')
+def _bench_zip_output_parallel(ctx: Dict) -> None:
+    zip_output(
+        ctx['project_path'],
+        ctx['data_path'],
+        os.path.join(ctx['tmp_path'], 'data.zip'),
+        6,
+        workers=0
+    )
+
+
+@benchmark('zip_output_incremental')
+def _bench_zip_output_incremental(ctx: Dict) -> None:
+    # outputs are unchanged since the previous archiving benchmarks
+    zip_output(
+        ctx['project_path'],
+        ctx['data_path'],
+        os.path.join(ctx['tmp_path'], 'data.zip'),
+        6,
+        incremental=True
+    )
+
+
+@benchmark('zip_output_deduplicate')
+def _bench_zip_output_deduplicate(ctx: Dict) -> None:
+    # outputs of a same flow are all written from the same DataFrame
+    zip_output(
+        ctx['project_path'],
+        ctx['data_path'],
+        os.path.join(ctx['tmp_path'], 'data_dedup.zip'),
+        6,
+        deduplicate=True
+    )
+
+
+@benchmark('tar_output_gz')
+def _bench_tar_output_gz(ctx: Dict) -> None:
+    tar_output(
+        ctx['project_path'],
+        ctx['data_path'],
+        os.path.join(ctx['tmp_path'], 'data.tar.gz'),
+        6,
+        compression='gz'
+    )
+
+
+# number of outputs registered by the registration benchmarks
+_REGISTERED_OUTPUTS = 1000
+
+
+def _registration_flow(ctx: Dict) -> List[Dict]:
+    Project().mode = Mode.EXECUTE
+    Project().current_flow = '_bench_registration'
+
+    manifest = Project().get_output_manifest()
+    if os.path.exists(manifest):
+        os.remove(manifest)
+
+    return [
+        {"key": f"tile_{i}", "value": f"_bench_registration/tiles/tile_{i}.png", "tags": ["Tile"]}
+        for i in range(_REGISTERED_OUTPUTS)
+    ]
+
+
+@benchmark('file_output_registration')
+def _bench_file_output_registration(ctx: Dict) -> None:
+    for entry in _registration_flow(ctx):
+        onecode.file_output(**entry, make_path=True)
+
+
+@benchmark('file_outputs_registration')
+def _bench_file_outputs_registration(ctx: Dict) -> None:
+    onecode.file_outputs(_registration_flow(ctx), make_path=True)
+
+
+# number of element calls timed by the element overhead benchmarks
+_ELEMENT_CALLS = 20000
+
+
+@benchmark('element_construction')
+def _bench_element_construction(ctx: Dict) -> float:
+    # per-element construction time, as for elements called in a loop
+    start = time.perf_counter()
+    for i in range(_ELEMENT_CALLS):
+        onecode.Slider(f'slider {i % 100}', 0.5, tags=['Loop'])
+        onecode.TextInput(f'text {i % 100}', 'abc')
+
+    return (time.perf_counter() - start) / (2 * _ELEMENT_CALLS)
+
+
+@benchmark('element_call')
+def _bench_element_call(ctx: Dict) -> float:
+    # per-element call time in execution mode, construction included
+    Project().mode = Mode.EXECUTE
+    Project().data = None
+
+    start = time.perf_counter()
+    for i in range(_ELEMENT_CALLS):
+        onecode.slider(f'slider {i % 100}', 0.5, tags=['Loop'])
+        onecode.text_input(f'text {i % 100}', 'abc')
+
+    return (time.perf_counter() - start) / (2 * _ELEMENT_CALLS)
+
+
+# number of values of the element validated by the count validation benchmark
+_COUNT_VALUES = 100000
+
+
+@benchmark('element_count_validation')
+def _bench_element_count_validation(ctx: Dict) -> None:
+    # type checking and validation of each value of an element with `count`
+    Project().mode = Mode.EXECUTE
+    Project().data = None
+
+    onecode.slider('sliders', [0.5] * _COUNT_VALUES, count=_COUNT_VALUES)
+    onecode.text_input('texts', ['abc'] * _COUNT_VALUES, count=_COUNT_VALUES)
+
+
+# number of parameter sets run by the batch benchmarks
+_BATCH_RUNS = 8
+
+
+def _batch_params(ctx: Dict) -> str:
+    params_path = os.path.join(ctx['tmp_path'], 'batch_params')
+    os.makedirs(params_path, exist_ok=True)
+
+    for i in range(_BATCH_RUNS):
+        with open(os.path.join(params_path, f'run_{i}.json'), 'w') as f:
+            json.dump({}, f)
+
+    return params_path
+
+
+@benchmark('batch_subprocess')
+def _bench_batch_subprocess(ctx: Dict) -> None:
+    # baseline: one interpreter started per parameter set
+    params_path = _batch_params(ctx)
+    env = _onecode_env()
+
+    for params in sorted(os.listdir(params_path)):
+        env[Env.ONECODE_PROJECT_OUTPUT] = os.path.join(
+            ctx['tmp_path'], 'batch_subprocess', os.path.splitext(params)[0], 'outputs'
+        )
+        subprocess.run(
+            [sys.executable, 'main.py', os.path.join(params_path, params)],
+            cwd=ctx['project_path'],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            check=True
+        )
+
+
+@benchmark('batch_run')
+def _bench_batch_run(ctx: Dict) -> None:
+    run_batch(
+        ctx['project_path'],
+        ctx['data_path'],
+        _batch_params(ctx),
+        os.path.join(ctx['tmp_path'], 'batch_run'),
+        processes=1
+    )
+
+
+@benchmark('serve_requests')
+def _bench_serve_requests(ctx: Dict) -> None:
+    # a pre-warmed server forks one process per parameter set
+    params_path = _batch_params(ctx)
+    socket_path = os.path.join(ctx['tmp_path'], SOCKET_FILE)
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            '-c',
+            f"from onecode.cli.start import serve; "
+            f"serve({ctx['project_path']!r}, {ctx['data_path']!r}, {socket_path!r})"
+        ],
+        env=_onecode_env(),
+        stdout=subprocess.PIPE,
+        text=True
+    )
+
+    try:
+        while 'served on' not in server.stdout.readline():
+            pass
+
+        for params in sorted(os.listdir(params_path)):
+            submit(
+                os.path.join(params_path, params),
+                socket_path=socket_path,
+                output_path=os.path.join(
+                    ctx['tmp_path'], 'serve_requests', os.path.splitext(params)[0], 'outputs'
+                ),
+                stream=io.StringIO()
+            )
+
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def _summary(runs: List[float]) -> Dict:
+    return {
+        "runs": runs,
+        "min": min(runs),
+        "median": statistics.median(runs),
+        "mean": statistics.mean(runs),
+    }
+
+
+def run_benchmarks(
+    project_path: str,
+    repeat: int = 3,
+    only: Optional[List[str]] = None
+) -> Dict:
+    """
+    Time the registered benchmarks against the given OneCode project. Standard output is
+    silenced while benchmarks are running.
+
+    Args:
+        project_path: Path to the root of the OneCode project.
+        repeat: Number of timed runs per benchmark.
+        only: Optional list of benchmark names to run, otherwise all benchmarks are run.
+
+    Returns:
+        A dictionnary of timing summaries (in seconds) per benchmark name.
+
+    """
+    project_path = os.path.abspath(project_path)
+    data_path = os.path.join(project_path, 'data')
+    tmp_path = tempfile.mkdtemp(prefix='onecode_bench_')
+
+    ctx = {"project_path": project_path, "data_path": data_path, "tmp_path": tmp_path}
+    results = OrderedDict()
+
+    cwd = os.getcwd()
+    env_data = os.environ.get(Env.ONECODE_PROJECT_DATA)
+    os.environ[Env.ONECODE_PROJECT_DATA] = data_path
+    sys.path.insert(0, project_path)
+    os.chdir(project_path)
+
+    try:
+        if only and 'main' not in only:
+            # archiving benchmarks need the outputs produced by the flows
+            with contextlib.redirect_stdout(io.StringIO()):
+                _bench_main(ctx)
+
+        for name, func in BENCHMARKS.items():
+            if only and name not in only:
+                continue
+
+            runs = []
+            for _ in range(repeat):
+                Project().reset()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    measured = func(ctx)
+                    runs.append(
+                        measured if measured is not None else time.perf_counter() - start
+                    )
+
+            results[name] = _summary(runs)
+
+    finally:
+        os.chdir(cwd)
+        sys.path.remove(project_path)
+        if env_data is None:
+            del os.environ[Env.ONECODE_PROJECT_DATA]
+        else:
+            os.environ[Env.ONECODE_PROJECT_DATA] = env_data
+
+        _forget_flows()
+        Project().reset()
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+    return results
+
+
+def compare(
+    current: Dict,
+    baseline: Dict,
+    tolerance: float = 0.2
+) -> List[Dict]:
+    """
+    Compare benchmark results against baseline results, typically produced by a previous version
+    of OneCode with the same parameters.
+
+    Args:
+        current: Results as written by this script.
+        baseline: Baseline results as written by this script.
+        tolerance: Relative slow-down of the median above which a benchmark is considered as
+            regressed, e.g. 0.2 for 20%.
+
+    Returns:
+        One entry per benchmark present in both results, with the baseline and current medians,
+        their ratio and whether it is a regression.
+
+    Raises:
+        ValueError: if the results were generated with incompatible formats or parameters.
+
+    """
+    if current.get("version") != baseline.get("version"):
+        raise ValueError(
+            f"Incompatible results versions: {current.get('version')} != {baseline.get('version')}"
+        )
+
+    if current["parameters"] != baseline["parameters"]:
+        raise ValueError(
+            f"Benchmark parameters differ: {current['parameters']} != {baseline['parameters']}"
+        )
+
+    report = []
+    for name, cur in current["benchmarks"].items():
+        if name in baseline["benchmarks"]:
+            base_median = baseline["benchmarks"][name]["median"]
+            ratio = cur["median"] / base_median if base_median > 0 else float('inf')
+            report.append({
+                "name": name,
+                "baseline": base_median,
+                "current": cur["median"],
+                "ratio": ratio,
+                "regression": ratio > 1. + tolerance
+            })
+
+    return report
+
+
+def main(raw_args: List[str] = None) -> int:    # pragma: no cover
+    """
+    ```bash
+    usage: python -m benchmarks.run [-h] [--flows N] [--elements M] [--helpers K] [--depth D]
+        [--csv-rows S] [--repeat R] [--only [NAME ...]] [--project PATH] [--keep]
+        [--output FILE] [--compare FILE] [--tolerance FLOAT]
+
+    Generate a synthetic OneCode project and time its extraction, build, execution and archiving
+
+    optional arguments:
+      -h, --help            Show this help message and exit
+      --flows N             Number of flows, defaults to 4
+      --elements M          Number of elements per flow, defaults to 14
+      --helpers K           Number of helper modules, defaults to 2
+      --depth D             Call depth of the helper modules, defaults to 3
+      --csv-rows S          Number of rows of the CSV inputs, defaults to 1000
+      --repeat R            Number of timed runs per benchmark, defaults to 3
+      --only [NAME ...]     Run only these benchmarks
+      --project PATH        Where to generate the project, defaults to a temporary directory
+      --keep                Keep the generated project
+      --output FILE         Path to the JSON results file, defaults to bench_results.json
+      --compare FILE        Baseline JSON results file to compare against
+      --tolerance FLOAT     Relative median slow-down considered as a regression, defaults to 0.2
+    ```
+
+    Returns 1 if a regression was detected when comparing against a baseline, otherwise 0.
+
+    """
+    parser = argparse.ArgumentParser(
+        description='Generate a synthetic OneCode project and time its extraction, build, '
+                    'execution and archiving'
+    )
+    parser.add_argument('--flows', type=int, default=4, help='Number of flows')
+    parser.add_argument('--elements', type=int, default=14, help='Number of elements per flow')
+    parser.add_argument('--helpers', type=int, default=2, help='Number of helper modules')
+    parser.add_argument('--depth', type=int, default=3, help='Call depth of the helper modules')
+    parser.add_argument('--csv-rows', type=int, default=1000, help='Number of rows of CSV inputs')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of timed runs per benchmark')
+    parser.add_argument(
+        '--only',
+        nargs='*',
+        choices=list(BENCHMARKS),
+        help='Run only these benchmarks'
+    )
+    parser.add_argument(
+        '--project',
+        required=False,
+        help='Where to generate the project, defaults to a temporary directory'
+    )
+    parser.add_argument('--keep', action='store_true', help='Keep the generated project')
+    parser.add_argument(
+        '--output',
+        default='bench_results.json',
+        help='Path to the JSON results file'
+    )
+    parser.add_argument('--compare', required=False, help='Baseline JSON results to compare to')
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.2,
+        help='Relative median slow-down considered as a regression'
+    )
+    args = parser.parse_args(raw_args)
+
+    parameters = {
+        "flows": args.flows,
+        "elements": args.elements,
+        "helpers": args.helpers,
+        "depth": args.depth,
+        "csv_rows": args.csv_rows,
+    }
+
+    project_path = args.project if args.project is not None else os.path.join(
+        tempfile.gettempdir(), 'onecode_bench_project'
+    )
+
+    print(f'Generating project in {project_path}: {parameters}')
+    generate_project(project_path, **parameters)
+
+    try:
+        timings = run_benchmarks(project_path, args.repeat, args.only)
+    finally:
+        if not args.keep:
+            shutil.rmtree(project_path, ignore_errors=True)
+
+    results = {
+        "version": RESULTS_VERSION,
+        "onecode": onecode.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.datetime.now().isoformat(),
+        "parameters": parameters,
+        "repeat": args.repeat,
+        "benchmarks": timings,
+    }
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=4)
+
+    for name, t in timings.items():
+        print(f'{name:<24} median {t["median"]:.4g}s  min {t["min"]:.4g}s')
+    print(f'Results written to {args.output}')
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        report = compare(results, baseline, args.tolerance)
+        for r in report:
+            status = '❌ regression' if r['regression'] else '✅'
+            print(
+                f"{r['name']:<24} {r['baseline']:.4g}s -> {r['current']:.4g}s "
+                f"(x{r['ratio']:.2f}) {status}"
+            )
+
+        if any(r['regression'] for r in report):
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
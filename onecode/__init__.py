@@ -4,6 +4,53 @@
 __version__ = "1.0.0"
 
 
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
 from .base import *
-from .elements import *
-from .utils import *
+
+if TYPE_CHECKING:   # pragma: no cover
+    # static analysis (IDEs, documentation) sees the full API
+    from .elements import *
+    from .utils import *
+
+# Subpackages imported on first access to one of their attributes (PEP 562), so that tools only
+# needing the base API (e.g. `Project`, `Logger`) do not pay for the elements registration and
+# their dependencies. On name conflicts, the last subpackage wins (as with star-imports).
+_LAZY_SUBPACKAGES = ('elements', 'utils')
+
+
+def _public_names(module) -> List[str]:
+    return [name for name in vars(module) if not name.startswith('_')]
+
+
+def __getattr__(name: str) -> Any:
+    if name == '__all__':
+        # `from onecode import *`: export everything, as when subpackages were star-imported
+        all_names = _public_names(importlib.import_module(__name__))
+        for subpackage in _LAZY_SUBPACKAGES:
+            all_names += _public_names(importlib.import_module(f'{__name__}.{subpackage}'))
+
+        # element classes not imported yet
+        all_names += [
+            element.split('.')[1] for element in sorted(Project().registered_elements)
+            if element.startswith(f'{__name__}.')
+        ]
+
+        globals()['__all__'] = list(dict.fromkeys(all_names))
+        return globals()['__all__']
+
+    for subpackage in reversed(_LAZY_SUBPACKAGES):
+        module = importlib.import_module(f'{__name__}.{subpackage}')
+        try:
+            # element classes are themselves resolved on first access by their package
+            globals()[name] = getattr(module, name)
+            return globals()[name]
+        except AttributeError:
+            pass
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__getattr__('__all__')))
@@ -1,6 +1,7 @@
 # SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
 # SPDX-License-Identifier: MIT
 
+from .checksum import *
 from .decorator import *
 from .enums import *
 from .logger import *
@@ -0,0 +1,66 @@
+# SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import os
+from typing import Any, Dict
+
+from .decorator import check_type
+
+# Size of the blocks read when hashing files.
+_BLOCK_SIZE = 1024 * 1024
+
+
+def content_hasher() -> Any:
+    """
+    Create the hash object used by OneCode to identify file contents: BLAKE2b with a 128-bit
+    digest, which is fast in pure Python (hashing releases the GIL) and collision-resistant.
+
+    Returns:
+        A new `hashlib` hash object.
+
+    """
+    return hashlib.blake2b(digest_size=16)
+
+
+@check_type
+def file_digest(path: str) -> str:
+    """
+    Hash the content of a file (see [`content_hasher()`][onecode.content_hasher]).
+
+    Args:
+        path: Path to the file.
+
+    Returns:
+        The hexadecimal digest of the file content.
+
+    """
+    hasher = content_hasher()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_BLOCK_SIZE), b''):
+            hasher.update(block)
+
+    return hasher.hexdigest()
+
+
+@check_type
+def file_stats(path: str) -> Dict[str, Any]:
+    """
+    Get the attributes identifying the content of a file, as written to the output manifest
+    entries.
+
+    Args:
+        path: Path to the file.
+
+    Returns:
+        A dictionnary with the file `size` (in bytes), its modification time `mtime` (in seconds
+        since Epoch) and its content `hash` (see [`file_digest()`][onecode.file_digest]).
+
+    """
+    st = os.stat(path)
+
+    return {
+        "size": st.st_size,
+        "mtime": st.st_mtime,
+        "hash": file_digest(path),
+    }
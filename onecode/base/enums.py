@@ -11,6 +11,8 @@ class Env(StrEnum):
 
     - `ONECODE_PROJECT_DATA`: use this variable to overwrite default data location
     :octicons-arrow-both-24: `"ONECODE_PROJECT_DATA"`
+    - `ONECODE_PROJECT_OUTPUT`: use this variable to overwrite default outputs location
+    (`<data_root>/outputs`) :octicons-arrow-both-24: `"ONECODE_PROJECT_OUTPUT"`
     - `ONECODE_CONFIG_FILE`: name of the file containing OneCode project configurations
     :octicons-arrow-both-24: `".onecode.json"`
     - `ONECODE_DO_TYPECHECK`: set to 1 to force runtime type-checking with Pydantic
@@ -20,6 +22,7 @@ class Env(StrEnum):
 
     """
     ONECODE_PROJECT_DATA    = "ONECODE_PROJECT_DATA"    # noqa: E-221
+    ONECODE_PROJECT_OUTPUT  = "ONECODE_PROJECT_OUTPUT"  # noqa: E-221
     ONECODE_CONFIG_FILE     = ".onecode.json"           # noqa: E-221
     ONECODE_DO_TYPECHECK    = "ONECODE_DO_TYPECHECK"    # noqa: E-221
     ONECODE_LOGGER_NAME     = "|OneCode|"               # noqa: E-221
@@ -33,11 +36,20 @@ class ConfigOption(StrEnum):
     - `LOGGER_COLOR`: to color the logs by default when resetting the logger
         :octicons-arrow-both-24: `"LOGGER_COLOR": True`
     - `LOGGER_TIMESTAMP`: to timestamp the logs :octicons-arrow-both-24: `"LOGGER_TIMESTAMP": True`
+    - `ENRICH_MANIFEST`: to add size, modification time and content hash to the `FileOutput`
+        manifest entries at the end of each flow (see
+        [`Project.enrich_output_manifest()`][onecode.Project.enrich_output_manifest])
+        :octicons-arrow-both-24: `"ENRICH_MANIFEST": False`
+    - `FLOW_CACHE`: to restore the results of flows whose code and inputs did not change since a
+        previous run rather than executing them again (see [`FlowCache`][onecode.FlowCache])
+        :octicons-arrow-both-24: `"FLOW_CACHE": False`
 
     """
     FLUSH_STDOUT        = "FLUSH_STDOUT"            # noqa: E-221
     LOGGER_COLOR        = "LOGGER_COLOR"            # noqa: E-221
     LOGGER_TIMESTAMP    = "LOGGER_TIMESTAMP"        # noqa: E-221
+    ENRICH_MANIFEST     = "ENRICH_MANIFEST"         # noqa: E-221
+    FLOW_CACHE          = "FLOW_CACHE"              # noqa: E-221
 
 
 class Mode(StrEnum):
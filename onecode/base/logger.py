@@ -69,7 +69,9 @@ class ColoredFormatter(logging.Formatter):
             The formatted text.
 
         """
-        flow = Project().current_flow if Project().current_flow is not None else ''
+        # records forwarded from flows running in other processes are tagged with their flow
+        flow = getattr(record, 'flow', Project().current_flow)
+        flow = flow if flow is not None else ''
         format = f"[%(levelname)s] {flow} - %(name)s:%(lineno)d - %(message)s"
         if Project().get_config(ConfigOption.LOGGER_TIMESTAMP):
             format = f"%(asctime)s {format}"
@@ -2,19 +2,26 @@
 # SPDX-License-Identifier: MIT
 
 import ast
+import importlib
 import json
 import os
 import sys
-from typing import Any, Dict, Optional, Set, Union
-
-import pydash
-from flufl.lock import Lock
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
+from .checksum import file_stats
 from .decorator import check_type
 from .enums import ConfigOption, Env, Mode
 from .singleton import Singleton
 
 
+def _manifest_lock(manifest_dir: str) -> Any:
+    # imported on demand to keep `import onecode` light
+    from flufl.lock import Lock
+
+    return Lock(os.path.join(manifest_dir, '.locks', 'MANIFEST.lock'), lifetime=3)
+
+
 class Project(metaclass=Singleton):
     """
     Single Project object to centralize OneCode project data, such as the data path,
@@ -47,6 +54,8 @@ class Project(metaclass=Singleton):
         Environment variables, otherwise to the `data` folder located in the same directory from
         where the project is run if existing (typically the OneCode project data folder), otherwise
         to the current working directory.
+        - the outputs path is initialized to `ONECODE_PROJECT_OUTPUT` if provided in the
+        Environment variables, otherwise to the `outputs` folder of the data path.
         - mode is `Mode.CONSOLE`.
         - currently running flow and data are None.
         - registered elements default to the OneCode ones unless `keep_registered_elements` is True.
@@ -72,6 +81,8 @@ class Project(metaclass=Singleton):
         else:
             self._set_data_root(os.getcwd())
 
+        self._output_root = os.environ.get(Env.ONECODE_PROJECT_OUTPUT)
+
         if not keep_registered_elements:
             this_module = sys.modules[__name__].__name__.split('.')[0]
             self._registered_elements = {
@@ -81,6 +92,7 @@ class Project(metaclass=Singleton):
         self._mode = Mode.CONSOLE
         self._flow = None
         self._data = None
+        self._recorded_inputs = None
 
         # get string config from env variables starting with ONECODE_CONFIG_
         # get flag config from env variables starting with ONECODE_FLAG_
@@ -88,6 +100,8 @@ class Project(metaclass=Singleton):
             ConfigOption.FLUSH_STDOUT: False,
             ConfigOption.LOGGER_COLOR: True,
             ConfigOption.LOGGER_TIMESTAMP: True,
+            ConfigOption.ENRICH_MANIFEST: False,
+            ConfigOption.FLOW_CACHE: False,
             **{k[len("ONECODE_CONFIG_"):]: os.environ[k]
                 for k in os.environ if k.startswith("ONECODE_CONFIG_")},
             **{k[len("ONECODE_FLAG_"):]: bool(ast.literal_eval(os.environ[k]))
@@ -104,6 +118,10 @@ class Project(metaclass=Singleton):
         By default, it returns all Input/Output Elements of `onecode` library.
 
         """
+        # OneCode elements are registered when imported, which `import onecode` defers until first
+        # accessed (see `onecode.__getattr__()`)
+        importlib.import_module(f"{__name__.split('.')[0]}.elements")
+
         return self._registered_elements
 
     @check_type
@@ -129,6 +147,9 @@ class Project(metaclass=Singleton):
                 f'Invalid element name: {element_name} must be of form "<module>.<class_name>"'
             )
 
+        # imported on demand to keep `import onecode` light
+        import pydash
+
         if element_parts[1] == pydash.snake_case(element_parts[1]):
             raise ValueError(
                 f'Invalid element name: {element_parts[1]} must not be snake case'
@@ -188,6 +209,16 @@ class Project(metaclass=Singleton):
         """
         return self._data_root
 
+    @property
+    def output_root(self) -> str:
+        """
+        Get the path to the root of the outputs folder, typically `<data_root>/outputs`. See
+        [`reset()`][onecode.Project.reset] to know how the outputs path is initialized.
+
+        """
+        return self._output_root if self._output_root is not None \
+            else os.path.join(self.data_root, 'outputs')
+
     @check_type
     def _set_data_root(
         self,
@@ -237,7 +268,8 @@ class Project(metaclass=Singleton):
     ) -> str:
         """
         Get the constructed output path for the given file path. The path is always considered
-        relative to the data output path (typically `<data_root>/outputs/`).
+        relative to the outputs path (typically `<data_root>/outputs/`, see
+        [`output_root`][onecode.Project.output_root]).
 
         Args:
             filepath: filename of file path to construct the output path from.
@@ -246,12 +278,12 @@ class Project(metaclass=Singleton):
             The constructed output path to the file.
 
         """
-        return None if filepath is None else os.path.join(self.data_root, 'outputs', filepath)
+        return None if filepath is None else os.path.join(self.output_root, filepath)
 
     def get_output_manifest(self) -> str:
         """
         Get the path to the current flow manifest file, typically
-        `<data_root>/outputs/<flow>/MANIFEST.txt`. If the path does not exist, it is automatically
+        `<output_root>/<flow>/MANIFEST.txt`. If the path does not exist, it is automatically
         created.
 
         The manifest file is a collection of output data attributes: there would typically be one
@@ -304,6 +336,31 @@ class Project(metaclass=Singleton):
         """
         return self._config
 
+    @property
+    def recorded_inputs(self) -> Optional[Dict[str, Tuple[bool, Any, List[str]]]]:
+        """
+        Get the input elements recorded while executing, typically used by the flow cache (see
+        [`FlowCache`][onecode.FlowCache]). Recording is enabled by setting it to an empty
+        dictionnary and disabled by setting it to None (default).
+
+        Each executed input element key is recorded once, mapped to a tuple: whether the key
+        was present in the Project data prior to the element resolution, the corresponding
+        value if so, and the paths of the files read by the element.
+
+        """
+        return self._recorded_inputs
+
+    @recorded_inputs.setter
+    def recorded_inputs(
+        self,
+        recorded_inputs: Optional[Dict[str, Tuple[bool, Any, List[str]]]]
+    ) -> None:
+        """
+        Enable (empty dictionnary) or disable (None) the recording of input elements.
+
+        """
+        self._recorded_inputs = recorded_inputs
+
     @data.setter
     def data(
         self,
@@ -405,6 +462,77 @@ class Project(metaclass=Singleton):
         manifest_dir = os.path.dirname(self.get_output_manifest())
 
         # manage concurrent access in case of multiprocessing
-        with Lock(os.path.join(manifest_dir, '.locks', 'MANIFEST.lock'), lifetime=3):
+        with _manifest_lock(manifest_dir):
             with open(self.get_output_manifest(), "a") as f:
                 f.write(f'{json.dumps(output)}\n')
+
+    @check_type
+    def write_outputs(
+        self,
+        outputs: List[Dict]
+    ) -> None:
+        """
+        Write several data entries to the output manifest file corresponding to the currently
+        running flow at once, i-e with a single locked append (see
+        [`Project.write_output()`][onecode.Project.write_output]).
+
+        Args:
+            outputs: List of output data to write to the manifest file.
+
+        """
+        if not outputs:
+            return
+
+        manifest_dir = os.path.dirname(self.get_output_manifest())
+
+        # manage concurrent access in case of multiprocessing
+        with _manifest_lock(manifest_dir):
+            with open(self.get_output_manifest(), "a") as f:
+                f.write(''.join(f'{json.dumps(output)}\n' for output in outputs))
+
+    @check_type
+    def enrich_output_manifest(
+        self,
+        workers: int = 0
+    ) -> None:
+        """
+        Add the file attributes (see [`file_stats()`][onecode.file_stats]) to the `FileOutput`
+        entries of the output manifest corresponding to the currently running flow, so that
+        consumers (e.g. archivers, caches or sync tools) can detect unchanged outputs without
+        reading them. Files are processed concurrently by a pool of threads.
+
+        This function is automatically called at the end of each flow when the config option
+        `ENRICH_MANIFEST` is True. Missing files and directories are left untouched.
+
+        Args:
+            workers: Number of threads processing files concurrently. Set to 0 to use all
+                available cores.
+
+        """
+        manifest = self.get_output_manifest()
+        if not os.path.exists(manifest):
+            return
+
+        with open(manifest) as f:
+            files = list({
+                output["value"] for output in map(json.loads, f)
+                if output.get("kind") == "FileOutput" and os.path.isfile(output.get("value", ""))
+            })
+
+        # files are read outside of the lock: the manifest is reloaded before being updated
+        with ThreadPoolExecutor(max_workers=workers if workers > 0 else os.cpu_count()) as pool:
+            stats = dict(zip(files, pool.map(file_stats, files)))
+
+        manifest_dir = os.path.dirname(manifest)
+        with _manifest_lock(manifest_dir):
+            with open(manifest) as f:
+                outputs = [json.loads(line) for line in f]
+
+            with open(f'{manifest}.tmp', 'w') as f:
+                for output in outputs:
+                    if output.get("kind") == "FileOutput" and output.get("value") in stats:
+                        output.update(stats[output["value"]])
+
+                    f.write(f'{json.dumps(output)}\n')
+
+            os.replace(f'{manifest}.tmp', manifest)
@@ -0,0 +1,324 @@
+# SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
+# SPDX-License-Identifier: MIT
+
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import redirect_stdout
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from ..base.decorator import check_type
+from ..base.enums import Env, Mode
+from ..base.project import Project
+from .utils import import_project_main
+
+# Name of the summary file written at the root of the batch output folder.
+SUMMARY_FILE = 'summary.csv'
+
+# Number of parameter sets submitted ahead per worker process.
+_IN_FLIGHT_PER_PROCESS = 4
+
+# OneCode project `main` module, imported once per worker process.
+_project_main = None
+
+
+def iter_parameter_sets(params_path: str) -> Iterator[Tuple[str, Dict]]:
+    """
+    Iterate over the parameter sets of a batch, either from a folder of JSON files (one parameter
+    set per file, named after the file) or from a JSON-lines file (one parameter set per line,
+    named after the line number). Use `-` to read JSON lines from the standard input, e.g. piped
+    from `onecode-doe`: parameter sets are then read as they come.
+
+    Args:
+        params_path: Path to the folder or JSON-lines file, or `-` for the standard input.
+
+    Yields:
+        The parameter sets names and values.
+
+    Raises:
+        FileNotFoundError: if the path does not exist.
+        ValueError: if a parameter set is not a JSON object.
+
+    """
+    if params_path == '-':
+        yield from _read_json_lines(sys.stdin)
+
+    elif not os.path.exists(params_path):
+        raise FileNotFoundError(f'Parameters path {params_path} does not exist')
+
+    elif os.path.isdir(params_path):
+        for filename in sorted(os.listdir(params_path)):
+            if filename.endswith('.json'):
+                with open(os.path.join(params_path, filename)) as f:
+                    yield _check_parameter_set(os.path.splitext(filename)[0], json.load(f))
+
+    else:
+        with open(params_path) as f:
+            # names are padded to the number of lines, so that they sort in order
+            width = len(str(sum(1 for line in f if line.strip())))
+            f.seek(0)
+            yield from _read_json_lines(f, width)
+
+
+def _read_json_lines(
+    lines: Iterable[str],
+    width: int = 0
+) -> Iterator[Tuple[str, Dict]]:
+    for i, line in enumerate(line for line in lines if line.strip()):
+        yield _check_parameter_set(f'{i:0{width}d}', json.loads(line))
+
+
+def _check_parameter_set(
+    name: str,
+    data: Any
+) -> Tuple[str, Dict]:
+    if not isinstance(data, dict):
+        raise ValueError(f'Parameter set {name} is not a JSON object')
+
+    return name, data
+
+
+@check_type
+def load_parameter_sets(params_path: str) -> List[Tuple[str, Dict]]:
+    """
+    Load all the parameter sets of a batch at once, see
+    [`iter_parameter_sets()`][onecode.cli.batch.iter_parameter_sets].
+
+    Args:
+        params_path: Path to the folder or JSON-lines file, or `-` for the standard input.
+
+    Returns:
+        The list of parameter sets names and values.
+
+    Raises:
+        FileNotFoundError: if the path does not exist.
+        ValueError: if a parameter set is not a JSON object.
+
+    """
+    return list(iter_parameter_sets(params_path))
+
+
+def _init_worker(
+    project_path: str,
+    data_path: str
+) -> None:
+    """
+    Internal function initializing a batch worker process: the OneCode project `main` module is
+    imported once, along with its dependencies, so that it is warm for all the runs executed by
+    this process.
+
+    """
+    global _project_main
+    _project_main = import_project_main(project_path, data_path)
+
+
+def _run_parameter_set(
+    name: str,
+    data: Dict,
+    run_path: str,
+    flow_name: Optional[str]
+) -> Dict:
+    """
+    Internal function running the OneCode project with a parameter set in a batch worker process.
+    Outputs are written to `<run_path>/outputs` and the standard output to `<run_path>/run.log`.
+
+    """
+    os.makedirs(run_path, exist_ok=True)
+    os.environ[Env.ONECODE_PROJECT_OUTPUT] = os.path.join(run_path, 'outputs')
+
+    Project().reset(keep_registered_elements=True)
+    Project().mode = Mode.LOAD_THEN_EXECUTE
+
+    status, error = 'success', None
+    start = time.perf_counter()
+
+    with open(os.path.join(run_path, 'run.log'), 'w') as f, redirect_stdout(f):
+        try:
+            _project_main.main(data, flow_name)
+        except Exception as e:
+            traceback.print_exc(file=f)
+            status, error = 'failed', f'{type(e).__name__}: {e}'
+
+    return {
+        "run": name,
+        "status": status,
+        "duration": round(time.perf_counter() - start, 3),
+        "output": run_path,
+        "error": error,
+    }
+
+
+@check_type
+def run_batch(
+    project_path: str,
+    data_path: str,
+    params_path: str,
+    output_path: str,
+    flow_name: Optional[str] = None,
+    processes: int = 0,
+    verbose: bool = False
+) -> pd.DataFrame:
+    """
+    Run the OneCode project once per parameter set (see
+    [`iter_parameter_sets()`][onecode.cli.batch.iter_parameter_sets]), in `LOAD_THEN_EXECUTE`
+    mode, typically to sweep parameters.
+
+    Runs are distributed over a pool of processes importing the project (and its dependencies)
+    once, rather than starting a new Python interpreter for each run. Each run reads its inputs
+    from the data folder and writes its outputs to `<output_path>/<run>/outputs` (see
+    [`Project.output_root`][onecode.Project.output_root]), along with its standard output to
+    `<output_path>/<run>/run.log`. Failed runs do not interrupt the batch.
+
+    A summary table with the status and duration of each run is written to
+    `<output_path>/summary.csv`.
+
+    Args:
+        project_path: Path to the root of the OneCode project.
+        data_path: Path to the data folder.
+        params_path: Path to the folder of JSON files or to the JSON-lines file of parameter sets,
+            or `-` to read them from the standard input.
+        output_path: Path to the folder where to write the runs outputs.
+        flow_name: Execute only the flow specified by its ID. If None provided, all flows will run.
+        processes: Number of processes running concurrently. Set to 0 to use all available
+            cores.
+        verbose: If True, print the status of each run once completed.
+
+    Returns:
+        The summary table, one row per run with its `run` name, `status` (`success` or `failed`),
+        `duration` (in seconds), `output` path and `error` if any.
+
+    """
+    project_path = os.path.abspath(project_path)
+    output_path = os.path.abspath(output_path)
+
+    if processes == 0:
+        processes = os.cpu_count() or 1
+
+    names, rows, pending = [], {}, set()
+
+    def _collect(done):
+        for future in done:
+            row = future.result()
+            rows[row["run"]] = row
+
+            if verbose:
+                print(f'{row["run"]}: {row["status"]} ({row["duration"]}s)')
+
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_worker,
+        initargs=(project_path, os.path.abspath(data_path))
+    ) as executor:
+        # parameter sets are submitted as they are read, keeping a bounded number of them in
+        # flight, so that large (or streamed) batches are not held in memory
+        for name, data in iter_parameter_sets(params_path):
+            names.append(name)
+            pending.add(executor.submit(
+                _run_parameter_set,
+                name,
+                data,
+                os.path.join(output_path, name),
+                flow_name
+            ))
+
+            if len(pending) >= _IN_FLIGHT_PER_PROCESS * processes:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                _collect(done)
+
+        _collect(wait(pending).done)
+
+    summary = pd.DataFrame(
+        [rows[name] for name in names],
+        columns=['run', 'status', 'duration', 'output', 'error']
+    )
+
+    os.makedirs(output_path, exist_ok=True)
+    summary.to_csv(os.path.join(output_path, SUMMARY_FILE), index=False)
+
+    return summary
+
+
+def main() -> None:    # pragma: no cover
+    """
+    ```bash
+    usage: onecode-batch [-h] [--path PATH] [--data PATH] [--output-path PATH] [--flow FLOW]
+        [--processes INT] [--verbose] params
+
+    Run the OneCode project once per parameter set
+
+    positional arguments:
+      params              Path to a folder of JSON parameter files or to a JSON-lines file with
+                              one parameter set per line, - to read them from the standard input
+
+    optional arguments:
+      -h, --help          Show this help message and exit
+      --path PATH         Path to the project root directory if not the current working directory
+      --data PATH         Path to the data root directory if not the default data directory
+      --output-path PATH  Path to the folder where to write the runs outputs, defaults to batch
+      --flow FLOW         Specify the flow to run
+      --processes INT     Number of processes running concurrently, 0 to use all cores,
+                              defaults to 0
+      --verbose           Print the status of each run once completed
+    ```
+
+    """
+    parser = argparse.ArgumentParser(description='Run the OneCode project once per parameter set')
+    parser.add_argument(
+        'params',
+        help='Path to a folder of JSON parameter files or to a JSON-lines file, - for stdin'
+    )
+    parser.add_argument(
+        '--path',
+        required=False,
+        help='Path to the project root directory if not the current working directory'
+    )
+    parser.add_argument(
+        '--data',
+        required=False,
+        help='Path to the data root directory if not the default data directory'
+    )
+    parser.add_argument(
+        '--output-path',
+        default='batch',
+        help='Path to the folder where to write the runs outputs'
+    )
+    parser.add_argument('--flow', default=None, help='Specify the flow to run')
+    parser.add_argument(
+        '--processes',
+        default=0,
+        type=int,
+        help='Number of processes running concurrently, 0 to use all cores'
+    )
+    parser.add_argument(
+        '--verbose',
+        action='store_true',
+        help='Print the status of each run once completed'
+    )
+    args = parser.parse_args()
+
+    project_path = args.path if args.path is not None else os.getcwd()
+    data_path = args.data if args.data is not None else os.path.join(project_path, 'data')
+
+    start = time.perf_counter()
+    summary = run_batch(
+        project_path,
+        data_path,
+        args.params,
+        args.output_path,
+        args.flow,
+        args.processes,
+        args.verbose
+    )
+
+    print(summary.drop(columns=['output']).to_string(index=False))
+    print(
+        f'\n{(summary["status"] == "success").sum()}/{len(summary)} runs succeeded in '
+        f'{time.perf_counter() - start:.1f}s, '
+        f'summary written to {os.path.join(args.output_path, SUMMARY_FILE)}'
+    )
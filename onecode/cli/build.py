@@ -2,7 +2,6 @@
 # SPDX-License-Identifier: MIT
 
 import argparse
-import json
 import os
 from typing import Dict, List
 
@@ -12,7 +11,7 @@ from ..base.decorator import check_type
 from ..base.enums import *  # noqa
 from ..base.enums import ElementType, Mode
 from ..base.project import Project
-from .utils import process_call_graph
+from .utils import dump_json, process_call_graph
 
 
 @check_type
@@ -83,7 +82,8 @@ def process(calls: List[Dict[str, str]]) -> Dict:
 def extract_gui(
     project_path: str,
     to_file: str,
-    verbose: bool = False
+    verbose: bool = False,
+    compact: bool = False
 ) -> None:
     """
     Generate the UI JSON format for OneCode Cloud.
@@ -92,6 +92,8 @@ def extract_gui(
         project_path: Path to the root of the OneCode project.
         to_file: Path of the output file to dump the JSON to.
         verbose: If True, print out debug information.
+        compact: If True, write the JSON without indentation using the fastest available backend
+            (see [`dump_json()`][onecode.cli.utils.dump_json]).
 
     """
     Project().mode = Mode.BUILD_GUI
@@ -122,14 +124,13 @@ def extract_gui(
 
         schema.append(cur_flow)
 
-    with open(to_file, 'w') as out:
-        json.dump(schema, out, indent=4)
+    dump_json(schema, to_file, compact)
 
 
 def main() -> None:   # pragma: no cover
     """
     ```bash
-    usage: onecode-start [-h] [--modules [MODULES [MODULES ...]]] [--verbose]
+    usage: onecode-start [-h] [--modules [MODULES [MODULES ...]]] [--verbose] [--compact]
 
     Start the OneCode Project in Interactive mode.
 
@@ -138,6 +139,7 @@ def main() -> None:   # pragma: no cover
       --modules [MODULES [MODULES ...]]
                             Optional list of modules to import first
       --verbose             Print verbose information when processing files
+      --compact             Write compact JSON (no indentation) using the fastest available backend
     ```
 
     """
@@ -163,6 +165,11 @@ def main() -> None:   # pragma: no cover
         action='store_true',
         help='Print verbose information when processing files'
     )
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='Write compact JSON (no indentation) using the fastest available backend'
+    )
     args = parser.parse_args()
 
     # optionally load required modules dynamically,
@@ -181,4 +188,4 @@ def main() -> None:   # pragma: no cover
         else f'{args.output_file}.json'
 
     print('\n')
-    extract_gui(project_path, out_filename, args.verbose)
+    extract_gui(project_path, out_filename, args.verbose, args.compact)
@@ -0,0 +1,411 @@
+# SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
+# SPDX-License-Identifier: MIT
+
+import argparse
+import json
+import math
+import sys
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from ..base.decorator import check_type
+from .utils import orjson
+
+# Design-of-experiments methods supported by `generate_design()`.
+DOE_METHODS = ('full', 'random', 'lhs')
+
+# Number of parameter sets generated at once by the vectorized generators.
+_CHUNK_SIZE = 65536
+
+
+class _Domain:
+    """
+    Internal class describing the values a parameter may take: either a discrete set of values,
+    or a continuous range optionally snapped to a step grid.
+
+    """
+
+    def __init__(
+        self,
+        values: Optional[List[Any]] = None,
+        bounds: Optional[Tuple[float, float]] = None,
+        step: Optional[float] = None,
+        integer: bool = False
+    ):
+        self.values = np.array(values, dtype=object) if values is not None else None
+        self.bounds = bounds
+        self.step = step
+        self.integer = integer
+
+        # number of decimals of the step, to avoid floating-point noise in the generated values
+        self._decimals = max(0, -Decimal(str(step)).as_tuple().exponent) \
+            if step is not None and not integer else None
+
+    def discretize(
+        self,
+        levels: int
+    ) -> '_Domain':
+        """
+        Get the discrete domain used by full-factorial designs: continuous ranges are split
+        according to their step if any, otherwise into the given number of levels.
+
+        """
+        if self.values is not None:
+            return self
+
+        low, high = self.bounds
+        if self.step is not None:
+            grid = low + self.step * np.arange(math.floor((high - low) / self.step + 1e-9) + 1)
+        else:
+            grid = np.linspace(low, high, levels)
+
+        # rounding may merge levels of narrow integer ranges
+        return _Domain(values=np.unique(self._snap(grid)).tolist())
+
+    def sample(
+        self,
+        u: np.ndarray
+    ) -> np.ndarray:
+        """
+        Map uniform samples in [0, 1) to values of the domain.
+
+        """
+        if self.values is not None:
+            return self.values[np.minimum((u * len(self.values)).astype(np.int64),
+                                          len(self.values) - 1)]
+
+        low, high = self.bounds
+        return self._snap(low + u * (high - low))
+
+    def _snap(
+        self,
+        x: np.ndarray
+    ) -> np.ndarray:
+        low, high = self.bounds
+        if self.step is not None:
+            x = np.minimum(low + np.round((x - low) / self.step) * self.step, high)
+
+        if self.integer:
+            return np.round(x).astype(np.int64)
+
+        return np.round(x, self._decimals) if self._decimals is not None else x
+
+
+def _is_number(x: Any) -> bool:
+    return isinstance(x, (int, float)) and not isinstance(x, bool)
+
+
+def _element_domain(element: Dict) -> Optional[_Domain]:
+    """
+    Internal function getting the domain of an element from its extracted attributes, or None if
+    the element cannot be swept (unsupported kind, dynamic attributes, multiple values, etc.).
+
+    """
+    kind = element.get("kind")
+    if element.get("count") is not None:
+        return None
+
+    if kind == 'Checkbox':
+        return _Domain(values=[False, True])
+
+    elif kind in ('Dropdown', 'RadioButton'):
+        options = element.get("options")
+        if isinstance(options, list) and options and not element.get("multiple", False):
+            return _Domain(values=options)
+
+    elif kind in ('Slider', 'NumberInput'):
+        low, high, step = element.get("min"), element.get("max"), element.get("step")
+        if _is_number(low) and _is_number(high) and (step is None or _is_number(step)):
+            integer = all(isinstance(x, int) for x in (element.get("value"), low, high)) and \
+                (step is None or isinstance(step, int))
+            return _Domain(
+                bounds=(low, high),
+                step=step if step else None,
+                integer=integer
+            )
+
+    return None
+
+
+@check_type
+def parameter_domains(
+    schema: Dict[str, Dict],
+    keys: Optional[List[str]] = None
+) -> Dict[str, Optional[_Domain]]:
+    """
+    Get the parameters that can be swept out of the schema extracted by `onecode-extract --all`:
+    `Slider` and `NumberInput` (bounded by `min` and `max`, snapped to `step` if any),
+    `Dropdown` (single selection) and `RadioButton` (`options`) and `Checkbox` (`False`/`True`).
+    Elements with dynamic attributes or a `count` are not swept.
+
+    Args:
+        schema: Parameters with their full info set, as extracted by `onecode-extract --all`.
+        keys: Keys of the parameters to sweep. If None, all parameters that can be swept are.
+
+    Returns:
+        The domain of each swept parameter, None for the parameters kept to their default value.
+
+    Raises:
+        ValueError: if one of the given keys is unknown or cannot be swept.
+
+    """
+    domains = {k: _element_domain(v) for k, v in schema.items()}
+
+    if keys is not None:
+        invalid = [k for k in keys if domains.get(k) is None]
+        if invalid:
+            raise ValueError(f'Parameters cannot be swept: {invalid}')
+
+        domains = {k: d if k in keys else None for k, d in domains.items()}
+
+    return domains
+
+
+def _full_factorial(
+    domains: List[_Domain],
+    chunk_size: int
+) -> Iterator[List[np.ndarray]]:
+    shape = tuple(len(d.values) for d in domains)
+    total = math.prod(shape)
+
+    for start in range(0, total, chunk_size):
+        indices = np.unravel_index(np.arange(start, min(start + chunk_size, total)), shape)
+        yield [d.values[i] for d, i in zip(domains, indices)]
+
+
+def _random(
+    domains: List[_Domain],
+    samples: int,
+    rngs: List[np.random.Generator],
+    chunk_size: int
+) -> Iterator[List[np.ndarray]]:
+    for start in range(0, samples, chunk_size):
+        n = min(chunk_size, samples - start)
+        yield [d.sample(rng.random(n)) for d, rng in zip(domains, rngs)]
+
+
+def _latin_hypercube(
+    domains: List[_Domain],
+    samples: int,
+    rngs: List[np.random.Generator],
+    chunk_size: int
+) -> Iterator[List[np.ndarray]]:
+    # each dimension is split in as many strata as samples, each stratum sampled exactly once
+    strata = [rng.permutation(samples) for rng in rngs]
+
+    for start in range(0, samples, chunk_size):
+        stop = min(start + chunk_size, samples)
+        yield [
+            d.sample((s[start:stop] + rng.random(stop - start)) / samples)
+            for d, s, rng in zip(domains, strata, rngs)
+        ]
+
+
+@check_type
+def generate_design(
+    schema: Dict[str, Dict],
+    method: str = 'full',
+    samples: Optional[int] = None,
+    levels: int = 5,
+    seed: Optional[int] = None,
+    keys: Optional[List[str]] = None,
+    chunk_size: int = _CHUNK_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """
+    Generate parameter sets out of the schema extracted by `onecode-extract --all` (see
+    [`parameter_domains()`][onecode.cli.doe.parameter_domains]), typically to run them with
+    `onecode-batch`. Parameters that are not swept keep their default value.
+
+    - `full`: full-factorial design, i-e all combinations of values. Continuous parameters
+        without `step` are split in `levels` values.
+    - `random`: `samples` parameter sets drawn uniformly at random.
+    - `lhs`: `samples` parameter sets drawn by Latin Hypercube Sampling, i-e each parameter range
+        is split in `samples` strata sampled exactly once.
+
+    Parameter sets are generated by chunks of vectorized NumPy operations, so that millions of
+    them can be streamed without being held in memory.
+
+    Args:
+        schema: Parameters with their full info set, as extracted by `onecode-extract --all`.
+        method: Design method: `full`, `random` or `lhs`.
+        samples: Number of parameter sets for `random` and `lhs` designs.
+        levels: Number of values of continuous parameters without step for `full` designs.
+        seed: Seed of the random generator for `random` and `lhs` designs.
+        keys: Keys of the parameters to sweep. If None, all parameters that can be swept are.
+        chunk_size: Number of parameter sets generated at once.
+
+    Returns:
+        An iterator over the parameter sets.
+
+    Raises:
+        ValueError: if the method is not supported, `samples` is missing for `random` and `lhs`
+            designs, or one of the given keys cannot be swept.
+
+    """
+    if method not in DOE_METHODS:
+        raise ValueError(f'Invalid design method {method}, must be one of {list(DOE_METHODS)}')
+
+    elif method != 'full' and samples is None:
+        raise ValueError(f'Number of samples is required for {method} designs')
+
+    domains = parameter_domains(schema, keys)
+    defaults = {k: v.get("value") for k, v in schema.items()}
+    swept = [k for k, d in domains.items() if d is not None]
+
+    # one random stream per parameter, so that designs do not depend on the chunk size
+    rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(len(swept))]
+
+    if not swept:
+        return iter([defaults])
+
+    elif method == 'full':
+        chunks = _full_factorial([domains[k].discretize(levels) for k in swept], chunk_size)
+    elif method == 'random':
+        chunks = _random([domains[k] for k in swept], samples, rngs, chunk_size)
+    else:
+        chunks = _latin_hypercube([domains[k] for k in swept], samples, rngs, chunk_size)
+
+    return (
+        {**defaults, **dict(zip(swept, values))}
+        for columns in chunks
+        for values in zip(*(c.tolist() for c in columns))
+    )
+
+
+@check_type
+def write_design(
+    schema_file: str,
+    to_file: str,
+    method: str = 'full',
+    samples: Optional[int] = None,
+    levels: int = 5,
+    seed: Optional[int] = None,
+    keys: Optional[List[str]] = None
+) -> int:
+    """
+    Generate parameter sets (see [`generate_design()`][onecode.cli.doe.generate_design]) and
+    stream them as JSON lines, e.g. to the standard output to be piped to `onecode-batch -`.
+
+    Args:
+        schema_file: Path to the JSON file extracted by `onecode-extract --all`.
+        to_file: Path to the JSON-lines output file, `-` for the standard output.
+        method: Design method: `full`, `random` or `lhs`.
+        samples: Number of parameter sets for `random` and `lhs` designs.
+        levels: Number of values of continuous parameters without step for `full` designs.
+        seed: Seed of the random generator for `random` and `lhs` designs.
+        keys: Keys of the parameters to sweep. If None, all parameters that can be swept are.
+
+    Returns:
+        The number of parameter sets written.
+
+    """
+    with open(schema_file) as f:
+        schema = json.load(f)
+
+    out = sys.stdout.buffer if to_file == '-' else open(to_file, 'wb')
+    count = 0
+
+    try:
+        for params in generate_design(schema, method, samples, levels, seed, keys):
+            if orjson is not None:
+                out.write(orjson.dumps(params, option=orjson.OPT_APPEND_NEWLINE))
+            else:
+                out.write(f'{json.dumps(params, separators=(",", ":"))}\n'.encode())
+
+            count += 1
+
+    finally:
+        if to_file == '-':
+            out.flush()
+        else:
+            out.close()
+
+    return count
+
+
+def main() -> None:    # pragma: no cover
+    """
+    ```bash
+    usage: onecode-doe [-h] [--output-file FILE] [--method {full,random,lhs}] [--samples INT]
+        [--levels INT] [--seed INT] [--keys [KEYS [KEYS ...]]] schema_file
+
+    Generate parameter sets from the OneCode project parameters schema
+
+    positional arguments:
+      schema_file           Path to the JSON file extracted by onecode-extract --all
+
+    optional arguments:
+      -h, --help            Show this help message and exit
+      --output-file FILE    Path to the JSON-lines output file, defaults to - (standard output)
+      --method METHOD       Design method: full (full-factorial, default), random or lhs
+                                (Latin Hypercube Sampling)
+      --samples INT         Number of parameter sets for random and lhs designs
+      --levels INT          Number of values of continuous parameters without step for full
+                                designs, defaults to 5
+      --seed INT            Seed of the random generator
+      --keys [KEYS [KEYS ...]]
+                            Keys of the parameters to sweep, defaults to all those that can be
+                                swept
+    ```
+
+    """
+    parser = argparse.ArgumentParser(
+        description='Generate parameter sets from the OneCode project parameters schema'
+    )
+    parser.add_argument(
+        'schema_file',
+        help='Path to the JSON file extracted by onecode-extract --all'
+    )
+    parser.add_argument(
+        '--output-file',
+        default='-',
+        help='Path to the JSON-lines output file, - for the standard output'
+    )
+    parser.add_argument(
+        '--method',
+        default='full',
+        choices=DOE_METHODS,
+        help='Design method'
+    )
+    parser.add_argument(
+        '--samples',
+        type=int,
+        required=False,
+        help='Number of parameter sets for random and lhs designs'
+    )
+    parser.add_argument(
+        '--levels',
+        default=5,
+        type=int,
+        help='Number of values of continuous parameters without step for full designs'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        required=False,
+        help='Seed of the random generator'
+    )
+    parser.add_argument(
+        '--keys',
+        nargs='*',
+        default=None,
+        help='Keys of the parameters to sweep'
+    )
+    args = parser.parse_args()
+
+    if args.method != 'full' and args.samples is None:
+        parser.error(f'--samples is required for {args.method} designs')
+
+    count = write_design(
+        args.schema_file,
+        args.output_file,
+        args.method,
+        args.samples,
+        args.levels,
+        args.seed,
+        args.keys
+    )
+
+    print(f'{count} parameter sets generated', file=sys.stderr)
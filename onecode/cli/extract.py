@@ -3,8 +3,8 @@
 
 import argparse
 import importlib
-import json
 import os
+import sys
 from typing import Dict, List, Optional
 
 from yaspin import yaspin
@@ -15,8 +15,9 @@ from ..base.decorator import check_type
 from ..base.enums import *  # noqa
 from ..base.enums import ElementType, Mode
 from ..base.project import Project
+from ..utils.element_plugins import register_element_plugins
 from ..utils.module import register_ext_module
-from .utils import process_call_graph
+from .utils import dump_json, process_call_graph
 
 
 @check_type
@@ -88,7 +89,8 @@ def extract_json(
     project_path: str,
     to_file: str,
     all: Optional[bool] = False,
-    verbose: bool = False
+    verbose: bool = False,
+    compact: bool = False
 ) -> None:
     """
     Extract the input parameter out of the given OneCode project and dump it to the specified file.
@@ -99,6 +101,8 @@ def extract_json(
         all: If False, extract only the values of the parameter, otherwise extract values and
             associated data such as `label`, `kind`, etc.
         verbose: If True, print out debug information.
+        compact: If True, write the JSON without indentation using the fastest available backend
+            (see [`dump_json()`][onecode.cli.utils.dump_json]).
 
     """
     Project().mode = Mode.EXTRACT_ALL if all else Mode.EXTRACT
@@ -109,8 +113,7 @@ def extract_json(
         p = process(v["calls"])
         parameters = {**parameters, **p}
 
-    with open(to_file, 'w') as out:
-        json.dump(parameters, out, indent=4)
+    dump_json(parameters, to_file, compact)
 
 
 @check_type
@@ -118,7 +121,7 @@ def main(cli: bool = True) -> None:    # pragma: no cover
     """
     ```bash
     usage: onecode-extract [-h] [--all] [--modules [MODULES [MODULES ...]]] [--path PATH]
-        [--verbose] output_file
+        [--verbose] [--compact] output_file
 
     Extract OneCode project parameters to JSON file
 
@@ -132,6 +135,7 @@ def main(cli: bool = True) -> None:    # pragma: no cover
                             Optional list of modules to import first
       --path PATH           Path to the project root directory if not the current working directory
       --verbose             Print verbose information when processing files
+      --compact             Write compact JSON (no indentation) using the fastest available backend
     ```
 
     """
@@ -163,6 +167,11 @@ def main(cli: bool = True) -> None:    # pragma: no cover
         help='Print verbose information when processing files',
         action='store_true'
     )
+    parser.add_argument(
+        '--compact',
+        help='Write compact JSON (no indentation) using the fastest available backend',
+        action='store_true'
+    )
     args = parser.parse_args()
 
     with yaspin(text="Extracting parameters") as spinner:
@@ -172,6 +181,10 @@ def main(cli: bool = True) -> None:    # pragma: no cover
             for mod in args.modules:
                 globals()[mod] = importlib.import_module(mod)
 
+            # register elements from installed plugins, imported only if their elements are used
+            for mod in register_element_plugins():
+                globals()[mod.split('.')[0]] = sys.modules[mod.split('.')[0]]
+
             # register elements from OneCode inline extensions if any
             globals()['onecode_ext'] = register_ext_module()
 
@@ -181,7 +194,7 @@ def main(cli: bool = True) -> None:    # pragma: no cover
                 else f'{args.output_file}.json'
 
             print('\n')
-            extract_json(project_path, out_filename, args.all, args.verbose)
+            extract_json(project_path, out_filename, args.all, args.verbose, args.compact)
 
             spinner.text = f"Parameters extracted to {out_filename}"
             spinner.ok("✅")
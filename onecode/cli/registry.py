@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
+# SPDX-License-Identifier: MIT
+
+import argparse
+import os
+from typing import List
+
+from ..base.decorator import check_type
+from ..utils.element_registry import find_element_packages, write_element_registry
+
+
+@check_type
+def write_element_registries(path: str) -> List[str]:
+    """
+    Generate the registry files of all the elements packages found under the given folder (see
+    [`find_element_packages()`][onecode.find_element_packages] and
+    [`write_element_registry()`][onecode.write_element_registry]).
+
+    Args:
+        path: Path to the folder to look for elements packages into.
+
+    Returns:
+        The paths to the registry files written.
+
+    """
+    return [
+        write_element_registry(init_file, element_type)
+        for init_file, element_type in find_element_packages(path)
+    ]
+
+
+def main() -> None:     # pragma: no cover
+    """
+    ```bash
+    usage: onecode-registry [-h] [paths [paths ...]]
+
+    Generate the registry files of OneCode elements packages
+
+    positional arguments:
+      paths       Folders to look for elements packages into, defaults to flows/onecode_ext
+
+    optional arguments:
+      -h, --help  show this help message and exit
+    ```
+
+    """
+    parser = argparse.ArgumentParser(
+        description='Generate the registry files of OneCode elements packages'
+    )
+    parser.add_argument(
+        'paths',
+        nargs='*',
+        default=[os.path.join('flows', 'onecode_ext')],
+        help='Folders to look for elements packages into, defaults to flows/onecode_ext'
+    )
+    args = parser.parse_args()
+
+    for path in args.paths:
+        for registry_file in write_element_registries(path):
+            print(f'Registry written to {registry_file}')
@@ -10,22 +10,70 @@ import json
 import logging
 import os
 from importlib import import_module
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from onecode import (
     ConfigOption,
     Env,
+    FlowCache,
     Logger,
     Mode,
     Project,
-    register_ext_module
+    register_ext_module,
+    run_flows
 )
 
 
+def _run_flow(wfl: Dict) -> Optional[str]:
+    """
+    Runs a single flow, or restores its results from cache if enabled.
+
+    Args:
+        wfl: Flow entry from the OneCode project configuration file.
+
+    Returns:
+        The path to the flow output manifest, or None if the flow does not exist.
+
+    """
+    cur_dir = os.path.dirname(__file__)
+    flow_file = wfl['file']
+
+    if not os.path.exists(os.path.join(cur_dir, 'flows', f'{flow_file}.py')):
+        print(f"Registered flow {wfl['label']} ({flow_file}.py) doesn't exist => skipping")
+        return None
+
+    Project().current_flow = flow_file
+
+    # clear any previous MANIFEST.txt output
+    manifest = Project().get_output_manifest()
+    if os.path.exists(manifest):
+        os.remove(manifest)
+
+    cache = FlowCache(cur_dir) if Project().get_config(ConfigOption.FLOW_CACHE) else None
+
+    if cache is not None and cache.restore(flow_file):
+        print(f"Flow {wfl['label']}: results restored from cache")
+    else:
+        if cache is not None:
+            cache.start(flow_file)
+
+        flow = import_module(f"flows.{flow_file}")
+        flow.run()
+
+        if Project().get_config(ConfigOption.ENRICH_MANIFEST):
+            Project().enrich_output_manifest()
+
+        if cache is not None:
+            cache.store(flow_file)
+
+    return manifest
+
+
 def main(
     data: Dict = None,
     flow_name: str = None,
-    logger: logging.Handler = None
+    logger: logging.Handler = None,
+    jobs: int = 1
 ):
     """
     Starts the OneCode project with the given options.
@@ -35,6 +83,8 @@ def main(
             `Mode.LOAD_THEN_EXECUTE`).
         flow_name: Execute only the flow specified by its ID. If None provided, all flows will run.
         logger: Add a logging handler to the OneCode Logger.
+        jobs: Maximum number of flows running concurrently, according to the dependencies
+            declared in their `depends_on` attribute. Set to 0 to use all available cores.
 
     Raises:
         FileNotFoundError: if the OneCode project configuration file is not found.
@@ -61,23 +111,10 @@ def main(
     with open(config_file) as f:
         workflows = json.load(f)
 
-    all_manifests = []
-    for wfl in workflows:
-        flow_file = wfl['file']
-        if flow_name is None or flow_name == flow_file:
-            if not os.path.exists(os.path.join(cur_dir, 'flows', f'{flow_file}.py')):
-                print(f"Registered flow {wfl['label']} ({flow_file}.py) doesn't exist => skipping")
-            else:
-                Project().current_flow = flow_file
-
-                # clear any previous MANIFEST.txt output
-                manifest = Project().get_output_manifest()
-                if os.path.exists(manifest):
-                    os.remove(manifest)
-
-                flow = import_module(f"flows.{flow_file}")
-                flow.run()
-                all_manifests.append(manifest)
+    all_manifests = [
+        manifest for manifest in run_flows(workflows, _run_flow, flow_name, jobs, logger)
+        if manifest is not None
+    ]
 
     return all_manifests[0] if len(all_manifests) == 1 else all_manifests
 
@@ -86,6 +123,17 @@ def _main(raw_args: List[str] = None):
     parser = argparse.ArgumentParser(description='Use optional JSON parameters file')
     parser.add_argument('--flow', default=None, help='Specify the flow to run')
     parser.add_argument('--flush', action="store_true", help='Flush the logs immediately')
+    parser.add_argument(
+        '--cache',
+        action="store_true",
+        help='Restore flow results from cache when their code and inputs are unchanged'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Maximum number of flows running concurrently (0 for all cores)'
+    )
     parser.add_argument('file', nargs='?', help='Path to the input JSON file')
 
     args = parser.parse_args(raw_args)
@@ -106,7 +154,10 @@ def _main(raw_args: List[str] = None):
     if args.flush:
         Project().set_config(ConfigOption.FLUSH_STDOUT, True)
 
-    main(data, args.flow)
+    if args.cache:
+        Project().set_config(ConfigOption.FLOW_CACHE, True)
+
+    main(data, args.flow, jobs=args.jobs)
 
 
 if __name__ == '__main__':
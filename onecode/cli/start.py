@@ -1,18 +1,260 @@
 # SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
 # SPDX-License-Identifier: MIT
 
-import argparse  # pragma: no cover
+import argparse
+import codecs
+import importlib
+import json
+import os
+import signal
+import socket
+import sys
+import traceback
+from typing import Dict, List, Optional, TextIO
+
+from ..base.decorator import check_type
+from ..base.enums import Env, Mode
+from ..base.project import Project
+from .utils import get_flows, import_project_main
+
+# Name of the socket file created at the root of the project by `onecode-start --serve`.
+SOCKET_FILE = '.onecode.sock'
+
+# Byte separating the logs streamed back by the server from the final run status.
+_END_OF_LOGS = b'\0'
+
+
+def _default_socket(project_path: str) -> str:
+    return os.path.join(os.path.abspath(project_path), SOCKET_FILE)
+
+
+def _reap_children(*args) -> None:
+    try:
+        while os.waitpid(-1, os.WNOHANG)[0] > 0:
+            pass
+    except ChildProcessError:
+        pass
+
+
+def _handle_request(
+    conn: socket.socket,
+    project_main
+) -> None:
+    """
+    Internal function running a request in a process forked from the server: the standard output
+    and error are redirected to the client connection, followed by the final run status.
+
+    """
+    with conn.makefile('rb') as f:
+        request = json.loads(f.readline())
+
+    os.dup2(conn.fileno(), sys.stdout.fileno())
+    os.dup2(conn.fileno(), sys.stderr.fileno())
+    sys.stdout.reconfigure(line_buffering=True)
+    sys.stderr.reconfigure(line_buffering=True)
+
+    try:
+        if request.get("output") is not None:
+            os.environ[Env.ONECODE_PROJECT_OUTPUT] = request["output"]
+
+        Project().reset(keep_registered_elements=True)
+
+        data = None
+        if request.get("params") is not None:
+            with open(request["params"]) as f:
+                data = json.load(f)
+
+            Project().mode = Mode.LOAD_THEN_EXECUTE
+        else:
+            Project().mode = Mode.EXECUTE
+
+        status = {"status": "success", "manifest": project_main.main(data, request.get("flow"))}
+
+    except Exception as e:
+        traceback.print_exc()
+        status = {"status": "failed", "error": f'{type(e).__name__}: {e}'}
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    conn.sendall(_END_OF_LOGS + json.dumps(status).encode() + b'\n')
+
+
+@check_type
+def serve(
+    project_path: str,
+    data_path: str,
+    socket_path: Optional[str] = None,
+    modules: Optional[List[str]] = None,
+    verbose: bool = False
+) -> None:
+    """
+    Serve the OneCode project on a UNIX socket until interrupted: OneCode, the project `main`
+    module, its flows and their dependencies are imported once, then each request is run in a
+    process forked from this pre-warmed server, so that runs do not pay the interpreter and
+    import startup cost. Requests are sent with [`submit()`][onecode.cli.start.submit].
+
+    Flows code changes are not picked up by a running server: restart it after editing the
+    project.
+
+    !!! note
+        Only available on platforms supporting `fork()` and UNIX sockets (i-e not Windows).
+
+    Args:
+        project_path: Path to the root of the OneCode project.
+        data_path: Path to the data folder.
+        socket_path: Path to the UNIX socket to listen on, defaults to `.onecode.sock` at the
+            root of the project.
+        modules: Optional list of modules to import first, typically modules extending OneCode.
+        verbose: If True, print each request received.
+
+    Raises:
+        OSError: if the platform does not support `fork()` or UNIX sockets.
+
+    """
+    if not hasattr(os, 'fork') or not hasattr(socket, 'AF_UNIX'):     # pragma: no cover
+        raise OSError('onecode-start --serve requires fork() and UNIX sockets support')
+
+    project_path = os.path.abspath(project_path)
+    data_path = os.path.abspath(data_path)
+    socket_path = socket_path if socket_path is not None else _default_socket(project_path)
+
+    for module in modules if modules is not None else []:
+        importlib.import_module(module)
+
+    project_main = import_project_main(project_path, data_path)
+    for wfl in get_flows(project_path):
+        try:
+            importlib.import_module(f"flows.{wfl['file']}")
+        except Exception as e:
+            # the error is reported to the client when the flow runs
+            print(f"Flow {wfl['label']} could not be preloaded: {e}")
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen()
+
+    signal.signal(signal.SIGCHLD, _reap_children)
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+    print(f'OneCode project {project_path} served on {socket_path}', flush=True)
+
+    try:
+        while True:
+            conn, _ = server.accept()
+
+            # buffered output must not be inherited by the forked process
+            sys.stdout.flush()
+            sys.stderr.flush()
+
+            if os.fork() == 0:
+                server.close()
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+                try:
+                    _handle_request(conn, project_main)
+                finally:
+                    conn.close()
+                    os._exit(0)
+
+            conn.close()
+            if verbose:
+                print('Request received', flush=True)
+
+    finally:
+        server.close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+@check_type
+def submit(
+    params_file: Optional[str] = None,
+    flow_name: Optional[str] = None,
+    socket_path: Optional[str] = None,
+    output_path: Optional[str] = None,
+    stream: Optional[TextIO] = None
+) -> Dict:
+    """
+    Run the OneCode project served by `onecode-start --serve` (see
+    [`serve()`][onecode.cli.start.serve]) and stream back its logs.
+
+    Args:
+        params_file: Path to the input JSON parameters file. If None, the project runs in
+            `Mode.EXECUTE` with its default values, otherwise in `Mode.LOAD_THEN_EXECUTE`.
+        flow_name: Execute only the flow specified by its ID. If None provided, all flows will run.
+        socket_path: Path to the UNIX socket the server listens on, defaults to `.onecode.sock`
+            in the current working directory.
+        output_path: Path to the folder where to write the outputs, if not the default one (see
+            [`Project.output_root`][onecode.Project.output_root]).
+        stream: Text stream where to write the logs as they come, defaults to the standard
+            output.
+
+    Returns:
+        The run status: `status` (`success` or `failed`), along with `manifest` (the path(s) to
+        the output manifest(s)) or `error`.
+
+    """
+    socket_path = socket_path if socket_path is not None else _default_socket(os.getcwd())
+    stream = stream if stream is not None else sys.stdout
+
+    request = {
+        "params": os.path.abspath(params_file) if params_file is not None else None,
+        "flow": flow_name,
+        "output": os.path.abspath(output_path) if output_path is not None else None,
+    }
+
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    status = None
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(json.dumps(request).encode() + b'\n')
+
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+
+            if status is not None:
+                status += chunk
+                continue
+
+            logs, end_of_logs, status_chunk = chunk.partition(_END_OF_LOGS)
+            stream.write(decoder.decode(logs))
+            stream.flush()
+
+            if end_of_logs:
+                status = status_chunk
+
+    if status is None:
+        return {"status": "failed", "error": 'Connection closed before the run completed'}
+
+    return json.loads(status)
 
 
 def main() -> None:     # pragma: no cover
     """
     ```bash
-    usage: onecode-start [-h] [--modules [MODULES [MODULES ...]]] [--verbose]
+    usage: onecode-start [-h] [--serve] [--submit] [--socket PATH] [--path PATH] [--data PATH]
+        [--flow FLOW] [--output-path PATH] [--modules [MODULES [MODULES ...]]] [--verbose] [file]
 
     Start the OneCode Project in Interactive mode.
 
+    positional arguments:
+      file                  With --submit, path to the input JSON parameters file
+
     optional arguments:
       -h, --help            show this help message and exit
+      --serve               Serve the project on a UNIX socket from a pre-warmed process
+      --submit              Run the project served by onecode-start --serve and stream its logs
+      --socket PATH         Path to the UNIX socket, defaults to .onecode.sock at the project root
+      --path PATH           Path to the project root directory if not the current working directory
+      --data PATH           Path to the data root directory if not the default data directory
+      --flow FLOW           With --submit, specify the flow to run
+      --output-path PATH    With --submit, path to the folder where to write the outputs
       --modules [MODULES [MODULES ...]]
                             Optional list of modules to import first
       --verbose             Print verbose information when processing files
@@ -20,6 +262,37 @@ def main() -> None:     # pragma: no cover
 
     """
     parser = argparse.ArgumentParser(description='Start the OneCode Project in Interactive Mode.')
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Serve the project on a UNIX socket from a pre-warmed process'
+    )
+    parser.add_argument(
+        '--submit',
+        action='store_true',
+        help='Run the project served by onecode-start --serve and stream its logs'
+    )
+    parser.add_argument(
+        '--socket',
+        required=False,
+        help='Path to the UNIX socket, defaults to .onecode.sock at the project root'
+    )
+    parser.add_argument(
+        '--path',
+        required=False,
+        help='Path to the project root directory if not the current working directory'
+    )
+    parser.add_argument(
+        '--data',
+        required=False,
+        help='Path to the data root directory if not the default data directory'
+    )
+    parser.add_argument('--flow', default=None, help='Specify the flow to run')
+    parser.add_argument(
+        '--output-path',
+        required=False,
+        help='Path to the folder where to write the outputs'
+    )
     parser.add_argument(
         '--modules',
         nargs='*',
@@ -31,14 +304,28 @@ def main() -> None:     # pragma: no cover
         action='store_true',
         help='Print verbose information when processing files'
     )
-    # args = parser.parse_args()
+    parser.add_argument('file', nargs='?', help='Path to the input JSON parameters file')
+    args = parser.parse_args()
+
+    project_path = args.path if args.path is not None else os.getcwd()
+    socket_path = args.socket if args.socket is not None else _default_socket(project_path)
+
+    if args.serve:
+        data_path = args.data if args.data is not None else os.path.join(project_path, 'data')
+
+        try:
+            serve(project_path, data_path, socket_path, args.modules, args.verbose)
+        except KeyboardInterrupt:
+            pass
+
+    elif args.submit:
+        status = submit(args.file, args.flow, socket_path, args.output_path)
 
-    # optionally load required modules dynamically,
-    # typically modules extending OneCode
-    # for mod in args.modules:
-    #     globals()[mod] = importlib.import_module(mod)
+        if status["status"] != 'success':
+            print(status["error"], file=sys.stderr)
+            sys.exit(1)
 
-    # register elements from OneCode inline extensions if any
-    # globals()['onecode_ext'] = register_ext_module()
+        print(f'Output manifest: {status["manifest"]}')
 
-    print('onecode-start is not yet available yet on 1.x, stay tuned!\n')
+    else:
+        print('onecode-start is not yet available yet on 1.x, stay tuned!\n')
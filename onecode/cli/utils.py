@@ -2,11 +2,14 @@
 # SPDX-License-Identifier: MIT
 
 import ast
+import importlib.util
 import json
 import os
+import sys
 from collections import OrderedDict
 from glob import iglob
-from typing import Dict, List, Optional
+from types import ModuleType
+from typing import Any, Dict, List, Optional
 
 import pydash
 from astunparse import unparse
@@ -18,6 +21,12 @@ from slugify import slugify
 from ..base.decorator import check_type
 from ..base.enums import Env
 from ..base.project import Project
+from ..utils.element_plugins import detached_element_plugins
+
+try:
+    import orjson
+except ImportError:     # pragma: no cover
+    orjson = None
 
 
 @check_type
@@ -42,6 +51,82 @@ def get_flows(project_path: str) -> Dict:
     return config
 
 
+@check_type
+def import_project_main(
+    project_path: str,
+    data_path: str
+) -> ModuleType:
+    """
+    Import the `main` module of a OneCode project, along with OneCode and the project
+    dependencies, so that it can be run several times from the current process (or processes
+    forked from it) without paying the interpreter and import startup cost again. The current
+    working directory is changed to the project root, as when running `python main.py`.
+
+    Args:
+        project_path: Path to the root of the OneCode project.
+        data_path: Path to the data folder.
+
+    Returns:
+        The project `main` module.
+
+    """
+    # forget any previously imported project
+    for module in [m for m in sys.modules if m == 'main' or m.split('.')[0] == 'flows']:
+        del sys.modules[module]
+
+    os.chdir(project_path)
+    sys.path.insert(0, project_path)
+    os.environ[Env.ONECODE_PROJECT_DATA] = data_path
+
+    spec = importlib.util.spec_from_file_location('main', os.path.join(project_path, 'main.py'))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+
+    return module
+
+
+@check_type
+def dump_json(
+    data: Any,
+    to_file: str,
+    compact: bool = False
+) -> None:
+    """
+    Dump JSON-serializable data to the given file. By default, the JSON is indented for
+    readability. In compact mode, no indentation nor extra whitespace is written: if `orjson` is
+    installed, it is used as a faster backend, otherwise the standard library encoder streams the
+    JSON chunks incrementally to the file rather than building the full string in memory.
+
+    Args:
+        data: JSON-serializable data to dump.
+        to_file: Path of the output file to dump the JSON to.
+        compact: If True, write the JSON without indentation using the fastest available backend.
+
+    """
+    if not compact:
+        with open(to_file, 'w') as out:
+            json.dump(data, out, indent=4)
+
+        return
+
+    if orjson is not None:
+        try:
+            serialized = orjson.dumps(data)
+            with open(to_file, 'wb') as out:
+                out.write(serialized)
+
+            return
+
+        # e.g. non-string keys or integers out of 64-bit range: fallback to stdlib
+        except TypeError:   # pragma: no cover
+            pass
+
+    # json.dump() writes encoded chunks as they are produced
+    with open(to_file, 'w') as out:
+        json.dump(data, out, separators=(',', ':'))
+
+
 @check_type
 def _get_flow_choices(project_path: str) -> List[Choice]:     # pragma: no cover
     """
@@ -229,7 +314,8 @@ def process_call_graph(
         -1,
         CALL_GRAPH_OP
     )
-    cg.analyze()
+    with detached_element_plugins():
+        cg.analyze()
     flow_graph = cg.output_enriched()
 
     for flow in get_flows(project_path):
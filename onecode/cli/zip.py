@@ -2,12 +2,646 @@
 # SPDX-License-Identifier: MIT
 
 import argparse
+import contextlib
+import gzip
+import io
 import json
+import mimetypes
 import os
+import struct
+import sys
+import tarfile
+import time
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
 
+from ..base.checksum import file_digest
 from ..base.decorator import check_type
-from .utils import get_flows
+from .utils import dump_json, get_flows
+
+try:
+    import zstandard
+except ImportError:     # pragma: no cover
+    zstandard = None
+
+# Size of the chunks compressed independently by the workers in parallel mode.
+_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Formats already compressed: deflating them again costs CPU time for no size gain.
+_COMPRESSED_MIMETYPES = (
+    'application/gzip',
+    'application/java-archive',
+    'application/vnd.openxmlformats-officedocument.',
+    'application/vnd.rar',
+    'application/x-7z-compressed',
+    'application/x-bzip2',
+    'application/x-gzip',
+    'application/x-rar-compressed',
+    'application/x-xz',
+    'application/zip',
+    'application/zstd',
+    'audio/',
+    'image/gif',
+    'image/jpeg',
+    'image/png',
+    'image/webp',
+    'video/',
+)
+_COMPRESSED_EXTENSIONS = ('.br', '.lz4', '.npz', '.parquet', '.zst')
+
+# Formats known to compress well: no need to sample them.
+_COMPRESSIBLE_MIMETYPES = (
+    'application/json',
+    'application/xml',
+    'image/svg+xml',
+    'text/',
+)
+
+# Size of the sample compressed to estimate the compressibility of other files, and the
+# compression ratio (compressed/original) above which a file is stored as-is.
+_SAMPLE_SIZE = 64 * 1024
+_STORE_RATIO = 0.95
+
+# Name of the archive member mapping duplicate outputs to the member holding their content, when
+# deduplicating zip archives (tar archives use hard links instead).
+DUPLICATES_INDEX = 'DUPLICATES.json'
+
+# Supported archive formats, also used as file extensions.
+ARCHIVE_FORMATS = ('zip', 'tar', 'tar.gz', 'tar.zst')
+
+# Upper bound of the archive overhead (headers, padding) per member, used to plan volumes.
+_MEMBER_OVERHEAD = 1024
+
+
+def _gf2_matrix_times(
+    mat: List[int],
+    vec: int
+) -> int:
+    s = 0
+    i = 0
+    while vec:
+        if vec & 1:
+            s ^= mat[i]
+        vec >>= 1
+        i += 1
+
+    return s
+
+
+@lru_cache(maxsize=32)
+def _crc32_shift_operator(length: int) -> Tuple[int, ...]:
+    """
+    Internal function returning the GF(2) matrix operator that appends `length` zero bytes to a
+    CRC-32, as done by zlib's `crc32_combine()`. Operators are cached since chunks share the same
+    length (except the last chunk of each file).
+
+    """
+    # operator for one zero bit, then squared to get two, four, ... zero bits
+    odd = [0xedb88320] + [1 << n for n in range(31)]
+    even = [_gf2_matrix_times(odd, odd[n]) for n in range(32)]
+    odd = [_gf2_matrix_times(even, even[n]) for n in range(32)]
+
+    op = [1 << n for n in range(32)]
+    while True:
+        even = [_gf2_matrix_times(odd, odd[n]) for n in range(32)]
+        if length & 1:
+            op = [_gf2_matrix_times(even, op[n]) for n in range(32)]
+
+        length >>= 1
+        if not length:
+            break
+
+        odd = [_gf2_matrix_times(even, even[n]) for n in range(32)]
+        if length & 1:
+            op = [_gf2_matrix_times(odd, op[n]) for n in range(32)]
+
+        length >>= 1
+        if not length:
+            break
+
+    return tuple(op)
+
+
+def _crc32_combine(
+    crc1: int,
+    crc2: int,
+    len2: int
+) -> int:
+    """
+    Internal function combining the CRC-32 of two consecutive blocks of data into the CRC-32 of
+    their concatenation, given the length of the second block.
+
+    """
+    if len2 <= 0:
+        return crc1
+
+    return _gf2_matrix_times(_crc32_shift_operator(len2), crc1) ^ crc2
+
+
+def _sample_compression(
+    path: str,
+    compression_level: int
+) -> Tuple[float, float]:
+    """
+    Internal function estimating how well a file compresses by deflating a sample taken from
+    the middle of the file (headers are rarely representative of the content).
+
+    Returns:
+        The compression ratio (compressed size over original size) and the time spent
+            compressing per byte.
+
+    """
+    with open(path, 'rb') as f:
+        f.seek(max(0, os.fstat(f.fileno()).st_size // 2 - _SAMPLE_SIZE // 2))
+        sample = f.read(_SAMPLE_SIZE)
+
+    if not sample:
+        return 0., 0.
+
+    start = time.perf_counter()
+    compressed = zlib.compress(sample, compression_level)
+    elapsed = time.perf_counter() - start
+
+    return len(compressed) / len(sample), elapsed / len(sample)
+
+
+def _select_compression(
+    path: str,
+    mimetype: Optional[str],
+    compression_level: int
+) -> Tuple[int, Optional[str]]:
+    """
+    Internal function selecting whether a file should be deflated or stored as-is: files already
+    compressed according to their mimetype or extension are stored, files known to compress well
+    are deflated, others are sampled (see `_sample_compression()`).
+
+    Returns:
+        The zipfile compression type and the reason why the file is stored, if so.
+
+    """
+    if compression_level == 0:
+        return zipfile.ZIP_STORED, None
+
+    if mimetype is None:
+        mimetype = mimetypes.guess_type(path)[0]
+
+    if mimetype is not None:
+        if mimetype.startswith(_COMPRESSED_MIMETYPES):
+            return zipfile.ZIP_STORED, f'mimetype {mimetype}'
+
+        elif mimetype.startswith(_COMPRESSIBLE_MIMETYPES):
+            return zipfile.ZIP_DEFLATED, None
+
+    ext = os.path.splitext(path)[1].lower()
+    if ext in _COMPRESSED_EXTENSIONS:
+        return zipfile.ZIP_STORED, f'extension {ext}'
+
+    ratio, _ = _sample_compression(path, compression_level)
+    if ratio > _STORE_RATIO:
+        return zipfile.ZIP_STORED, f'sampled compression ratio {ratio:.2f}'
+
+    return zipfile.ZIP_DEFLATED, None
+
+
+def _deflate_chunk(
+    data: bytes,
+    compression_level: int,
+    last: bool
+) -> bytes:
+    """
+    Internal function compressing a chunk of data as a raw-deflate stream. Chunks other than the
+    last one are full-flushed rather than finished so that the streams of consecutive chunks can
+    simply be concatenated into a single valid deflate stream.
+
+    """
+    compressor = zlib.compressobj(compression_level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(
+        zlib.Z_FINISH if last else zlib.Z_FULL_FLUSH
+    )
+
+
+def _compress_chunk(
+    path: str,
+    offset: int,
+    size: int,
+    compress_type: int,
+    compression_level: int,
+    last: bool
+) -> Tuple[int, int, bytes]:
+    """
+    Internal function reading a chunk of file and compressing it (see `_deflate_chunk()`).
+
+    Returns:
+        The CRC-32 and size of the uncompressed chunk, and the compressed data.
+
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read(size)
+
+    compressed = _deflate_chunk(data, compression_level, last) \
+        if compress_type == zipfile.ZIP_DEFLATED else data
+
+    return zlib.crc32(data), len(data), compressed
+
+
+def _write_parallel(
+    zf: zipfile.ZipFile,
+    members: List[Tuple[str, str, int]],
+    compression_level: int,
+    workers: int,
+    max_memory: int
+) -> None:
+    """
+    Internal function writing the given files into the archive, compressing chunks of files
+    concurrently in a thread pool (zlib releases the GIL while compressing). Members are written
+    in order, each member local header being rewritten once its CRC and sizes are known. At most
+    `max_memory` bytes of chunks are in flight at any time.
+
+    Args:
+        zf: Archive opened in write mode on a seekable file.
+        members: List of `(path, arcname, compress_type)` to add to the archive.
+        compression_level: Compression level from 0 (no-compression) to 9 (highest).
+        workers: Number of compression threads.
+        max_memory: Approximate upper bound of the memory used by in-flight chunks, in bytes.
+
+    """
+    max_in_flight = max(1, max_memory // _CHUNK_SIZE)
+    zf.fp.seek(zf.start_dir)
+
+    def _tasks() -> Iterator[Tuple[str, zipfile.ZipInfo, int, bool]]:
+        for path, arcname, compress_type in members:
+            zinfo = zipfile.ZipInfo.from_file(path, arcname)
+            if zinfo.is_dir():
+                yield path, zinfo, 0, True
+                continue
+
+            zinfo.compress_type = compress_type
+            n_chunks = max(1, -(-zinfo.file_size // _CHUNK_SIZE))
+            for c in range(n_chunks):
+                yield path, zinfo, c * _CHUNK_SIZE, c == n_chunks - 1
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        tasks = _tasks()
+        in_flight = deque()
+
+        def _submit() -> None:
+            while len(in_flight) < max_in_flight:
+                task = next(tasks, None)
+                if task is None:
+                    break
+
+                path, zinfo, offset, last = task
+                future = None if zinfo.is_dir() else executor.submit(
+                    _compress_chunk,
+                    path,
+                    offset,
+                    _CHUNK_SIZE,
+                    zinfo.compress_type,
+                    compression_level,
+                    last
+                )
+                in_flight.append((path, zinfo, offset, last, future))
+
+        _submit()
+        while in_flight:
+            path, zinfo, offset, last, future = in_flight.popleft()
+
+            if future is None:
+                # directories carry no data
+                zf.write(path, zinfo.filename)
+
+            else:
+                if offset == 0:
+                    # sizes are unknown yet: header is rewritten once the member is complete
+                    zip64 = zinfo.file_size * 1.05 > zipfile.ZIP64_LIMIT
+                    zinfo.header_offset = zf.fp.tell()
+                    zinfo.CRC = 0
+                    zinfo.compress_size = 0
+                    zf.fp.write(zinfo.FileHeader(zip64))
+                    file_crc = 0
+                    file_size = 0
+
+                crc, size, data = future.result()
+                file_crc = crc if offset == 0 else _crc32_combine(file_crc, crc, size)
+                file_size += size
+                zinfo.compress_size += len(data)
+                zf.fp.write(data)
+
+                if last:
+                    zinfo.CRC = file_crc
+                    zinfo.file_size = file_size
+
+                    end = zf.fp.tell()
+                    zf.fp.seek(zinfo.header_offset)
+                    zf.fp.write(zinfo.FileHeader(zip64))
+                    zf.fp.seek(end)
+
+                    zf.filelist.append(zinfo)
+                    zf.NameToInfo[zinfo.filename] = zinfo
+                    zf.start_dir = end
+                    zf._didModify = True
+
+            _submit()
+
+
+def _content_digest(output: Tuple[str, str, Dict]) -> str:
+    """
+    Internal function hashing the content of an output file. The hash recorded in the manifest
+    entry (see `Project.enrich_output_manifest()`) is used if the file size and modification time
+    did not change since.
+
+    """
+    output_file, _, entry = output
+    if "hash" in entry:
+        st = os.stat(output_file)
+        if st.st_size == entry.get("size") and st.st_mtime == entry.get("mtime"):
+            return entry["hash"]
+
+    return file_digest(output_file)
+
+
+def _deduplicate(
+    outputs: List[Tuple],
+    workers: int,
+    verbose: bool = False
+) -> Tuple[List[Tuple], Dict[str, str]]:
+    """
+    Internal function finding outputs with identical content. Only files sharing the same size
+    are hashed (see `_content_digest()`), concurrently with the given number of threads. The
+    first output of each group of identical files is kept as the reference for the others.
+
+    Args:
+        outputs: List of `(path, arcname, manifest_entry)` to archive.
+        workers: Number of threads hashing files concurrently.
+        verbose: If True, print out the duplicates and the bytes saved.
+
+    Returns:
+        The outputs to archive, i.e. without duplicates, and the mapping of the path in the
+        archive of each duplicate to the path of its reference.
+
+    """
+    by_size = {}
+    for output in outputs:
+        if os.path.isfile(output[0]):
+            by_size.setdefault(os.path.getsize(output[0]), []).append(output)
+
+    candidates = [output for group in by_size.values() if len(group) > 1 for output in group]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        digests = dict(zip(
+            [output[0] for output in candidates],
+            executor.map(_content_digest, candidates)
+        ))
+
+    references = {}
+    duplicates = {}
+    saved_bytes = 0
+    for output in candidates:
+        key = (os.path.getsize(output[0]), digests[output[0]])
+        if key not in references:
+            references[key] = output[1]
+        elif output[1] != references[key]:
+            duplicates[output[1]] = references[key]
+            saved_bytes += key[0]
+
+            if verbose:
+                print(f"Deduplicating {output[1]} => {references[key]}")
+
+    if duplicates:
+        print(f"Deduplicated {len(duplicates)} file(s): {saved_bytes} bytes not archived again")
+
+    return [output for output in outputs if output[1] not in duplicates], duplicates
+
+
+class _ParallelGzipWriter(io.RawIOBase):
+    """
+    Internal write-only stream compressing data to gzip format with a pool of threads: written
+    data is split in chunks deflated concurrently (see `_deflate_chunk()`), then written in order
+    to the underlying file object. The underlying file object does not need to be seekable and
+    at most `max_memory` bytes of chunks are in flight at any time.
+
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        compression_level: int,
+        workers: int,
+        max_memory: int
+    ):
+        super().__init__()
+        self._fileobj = fileobj
+        self._compression_level = compression_level
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._max_in_flight = max(1, max_memory // _CHUNK_SIZE)
+        self._in_flight = deque()
+        self._buffer = bytearray()
+        self._crc = 0
+        self._size = 0
+
+        # gzip header: deflate, no flag, no mtime, unknown OS
+        self._fileobj.write(b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff')
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        while len(self._buffer) >= _CHUNK_SIZE:
+            chunk = bytes(self._buffer[:_CHUNK_SIZE])
+            del self._buffer[:_CHUNK_SIZE]
+            self._submit(chunk, False)
+
+        return len(data)
+
+    def _submit(
+        self,
+        chunk: bytes,
+        last: bool
+    ) -> None:
+        while len(self._in_flight) >= self._max_in_flight:
+            self._write_next()
+
+        self._crc = _crc32_combine(self._crc, zlib.crc32(chunk), len(chunk))
+        self._size += len(chunk)
+        self._in_flight.append(
+            self._executor.submit(_deflate_chunk, chunk, self._compression_level, last)
+        )
+
+    def _write_next(self) -> None:
+        self._fileobj.write(self._in_flight.popleft().result())
+
+    def close(self) -> None:
+        if not self.closed:
+            self._submit(bytes(self._buffer), True)
+            while self._in_flight:
+                self._write_next()
+
+            self._fileobj.write(struct.pack('<II', self._crc, self._size & 0xffffffff))
+            self._executor.shutdown()
+
+        super().close()
+
+
+def _is_unchanged(
+    zinfo: zipfile.ZipInfo,
+    path: str,
+    check_crc: bool
+) -> bool:
+    """
+    Internal function checking whether an archived member is up-to-date with its file: size and
+    modification time (at the zip 2-seconds resolution) must match, and optionally the CRC-32.
+
+    """
+    current = zipfile.ZipInfo.from_file(path, zinfo.filename)
+    if current.file_size != zinfo.file_size or \
+            current.date_time[:5] != zinfo.date_time[:5] or \
+            current.date_time[5] // 2 != zinfo.date_time[5] // 2:
+        return False
+
+    if check_crc and not current.is_dir():
+        crc = 0
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+                crc = zlib.crc32(chunk, crc)
+
+        return crc == zinfo.CRC
+
+    return True
+
+
+def _prune_archive(
+    zf: zipfile.ZipFile,
+    members: List[Tuple[str, str, Dict]],
+    check_crc: bool,
+    verbose: bool
+) -> List[Tuple[str, str, Dict]]:
+    """
+    Internal function preparing an existing archive for an incremental update: members that are
+    unchanged are kept as-is (their compressed data is moved down in place if needed, never
+    recompressed), others are dropped. New members are then expected to be written from
+    `zf.start_dir`.
+
+    Args:
+        zf: Existing archive opened in append mode.
+        members: List of `(path, arcname, manifest_entry)` that the archive should contain.
+        check_crc: If True, also compare the CRC-32 of unchanged files (requires reading them).
+        verbose: If True, print out the members being removed.
+
+    Returns:
+        The members that must be (re-)written to the archive.
+
+    """
+    keep = set()
+    wanted = set()
+    to_write = []
+    for member in members:
+        path, arcname, _ = member
+        name = zipfile.ZipInfo.from_file(path, arcname).filename
+        zinfo = zf.NameToInfo.get(name)
+        wanted.add(name)
+
+        if zinfo is not None and _is_unchanged(zinfo, path, check_crc):
+            keep.add(name)
+        else:
+            to_write.append(member)
+
+    # compact kept members: each local record spans until the next one (or the central directory)
+    infos = sorted(zf.infolist(), key=lambda i: i.header_offset)
+    ends = [i.header_offset for i in infos[1:]] + [zf.start_dir]
+    pos = infos[0].header_offset if infos else zf.start_dir
+    kept_infos = []
+    removed = 0
+
+    for zinfo, end in zip(infos, ends):
+        # in case of duplicate names, only the last one is considered
+        if zinfo.filename in keep and zf.NameToInfo[zinfo.filename] is zinfo:
+            size = end - zinfo.header_offset
+            if zinfo.header_offset != pos:
+                # destination is always before source: moving chunks in order is safe
+                for offset in range(0, size, _CHUNK_SIZE):
+                    zf.fp.seek(zinfo.header_offset + offset)
+                    chunk = zf.fp.read(min(_CHUNK_SIZE, size - offset))
+                    zf.fp.seek(pos + offset)
+                    zf.fp.write(chunk)
+
+                zinfo.header_offset = pos
+
+            pos += size
+            kept_infos.append(zinfo)
+
+        elif zinfo.filename not in wanted and zinfo.filename != DUPLICATES_INDEX:
+            # the duplicates index is not an output: it is dropped and rewritten if needed
+            removed += 1
+            if verbose:
+                print(f"Removing {zinfo.filename}")
+
+    zf.filelist = kept_infos
+    zf.NameToInfo = {zinfo.filename: zinfo for zinfo in kept_infos}
+    zf.start_dir = pos
+    zf._didModify = True
+
+    if verbose:
+        print(
+            f"Incremental update: {len(kept_infos)} member(s) unchanged, "
+            f"{len(to_write)} to write, {removed} removed"
+        )
+
+    return to_write
+
+
+def _flow_outputs(
+    flow: Dict,
+    data_path: str,
+    verbose: bool = False
+) -> Iterator[Tuple[Dict, str, str]]:
+    """
+    Internal generator going through the manifest of a flow.
+
+    Yields:
+        The manifest entry, the path of the output file and its path in the archive.
+
+    """
+    print(f"Processing flow {flow['label']}...")
+
+    with open(os.path.join(data_path, "outputs", flow["file"], "MANIFEST.txt")) as f:
+        for line in f:
+            output = json.loads(line)
+
+            output_file = output["value"]
+            arcpath = os.path.join(
+                "outputs",
+                os.path.relpath(output_file, os.path.join(data_path, "outputs"))
+            )
+
+            if verbose:
+                print(f"Archiving {output['key']}: {output_file} => {arcpath}")
+
+            yield output, output_file, arcpath
+
+
+def _outputs(
+    project_path: str,
+    data_path: str,
+    verbose: bool = False
+) -> List[Tuple[str, str, Dict]]:
+    """
+    Internal function listing the existing outputs of each flow of the OneCode project.
+
+    Returns:
+        The path of each output file, its path in the archive and its manifest entry.
+
+    """
+    return [
+        (output_file, arcpath, output)
+        for flow in get_flows(project_path)
+        for output, output_file, arcpath in _flow_outputs(flow, data_path, verbose)
+        if os.path.exists(output_file)
+    ]
 
 
 @check_type
@@ -17,64 +651,485 @@ def zip_output(
     to_file: str,
     compression_level: int,
     verbose: bool = False,
+    workers: int = 1,
+    max_memory: int = 256 * 1024 * 1024,
+    compress_all: bool = False,
+    incremental: bool = False,
+    check_crc: bool = False,
+    deduplicate: bool = False,
 ) -> None:
     """
     Zip OneCode project output data.
 
+    Unless `compress_all` is True, files that would not benefit from compression are stored
+    as-is rather than deflated: already compressed formats are detected from the `mimetype`
+    recorded in the manifest (or the file extension), other files are detected by deflating a
+    small sample of their content.
+
     Args:
         project_path: Path to the root of the OneCode project.
         data_path: Path to the data folder.
         to_file: Path of the output archive file.
         compression_level: Compression level from 0 (no-compression) to 9 (highest).
-        verbose: If True, print out debug information.
+        verbose: If True, print out debug information, including the estimated bytes and time
+            saved by storing incompressible files.
+        workers: Number of threads compressing files concurrently. Set to 0 to use all available
+            cores. When greater than 1, files are split in chunks deflated in parallel, then
+            written in order to the archive: the result is a standard zip file.
+        max_memory: In parallel mode, approximate upper bound (in bytes) of the data being
+            compressed at any time.
+        compress_all: If True, deflate all files with the given compression level, even the
+            incompressible ones.
+        incremental: If True and the archive file already exists, update it rather than
+            rewriting it: members whose file size and modification time are unchanged are kept
+            without being recompressed, members no longer listed in the manifests are dropped,
+            and only new or modified files are compressed and added.
+        check_crc: In incremental mode, also compare the CRC-32 of files that look unchanged.
+            This requires reading them, but is still much faster than recompressing them.
+        deduplicate: If True, outputs with identical content are archived only once: the
+            duplicates are recorded in the `DUPLICATES.json` member of the archive, mapping
+            their path in the archive to the path of the member holding their content.
+
+    """
+    _zip(
+        _outputs(project_path, data_path, verbose),
+        to_file,
+        compression_level,
+        verbose,
+        workers,
+        max_memory,
+        compress_all,
+        incremental,
+        check_crc,
+        deduplicate
+    )
+
+
+def _zip(
+    outputs: List[Tuple[str, str, Dict]],
+    to_file: str,
+    compression_level: int,
+    verbose: bool = False,
+    workers: int = 1,
+    max_memory: int = 256 * 1024 * 1024,
+    compress_all: bool = False,
+    incremental: bool = False,
+    check_crc: bool = False,
+    deduplicate: bool = False,
+) -> None:
+    """
+    Internal function zipping the given outputs (see `zip_output()`).
 
     """
+    if workers == 0:
+        workers = os.cpu_count() or 1
 
     compression = zipfile.ZIP_STORED if compression_level == 0 else zipfile.ZIP_DEFLATED
+
+    duplicates = {}
+    if deduplicate:
+        outputs, duplicates = _deduplicate(outputs, workers, verbose)
+
+    incremental = incremental and zipfile.is_zipfile(to_file)
     with zipfile.ZipFile(
         to_file,
-        "w",
+        "a" if incremental else "w",
         compression=compression,
         compresslevel=compression_level
     ) as zf:
-        for flow in get_flows(project_path):
-            print(f"Processing flow {flow['label']}...")
+        if incremental:
+            outputs = _prune_archive(zf, outputs, check_crc, verbose)
+
+        members = []
+        stored_files = 0
+        stored_bytes = 0
+        saved_bytes = 0.
+        saved_time = 0.
+
+        for output_file, arcpath, output in outputs:
+            if compress_all or os.path.isdir(output_file):
+                compress_type, reason = compression, None
+            else:
+                compress_type, reason = _select_compression(
+                    output_file,
+                    output.get("mimetype"),
+                    compression_level
+                )
+
+            if verbose and reason is not None:
+                size = os.path.getsize(output_file)
+                ratio, time_per_byte = _sample_compression(output_file, compression_level)
+
+                stored_files += 1
+                stored_bytes += size
+                saved_bytes += size * (ratio - 1.)
+                saved_time += size * time_per_byte
+                print(f"Storing {output['key']} without compression: {reason}")
+
+            members.append((output_file, arcpath, compress_type))
+
+        if workers > 1:
+            _write_parallel(zf, members, compression_level, workers, max_memory)
+
+        else:
+            for output_file, arcpath, compress_type in members:
+                zf.write(
+                    output_file,
+                    arcname=arcpath,
+                    compress_type=compress_type
+                )
+
+        if duplicates:
+            zf.writestr(DUPLICATES_INDEX, json.dumps(duplicates, indent=4))
+
+    if stored_files > 0:
+        print(
+            f"Stored {stored_files} incompressible file(s) ({stored_bytes} bytes) as-is: "
+            f"~{saved_time:.2f}s and ~{saved_bytes:+.0f} bytes saved compared to deflating them"
+        )
+
+
+@check_type
+def tar_output(
+    project_path: str,
+    data_path: str,
+    to_file: str,
+    compression_level: int,
+    compression: Optional[str] = None,
+    verbose: bool = False,
+    workers: int = 1,
+    max_memory: int = 256 * 1024 * 1024,
+    deduplicate: bool = False,
+) -> None:
+    """
+    Archive OneCode project output data in a tar file, optionally gzip or zstd compressed.
+
+    Unlike zip files, the archive is written as a single stream: it does not require a seekable
+    output, so that it can be piped directly to another process (e.g. an upload) and compressed
+    as a whole, which usually gives better compression ratios on many small files.
+
+    Args:
+        project_path: Path to the root of the OneCode project.
+        data_path: Path to the data folder.
+        to_file: Path of the output archive file, or `-` to write it to the standard output (in
+            which case information is printed out to the standard error).
+        compression_level: Compression level, from 0 (no-compression) to 9 (highest) for gzip
+            and from 1 to 22 for zstd (0 meaning zstd default level).
+        compression: Either `None` (no compression), `gz` or `zst`. The latter requires the
+            `zstandard` package.
+        verbose: If True, print out debug information.
+        workers: Number of threads compressing the stream concurrently. Set to 0 to use all
+            available cores.
+        max_memory: For gzip parallel compression, approximate upper bound (in bytes) of the data
+            being compressed at any time.
+        deduplicate: If True, outputs with identical content are archived only once: duplicates
+            are archived as hard links to the first output with the same content.
+
+    Raises:
+        ValueError: if the compression is not supported.
+        ImportError: if `zst` compression is requested but `zstandard` is not installed.
+
+    """
+    if compression not in (None, 'gz', 'zst'):
+        raise ValueError(f"Unsupported tar compression: {compression}")
+
+    if compression == 'zst' and zstandard is None:
+        raise ImportError(
+            "zstandard is required for tar.zst archives: pip install onecode[performance]"
+        )
+
+    with contextlib.ExitStack() as stack:
+        if to_file == '-':
+            out = sys.stdout.buffer
+            stack.enter_context(contextlib.redirect_stdout(sys.stderr))
+        else:
+            out = stack.enter_context(open(to_file, 'wb'))
+
+        _tar(
+            _outputs(project_path, data_path, verbose),
+            out,
+            compression_level,
+            compression,
+            verbose,
+            workers,
+            max_memory,
+            deduplicate
+        )
+
+
+def _tar(
+    outputs: List[Tuple[str, str, Dict]],
+    out: BinaryIO,
+    compression_level: int,
+    compression: Optional[str] = None,
+    verbose: bool = False,
+    workers: int = 1,
+    max_memory: int = 256 * 1024 * 1024,
+    deduplicate: bool = False,
+) -> None:
+    """
+    Internal function writing the given outputs as a tar stream (see `tar_output()`).
+
+    """
+    if workers == 0:
+        workers = os.cpu_count() or 1
+
+    duplicates = {}
+    if deduplicate:
+        _, duplicates = _deduplicate(outputs, workers, verbose)
+
+    with contextlib.ExitStack() as stack:
+        if compression == 'gz':
+            if workers > 1:
+                out = stack.enter_context(
+                    _ParallelGzipWriter(out, compression_level, workers, max_memory)
+                )
+            else:
+                out = stack.enter_context(
+                    gzip.GzipFile(fileobj=out, mode='wb', compresslevel=compression_level, mtime=0)
+                )
+
+        elif compression == 'zst':
+            compressor = zstandard.ZstdCompressor(
+                level=compression_level if compression_level > 0 else 3,
+                threads=workers if workers > 1 else 0
+            )
+            out = stack.enter_context(compressor.stream_writer(out, closefd=False))
+
+        with tarfile.open(fileobj=out, mode='w|') as tar:
+            for output_file, arcpath, _ in outputs:
+                if arcpath in duplicates:
+                    info = tar.gettarinfo(output_file, arcname=arcpath)
+                    info.type = tarfile.LNKTYPE
+                    info.linkname = duplicates[arcpath]
+                    info.size = 0
+                    tar.addfile(info)
+                else:
+                    tar.add(output_file, arcname=arcpath)
+
 
-            with open(os.path.join(data_path, "outputs", flow["file"], "MANIFEST.txt")) as f:
-                for line in f:
-                    output = json.loads(line)
+def _write_volume(
+    archive_format: str,
+    outputs: List[Tuple[str, str, Dict]],
+    to_file: str,
+    compression_level: int,
+    options: Dict
+) -> None:
+    """
+    Internal function writing a volume of a split archive (see `split_output()`).
+
+    """
+    if archive_format == 'zip':
+        _zip(outputs, to_file, compression_level, **options)
+
+    else:
+        with open(to_file, 'wb') as out:
+            _tar(outputs, out, compression_level, **options)
+
+
+@check_type
+def split_output(
+    project_path: str,
+    data_path: str,
+    to_file: str,
+    compression_level: int,
+    archive_format: str = 'zip',
+    per_flow: bool = False,
+    max_volume_size: Optional[int] = None,
+    processes: int = 0,
+    verbose: bool = False,
+    workers: int = 1,
+    max_memory: int = 256 * 1024 * 1024,
+    compress_all: bool = False,
+    incremental: bool = False,
+    check_crc: bool = False,
+    deduplicate: bool = False,
+) -> List[str]:
+    """
+    Archive OneCode project output data in several volumes: one per flow and/or as many as
+    needed so that each volume stays below a size cap. Volumes are independent archives, written
+    concurrently by a pool of processes, so that consumers can fetch only the ones they need.
+
+    Volumes are named after `to_file`, e.g. for `data.zip`: `data.flow_1.zip` with one volume
+    per flow, `data.001.zip` with a size cap, `data.flow_1.001.zip` with both. The index file
+    (`data.index.json`) lists the volumes and maps each output to its volume:
+
+    ```json
+    {
+        "volumes": ["data.flow_1.zip", "data.flow_2.zip"],
+        "outputs": [
+            {
+                "flow": "flow_1",
+                "key": "my_output",
+                "path": "outputs/flow_1/my_output.csv",
+                "volume": "data.flow_1.zip"
+            }
+        ]
+    }
+    ```
+
+    Args:
+        project_path: Path to the root of the OneCode project.
+        data_path: Path to the data folder.
+        to_file: Path of the output archive file, from which volume names are derived.
+        compression_level: Compression level (see `zip_output()` and `tar_output()`).
+        archive_format: One of `zip`, `tar`, `tar.gz` or `tar.zst`.
+        per_flow: If True, outputs of each flow are archived in separate volumes.
+        max_volume_size: If set, maximum size (in bytes) of a volume. Outputs are assigned to
+            volumes in order, based on their uncompressed size so that the cap is never exceeded,
+            except by an output larger than the cap on its own.
+        processes: Number of processes writing volumes concurrently. Set to 0 to use all
+            available cores.
+        verbose: If True, print out debug information.
+        workers: Number of threads compressing each volume (see `zip_output()`).
+        max_memory: Approximate upper bound (in bytes) of the data being compressed at any time
+            in each volume.
+        compress_all: For zip volumes, see `zip_output()`.
+        incremental: For zip volumes, see `zip_output()`.
+        check_crc: For zip volumes, see `zip_output()`.
+        deduplicate: If True, outputs with identical content are archived only once per volume.
+
+    Returns:
+        The paths of the volumes.
+
+    Raises:
+        ValueError: if the archive format is not supported, or if neither `per_flow` nor
+            `max_volume_size` is set.
+        ImportError: if `tar.zst` is requested but `zstandard` is not installed.
+
+    """
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unsupported archive format: {archive_format}")
+
+    if not per_flow and max_volume_size is None:
+        raise ValueError("Archive is not split: set per_flow and/or max_volume_size")
+
+    if archive_format == 'tar.zst' and zstandard is None:
+        raise ImportError(
+            "zstandard is required for tar.zst archives: pip install onecode[performance]"
+        )
+
+    extension = f'.{archive_format}'
+    stem = to_file[:-len(extension)] if to_file.endswith(extension) else to_file
+
+    flows = [
+        (flow["file"], [
+            (output_file, arcpath, output)
+            for output, output_file, arcpath in _flow_outputs(flow, data_path, verbose)
+            if os.path.exists(output_file)
+        ])
+        for flow in get_flows(project_path)
+    ]
+
+    if per_flow:
+        groups = [([flow], [(flow, o) for o in outputs]) for flow, outputs in flows]
+    else:
+        groups = [([], [(flow, o) for flow, outputs in flows for o in outputs])]
+
+    volumes = []
+    for prefix, outputs in groups:
+        parts = [[]]
+        size = 0
+        for flow, output in outputs:
+            output_size = _MEMBER_OVERHEAD
+            if os.path.isfile(output[0]):
+                output_size += os.path.getsize(output[0])
+
+            if max_volume_size is not None and parts[-1] and size + output_size > max_volume_size:
+                parts.append([])
+                size = 0
+
+            parts[-1].append((flow, output))
+            size += output_size
+
+        for i, part in enumerate(parts, start=1):
+            suffix = [f'{i:03d}'] if max_volume_size is not None else []
+            volumes.append(('.'.join([stem] + prefix + suffix) + extension, part))
+
+    options = {
+        "verbose": verbose,
+        "workers": workers,
+        "max_memory": max_memory,
+        "deduplicate": deduplicate,
+    }
+    if archive_format == 'zip':
+        options.update(compress_all=compress_all, incremental=incremental, check_crc=check_crc)
+    else:
+        options["compression"] = archive_format.split('.')[1] if '.' in archive_format else None
 
-                    output_file = output["value"]
-                    arcpath = os.path.join(
-                        "outputs",
-                        os.path.relpath(output_file, os.path.join(data_path, "outputs"))
-                    )
+    if processes == 0:
+        processes = os.cpu_count() or 1
 
-                    if verbose:
-                        print(f"Archiving {output['key']}: {output_file} => {arcpath}")
+    jobs = [
+        (archive_format, [output for _, output in part], path, compression_level, options)
+        for path, part in volumes
+    ]
 
-                    if os.path.exists(output_file):
-                        zf.write(
-                            output_file,
-                            arcname=arcpath
-                        )
+    if min(processes, len(jobs)) > 1:
+        with ProcessPoolExecutor(max_workers=min(processes, len(jobs))) as executor:
+            for future in [executor.submit(_write_volume, *job) for job in jobs]:
+                future.result()
+
+    else:
+        for job in jobs:
+            _write_volume(*job)
+
+    dump_json(
+        {
+            "volumes": [os.path.basename(path) for path, _ in volumes],
+            "outputs": [
+                {
+                    "flow": flow,
+                    "key": output[2]["key"],
+                    "path": output[1],
+                    "volume": os.path.basename(path),
+                }
+                for path, part in volumes
+                for flow, output in part
+            ],
+        },
+        f'{stem}.index.json'
+    )
+
+    return [path for path, _ in volumes]
 
 
 def main() -> None:    # pragma: no cover
     """
     ```bash
     usage: onecode-zip [-h] [--output-file FILE] [--path PATH]
-        [--data PATH] [--compression INT] [--verbose]
+        [--data PATH] [--compression INT] [--workers INT] [--max-memory MB] [--compress-all]
+        [--incremental] [--check-crc] [--format {zip,tar,tar.gz,tar.zst}] [--deduplicate]
+        [--split-flows] [--max-volume-size MB] [--processes INT] [--verbose]
 
     Archive the outputs in a zip file
 
     optional arguments:
       -h, --help            Show this help message and exit
-      --output-file FILE    Path to the output zip file, defaults to data.zip
+      --output-file FILE    Path to the output archive file, defaults to data.<format>.
+                                Use - to write tar archives to the standard output
       --path PATH           Path to the project root directory if not the current working directory
       --data PATH           Path to the data root directory if not the default data directory
       --compression INT     Compression level from 0 (no compresssion) to 9 (highest compression),
                                 defaults to 6
+      --workers INT         Number of threads compressing files concurrently, 0 to use all cores,
+                                defaults to 1
+      --max-memory MB       Upper bound of data being compressed at once when using several
+                                workers, defaults to 256
+      --compress-all        Deflate all files, including already compressed or incompressible ones
+      --incremental         Update the existing archive with new/modified files only
+      --check-crc           In incremental mode, compare CRC-32 of files with unchanged size and
+                                time
+      --format FORMAT       Archive format: zip (default), tar, tar.gz or tar.zst. Compression of
+                                tar archives is streamed, incompressible files detection and
+                                incremental mode only apply to zip
+      --deduplicate         Archive outputs with identical content only once: duplicates are
+                                listed in DUPLICATES.json (zip) or archived as hard links (tar)
+      --split-flows         Write one archive volume per flow
+      --max-volume-size MB  Roll over to a new archive volume before exceeding this size. When
+                                splitting, an index file maps each output to its volume
+      --processes INT       Number of processes writing volumes concurrently, 0 to use all cores,
+                                defaults to 0
       --verbose             Print verbose information when processing files
     ```
 
@@ -83,8 +1138,8 @@ def main() -> None:    # pragma: no cover
     parser = argparse.ArgumentParser(description='Start the OneCode Project in Interactive Mode.')
     parser.add_argument(
         '--output-file',
-        default='data.zip',
-        help='Path to the output zip file'
+        required=False,
+        help='Path to the output archive file, - to write tar archives to the standard output'
     )
     parser.add_argument(
         '--path',
@@ -103,6 +1158,61 @@ def main() -> None:    # pragma: no cover
         choices=range(10),
         help='Archiver compression level'
     )
+    parser.add_argument(
+        '--workers',
+        default=1,
+        type=int,
+        help='Number of threads compressing files concurrently, 0 to use all cores'
+    )
+    parser.add_argument(
+        '--max-memory',
+        default=256,
+        type=int,
+        help='Upper bound (in MB) of data being compressed at once when using several workers'
+    )
+    parser.add_argument(
+        '--compress-all',
+        action='store_true',
+        help='Deflate all files, including already compressed or incompressible ones'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Update the existing archive with new/modified files only'
+    )
+    parser.add_argument(
+        '--check-crc',
+        action='store_true',
+        help='In incremental mode, compare CRC-32 of files with unchanged size and time'
+    )
+    parser.add_argument(
+        '--format',
+        default='zip',
+        choices=ARCHIVE_FORMATS,
+        help='Archive format'
+    )
+    parser.add_argument(
+        '--deduplicate',
+        action='store_true',
+        help='Archive outputs with identical content only once'
+    )
+    parser.add_argument(
+        '--split-flows',
+        action='store_true',
+        help='Write one archive volume per flow'
+    )
+    parser.add_argument(
+        '--max-volume-size',
+        type=int,
+        required=False,
+        help='Roll over to a new archive volume before exceeding this size (in MB)'
+    )
+    parser.add_argument(
+        '--processes',
+        default=0,
+        type=int,
+        help='Number of processes writing volumes concurrently, 0 to use all cores'
+    )
     parser.add_argument(
         '--verbose',
         action='store_true',
@@ -114,8 +1224,59 @@ def main() -> None:    # pragma: no cover
     data_path = args.data if args.data is not None else os.path.join(project_path, 'data')
     data_path = os.path.abspath(data_path)
 
-    to_file = args.output_file if args.output_file.endswith('.zip') \
-        else f'{args.output_file}.zip'
+    extension = f'.{args.format}'
+    to_file = args.output_file if args.output_file is not None else f'data{extension}'
+    split = args.split_flows or args.max_volume_size is not None
+    if to_file == '-' and (split or args.format == 'zip'):
+        parser.error('only single tar archives can be written to the standard output')
+    elif to_file != '-' and not to_file.endswith(extension):
+        to_file = f'{to_file}{extension}'
+
+    if split:
+        print('\n')
+        split_output(
+            project_path,
+            data_path,
+            to_file,
+            args.compression,
+            args.format,
+            args.split_flows,
+            args.max_volume_size * 1024 * 1024 if args.max_volume_size is not None else None,
+            args.processes,
+            args.verbose,
+            args.workers,
+            args.max_memory * 1024 * 1024,
+            args.compress_all,
+            args.incremental,
+            args.check_crc,
+            args.deduplicate
+        )
+
+    elif args.format == 'zip':
+        print('\n')
+        zip_output(
+            project_path,
+            data_path,
+            to_file,
+            args.compression,
+            args.verbose,
+            args.workers,
+            args.max_memory * 1024 * 1024,
+            args.compress_all,
+            args.incremental,
+            args.check_crc,
+            args.deduplicate
+        )
 
-    print('\n')
-    zip_output(project_path, data_path, to_file, args.compression, args.verbose)
+    else:
+        tar_output(
+            project_path,
+            data_path,
+            to_file,
+            args.compression,
+            args.format.split('.')[1] if '.' in args.format else None,
+            args.verbose,
+            args.workers,
+            args.max_memory * 1024 * 1024,
+            args.deduplicate
+        )
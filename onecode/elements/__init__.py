@@ -1,6 +1,7 @@
 # SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
 # SPDX-License-Identifier: MIT
 
+from .element_meta import *
 from .input import *
 from .input_element import *
 from .output import *
@@ -0,0 +1,65 @@
+# SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
+# SPDX-License-Identifier: MIT
+
+import inspect
+from abc import ABCMeta
+from types import FunctionType
+from typing import Any
+
+
+class ElementMeta(ABCMeta):
+    """
+    Metaclass of [`InputElement`][onecode.InputElement] and
+    [`OutputElement`][onecode.OutputElement], computing once per class the members looked up on
+    each element construction and call, rather than listing them with `dir()` every time:
+
+    - `_reserved_names`: the attribute and method names that extra element arguments cannot
+        overwrite.
+    - `_mode_handlers`: the dispatch table of the methods handling each Project mode (see
+        [`Mode`][onecode.Mode]), including the custom modes implemented by subclasses.
+
+    Both are computed again, for the class and its subclasses, whenever a class member is set or
+    deleted (e.g. when an element class is patched).
+
+    """
+
+    def __init__(
+        cls,
+        name: str,
+        bases: tuple,
+        namespace: dict,
+        **kwargs: Any
+    ):
+        super().__init__(name, bases, namespace, **kwargs)
+        cls._update_members()
+
+    def __setattr__(
+        cls,
+        name: str,
+        value: Any
+    ) -> None:
+        super().__setattr__(name, value)
+        cls._members_changed()
+
+    def __delattr__(
+        cls,
+        name: str
+    ) -> None:
+        super().__delattr__(name)
+        cls._members_changed()
+
+    def _update_members(cls) -> None:
+        names = dir(cls)
+
+        # set through type to not trigger the invalidation
+        type.__setattr__(cls, '_reserved_names', frozenset(names))
+        type.__setattr__(cls, '_mode_handlers', {
+            name: member for name, member in (
+                (name, inspect.getattr_static(cls, name)) for name in names
+            ) if isinstance(member, FunctionType)
+        })
+
+    def _members_changed(cls) -> None:
+        cls._update_members()
+        for subclass in cls.__subclasses__():
+            subclass._members_changed()
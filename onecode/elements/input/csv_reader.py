@@ -5,6 +5,7 @@ import os
 from typing import Any, Dict, List, Optional, Union
 
 import pandas as pd
+import pydash
 
 from ...base.decorator import check_type
 from ...base.project import Project
@@ -134,6 +135,20 @@ class CsvReader(InputElement):
 
         return None
 
+    def _input_files(
+        self,
+        value: Any
+    ) -> List[str]:
+        """
+        Returns:
+            The path(s) of the CSV file(s) the DataFrame(s) are loaded from.
+
+        """
+        return [
+            Project().get_input_path(f) for f in pydash.flatten_deep([self._value])
+            if f is not None
+        ]
+
     @check_type
     def _validate(
         self,
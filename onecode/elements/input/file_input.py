@@ -4,9 +4,11 @@
 import os
 from typing import Any, List, Optional, Tuple, Union
 
+import pydash
+
 from ...base.decorator import check_type
 from ...base.project import Project
-from ...utils.typing import is_type
+from ...utils.typing import type_validator
 from ..input_element import InputElement
 
 
@@ -106,13 +108,12 @@ class FileInput(InputElement):
 
         """
         if self._value is not None:
-            if is_type(self._value, self._value_type):
+            validate_type = type_validator(self._value_type)
+            if validate_type(self._value):
                 return [Project().get_input_path(f) for f in self._value] if self.multiple \
                     else Project().get_input_path(self._value)
 
-            elif type(self._value) is list and all(
-                is_type(v, self._value_type) for v in self._value
-            ):
+            elif type(self._value) is list and all(validate_type(v) for v in self._value):
                 return [
                     [Project().get_input_path(f) for f in val] if self.multiple
                     else Project().get_input_path(val) for val in self._value
@@ -120,6 +121,17 @@ class FileInput(InputElement):
 
         return None
 
+    def _input_files(
+        self,
+        value: Optional[Union[List[str], str]]
+    ) -> List[str]:
+        """
+        Returns:
+            The selected file path(s).
+
+        """
+        return [f for f in pydash.flatten_deep([value]) if f is not None]
+
     @check_type
     def _validate_file_value(
         self,
@@ -1,19 +1,27 @@
 # SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
 # SPDX-License-Identifier: MIT
 
+import functools
 import re
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, Union
 
 import pydash
 from slugify import slugify
 
 from ..base.decorator import check_type
 from ..base.project import Project
-from ..utils.typing import is_type
+from ..utils.typing import type_validator
+from .element_meta import ElementMeta
 
 
-class InputElement(ABC):
+@functools.lru_cache(maxsize=4096)
+def _slugify_key(key: str) -> str:
+    # elements called in loops are usually called with the same few keys
+    return slugify(key, separator='_')
+
+
+class InputElement(ABC, metaclass=ElementMeta):
     """
     An element is an object that will be interpreted based on the Project's mode (script
     execution, extraction, etc.). OneCode projects should not
@@ -62,6 +70,14 @@ class InputElement(ABC):
 
     """
 
+    __slots__ = (
+        '_label', '_key', '_value', '_count', '_disabled', '_hide_when_disabled', '_extra_args'
+    )
+
+    # Computed per class by the metaclass.
+    _reserved_names: FrozenSet[str]
+    _mode_handlers: Dict[str, Callable]
+
     @check_type
     def __init__(
         self,
@@ -102,19 +118,18 @@ class InputElement(ABC):
             raise ValueError(f'Key starting with "_" are reserved: {key}')
 
         self._label = label if label is not None else key
-        self._key = slugify(key, separator='_')
+        self._key = _slugify_key(key)
         self._value = value
         self._count = count
         self._disabled = optional
         self._hide_when_disabled = hide_when_disabled
 
-        reserved_args = dir(self)
-        invalid_args = pydash.intersection([*kwargs], [*reserved_args])
+        invalid_args = [arg for arg in kwargs if arg in self._reserved_names]
         if len(invalid_args) > 0:
             raise AttributeError(f'The following parameters are reserved: {invalid_args}')
 
-        self._extra_args = pydash.omit(kwargs, reserved_args)
-        self.__dict__.update(self._extra_args)
+        self._extra_args = kwargs
+        self.__dict__.update(kwargs)
 
     @staticmethod
     def metadata(value: Any) -> Dict:
@@ -286,16 +301,17 @@ class InputElement(ABC):
                 raise ValueError(f"[{self.key}] Value is required: None provided")
 
         elif self.count is None:
-            if is_type(value, self._value_type):
+            if type_validator(self._value_type)(value):
                 self._validate(value)
             else:
                 raise TypeError(f"Invalid value type for {value}, expected: {self._value_type}")
 
         else:
+            validate_type = type_validator(self._value_type)
             if type(value) is not list:
                 raise TypeError(f"Invalid value {value}, expected: list({self._value_type})")
 
-            elif all(is_type(v, self._value_type) for v in value):
+            elif all(validate_type(v) for v in value):
                 for v in value:
                     self._validate(v)
 
@@ -324,6 +340,8 @@ class InputElement(ABC):
 
         """
         data = Project().data
+        prior = data[self.key] if data is not None and self.key in data else None
+        in_data = data is not None and self.key in data
 
         if data is None or self.key not in data:
             val = self.value    # actual value after resolution
@@ -333,6 +351,7 @@ class InputElement(ABC):
             val = data[self.key]
 
         self._prepare_and_validate(val)
+        self._record_input(in_data, prior, val)
         return val
 
     def _load_then_execute(self) -> Any:
@@ -345,6 +364,8 @@ class InputElement(ABC):
 
         """
         data = Project().data
+        prior = data.get(self.key)
+        in_data = self.key in data
 
         if self.key not in data:
             val = self.value    # actual value after resolution
@@ -356,8 +377,48 @@ class InputElement(ABC):
             Project().add_data(self.key, val)
 
         self._prepare_and_validate(val)
+        self._record_input(in_data, prior, val)
         return val
 
+    def _record_input(
+        self,
+        in_data: bool,
+        prior: Any,
+        value: Any
+    ) -> None:
+        """
+        Internal function recording the execution of this element when enabled (see
+        [`Project.recorded_inputs`][onecode.Project.recorded_inputs]).
+
+        Args:
+            in_data: Whether the element key was in the Project data prior to the resolution.
+            prior: The value in the Project data prior to the resolution, if any.
+            value: The resolved value.
+
+        """
+        recorded_inputs = Project().recorded_inputs
+        if recorded_inputs is not None and self.key not in recorded_inputs:
+            recorded_inputs[self.key] = (in_data, prior, self._input_files(value))
+
+    def _input_files(
+        self,
+        value: Any
+    ) -> List[str]:
+        """
+        Get the paths of the files read to resolve the value of this element, so that changes to
+        their content can be detected, e.g. by the flow cache (see
+        [`FlowCache`][onecode.FlowCache]). By default, elements do not read any file:
+        re-implement this function otherwise.
+
+        Args:
+            value: The resolved value.
+
+        Returns:
+            The list of file paths.
+
+        """
+        return []
+
     def _extract(self) -> Tuple[str, Any]:
         """
         Function called when Project mode is `Mode.EXTRACT`. The value will be collected and added
@@ -454,7 +515,13 @@ class InputElement(ABC):
         """
 
         mode = Project().mode
-        if mode in dir(self):
+        handler = self._mode_handlers.get(mode)
+        if handler is not None:
+            return handler(self)
+
+        # e.g. modes handled by static methods
+        elif mode in dir(self):
             return getattr(self, mode)()
+
         else:
             raise ValueError(f"Unknown Project mode {mode}")
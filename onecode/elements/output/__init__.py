@@ -3,4 +3,8 @@
 
 from ...utils import import_output
 
+# imported before the elements registration: importing the `file_output` submodule binds it to
+# this package, which would otherwise shadow the `file_output()` element function
+from .file_output import file_outputs
+
 import_output(__file__, __name__)
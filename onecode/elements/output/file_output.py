@@ -1,15 +1,56 @@
 # SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
 # SPDX-License-Identifier: MIT
 
+import io
 import mimetypes
 import os
-from typing import Any, List, Optional
+from functools import lru_cache
+from typing import IO, Any, Callable, Dict, FrozenSet, List, Optional
 
+from slugify import slugify
+
+from ...base.checksum import content_hasher
 from ...base.decorator import check_type
+from ...base.enums import Mode
 from ...base.project import Project
 from ..output_element import OutputElement
 
 
+class _HashingWriter(io.RawIOBase):
+    """
+    Internal raw stream writing to a file while counting and hashing the written bytes. The
+    given callback is called with the writer once the file is closed.
+
+    """
+
+    def __init__(
+        self,
+        file: io.FileIO,
+        on_close: Callable[['_HashingWriter'], None]
+    ):
+        super().__init__()
+        self._file = file
+        self._on_close = on_close
+        self.hasher = content_hasher()
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        written = self._file.write(data)
+        self.hasher.update(memoryview(data)[:written])
+        self.size += written
+
+        return written
+
+    def close(self) -> None:
+        if not self.closed:
+            self._file.close()
+            super().close()
+            self._on_close(self)
+
+
 class FileOutput(OutputElement):
     @check_type
     def __init__(
@@ -105,3 +146,207 @@ class FileOutput(OutputElement):
 
         """
         pass
+
+    @check_type
+    def open(
+        self,
+        mode: str = 'w',
+        buffering: int = -1,
+        encoding: Optional[str] = None,
+        errors: Optional[str] = None,
+        newline: Optional[str] = None
+    ) -> IO:
+        """
+        Open the output file for writing, as the built-in `open()` would. Written bytes are
+        counted and hashed on the fly so that, in execution modes, the manifest entry is written
+        once the file is closed with the file `size`, `mtime` and `hash` (see
+        [`file_stats()`][onecode.file_stats]), without reading the file again.
+
+        Args:
+            mode: Either `w` or `x`, optionally with `b` or `t`. Reading and appending are not
+                supported as the written bytes would not reflect the whole file content.
+            buffering: Buffer size, see the built-in `open()`.
+            encoding: Text mode encoding, see the built-in `open()`.
+            errors: Text mode encoding errors handling, see the built-in `open()`.
+            newline: Text mode newline handling, see the built-in `open()`.
+
+        Returns:
+            A file object, typically used as a context manager.
+
+        Raises:
+            ValueError: if the mode is not supported.
+
+        !!! example
+            ```py
+            from onecode import FileOutput, Mode, Project
+
+            Project().mode = Mode.EXECUTE
+            Project().current_flow = 'test'
+
+            with FileOutput('my_output', 'file.txt').open() as f:
+                f.write('Hello OneCode!')
+            ```
+
+            ```py title="MANIFEST.txt"
+            {"key": "my_output", "label": "my_output", "value": "/path/to/outputs/file.txt",
+                "kind": "FileOutput", "tags": null, "mimetype": "text/plain", "size": 14,
+                "mtime": 1700000000.0, "hash": "a1b2..."}
+            ```
+
+        """
+        if len(mode) != len(set(mode)) or set(mode) - set('wxbt') or \
+                len(set(mode) & set('wx')) != 1 or set('bt') <= set(mode):
+            raise ValueError(f'[{self.key}] Invalid mode for writing output file: {mode}')
+
+        elif buffering == 0 and 'b' not in mode:
+            raise ValueError(f'[{self.key}] Unbuffered output file must be binary')
+
+        path = self.value
+        self._validate(path)
+
+        def _on_close(writer: _HashingWriter) -> None:
+            if Project().mode in (Mode.EXECUTE, Mode.LOAD_THEN_EXECUTE):
+                output = self._manifest_entry(path)
+                output.update(
+                    size=writer.size,
+                    mtime=os.path.getmtime(path),
+                    hash=writer.hasher.hexdigest()
+                )
+                Project().write_output(output)
+
+        raw = _HashingWriter(io.FileIO(path, mode.replace('b', '').replace('t', '')), _on_close)
+        if buffering == 0:
+            return raw
+
+        stream = io.BufferedWriter(
+            raw,
+            buffering if buffering > 1 else io.DEFAULT_BUFFER_SIZE
+        )
+        if 'b' in mode:
+            return stream
+
+        return io.TextIOWrapper(
+            stream,
+            encoding=encoding,
+            errors=errors,
+            newline=newline,
+            line_buffering=buffering == 1
+        )
+
+
+@lru_cache(maxsize=None)
+def _reserved_args() -> FrozenSet[str]:
+    return frozenset(dir(FileOutput('reserved', '')))
+
+
+@lru_cache(maxsize=4096)
+def _slugify_key(key: str) -> str:
+    return slugify(key, separator='_')
+
+
+@lru_cache(maxsize=1024)
+def _guess_mimetype(suffix: str) -> Optional[str]:
+    return mimetypes.guess_type(f'file{suffix}')[0]
+
+
+@check_type
+def file_outputs(
+    entries: List[Dict[str, Any]],
+    make_path: bool = False
+) -> List[Any]:
+    """
+    Register many output files at once, typically for flows producing thousands of files
+    (e.g. tiles). In execution modes, the result is the same as calling `file_output()` for each
+    entry but without the per-element overhead: entries are all validated before anything is
+    written, keys are slugified and mimetypes guessed once per distinct key and extension, each
+    directory is created once, and all manifest entries are written with a single locked append
+    (see [`Project.write_outputs()`][onecode.Project.write_outputs]). In other modes, it simply
+    falls back to calling `file_output()` for each entry.
+
+    Args:
+        entries: One dictionnary per output file, holding the same arguments as `file_output()`:
+            `key`, `value` and optionally `label`, `tags`, `make_path` and extra user meta-data.
+        make_path: True to create the directory structure of the file paths, unless specified
+            otherwise by an entry.
+
+    Returns:
+        In execution modes, the path to each output file, in the same order as the entries.
+        Otherwise, the result of `file_output()` for each entry.
+
+    Raises:
+        ValueError: if a `key` is empty or starts with `_`.
+        AttributeError: if extra meta-data of an entry conflicts with an existing attribute or
+            method.
+
+    !!! example
+        ```py
+        from onecode import file_outputs, Mode, Project
+
+        Project().mode = Mode.EXECUTE
+        Project().current_flow = 'test'
+
+        tiles = file_outputs(
+            [
+                {"key": f"tile_{i}", "value": f"tiles/tile_{i}.png", "tags": ["Tile"]}
+                for i in range(10000)
+            ],
+            make_path=True
+        )
+
+        for tile in tiles:
+            # write each tile
+            ...
+        ```
+
+    """
+    if Project().mode not in (Mode.EXECUTE, Mode.LOAD_THEN_EXECUTE):
+        return [FileOutput(**{"make_path": make_path, **entry})() for entry in entries]
+
+    project = Project()
+    reserved_args = _reserved_args()
+    directories = set()
+    paths = []
+    outputs = []
+
+    for entry in entries:
+        extra_args = dict(entry)
+        key = extra_args.pop("key")
+        value = extra_args.pop("value")
+        label = extra_args.pop("label", None)
+        tags = extra_args.pop("tags", None)
+        entry_make_path = extra_args.pop("make_path", make_path)
+
+        if not key.strip():
+            raise ValueError('Key cannot be null')
+
+        elif key.startswith('_'):
+            raise ValueError(f'Key starting with "_" are reserved: {key}')
+
+        invalid_args = [arg for arg in extra_args if arg in reserved_args]
+        if len(invalid_args) > 0:
+            raise AttributeError(f'The following parameters are reserved: {invalid_args}')
+
+        path = project.get_output_path(value)
+        if entry_make_path:
+            directories.add(os.path.dirname(path))
+
+        filename = os.path.basename(value)
+        dot = filename.find('.')
+
+        paths.append(path)
+        outputs.append({
+            "key": _slugify_key(key),
+            "label": label if label is not None else key,
+            "value": path,
+            "kind": FileOutput.__name__,
+            "tags": tags,
+            "mimetype": _guess_mimetype(filename[dot:] if dot >= 0 else ''),
+            **extra_args
+        })
+
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+
+    project.write_outputs(outputs)
+
+    return paths
@@ -2,16 +2,17 @@
 # SPDX-License-Identifier: MIT
 
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Callable, Dict, FrozenSet, Optional
 
 import pydash
-from slugify import slugify
 
 from ..base.decorator import check_type
 from ..base.project import Project
+from .element_meta import ElementMeta
+from .input_element import _slugify_key
 
 
-class OutputElement(ABC):
+class OutputElement(ABC, metaclass=ElementMeta):
     """
     An element is an object that will be interpreted based on the Project's mode (script
     execution, extraction, etc.). OneCode projects should not
@@ -52,6 +53,12 @@ class OutputElement(ABC):
 
         """
 
+    __slots__ = ('_label', '_key', '_value', '_extra_args')
+
+    # Computed per class by the metaclass.
+    _reserved_names: FrozenSet[str]
+    _mode_handlers: Dict[str, Callable]
+
     @check_type
     def __init__(
         self,
@@ -87,16 +94,15 @@ class OutputElement(ABC):
             raise ValueError(f'Key starting with "_" are reserved: {key}')
 
         self._label = label if label is not None else key
-        self._key = slugify(key, separator='_')
+        self._key = _slugify_key(key)
         self._value = value
 
-        reserved_args = dir(self)
-        invalid_args = pydash.intersection([*kwargs], [*reserved_args])
+        invalid_args = [arg for arg in kwargs if arg in self._reserved_names]
         if len(invalid_args) > 0:
             raise AttributeError(f'The following parameters are reserved: {invalid_args}')
 
-        self._extra_args = pydash.omit(kwargs, reserved_args)
-        self.__dict__.update(self._extra_args)
+        self._extra_args = kwargs
+        self.__dict__.update(kwargs)
 
     @property
     def kind(self) -> str:
@@ -199,17 +205,33 @@ class OutputElement(ABC):
         """
         val = self.value
         self._validate(val)
+        Project().write_output(self._manifest_entry(val))
+
+        return self.value
+
+    def _manifest_entry(
+        self,
+        value: Any
+    ) -> Dict[str, Any]:
+        """
+        Build the attributes of this element as written to the manifest file.
 
+        Args:
+            value: Resolved value of the element.
+
+        Returns:
+            The element key, label, value, kind and extra attributes.
+
+        """
         params = {
             "key": self.key,
             "label": self._label,
-            "value": val,
+            "value": value,
             "kind": self.kind
         }
         pydash.merge(params, self._extra_args)
-        Project().write_output(params)
 
-        return self.value
+        return params
 
     def _load_then_execute(self) -> Any:
         """
@@ -244,8 +266,14 @@ class OutputElement(ABC):
 
         """
         mode = Project().mode
-        if mode in dir(cls):
+        handler = None if isinstance(cls, type) else cls._mode_handlers.get(mode)
+        if handler is not None:
+            return handler(cls)
+
+        # e.g. element classes, or modes handled by static methods
+        elif mode in dir(cls):
             return getattr(cls, mode)()
+
         else:
             raise ValueError(f"Unknown Project mode {mode}")
 
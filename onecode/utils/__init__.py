@@ -1,7 +1,12 @@
 # SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
 # SPDX-License-Identifier: MIT
 
+from .element_registry import *
+from .element_plugins import *
 from .import_input import *
 from .import_output import *
 from .module import *
 from .typing import *
+from .flow_cache import *
+from .step_cache import *
+from .flow_graph import *
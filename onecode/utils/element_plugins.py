@@ -0,0 +1,152 @@
+# SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
+# SPDX-License-Identifier: MIT
+
+import importlib
+import importlib.util
+import sys
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Dict, Iterator, List
+
+from ..base.decorator import check_type
+from ..base.project import Project
+from .element_registry import find_element_packages, load_element_registry
+
+# Entry point group under which third-party packages declare their elements packages.
+ELEMENT_PLUGINS_GROUP = 'onecode.elements'
+
+# Plugin packages registered without being imported, per Python name.
+_LAZY_PLUGINS: Dict[str, ModuleType] = {}
+
+
+def _entry_points() -> List:
+    import importlib.metadata
+
+    entry_points = importlib.metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        return list(entry_points.select(group=ELEMENT_PLUGINS_GROUP))
+
+    return list(entry_points.get(ELEMENT_PLUGINS_GROUP, []))     # pragma: no cover
+
+
+@check_type
+def element_plugins() -> Dict[str, str]:
+    """
+    List the elements packages declared by the installed distributions under the
+    `onecode.elements` entry point group, without importing them, e.g. in `pyproject.toml`:
+    ```toml
+    [project.entry-points."onecode.elements"]
+    my_elements = "my_elements"
+    ```
+
+    Returns:
+        The Python name of the declared packages, per entry point name.
+
+    """
+    return {ep.name: ep.value.split(':')[0].strip() for ep in _entry_points()}
+
+
+@check_type
+def register_element_plugin(module_name: str) -> ModuleType:
+    """
+    Register the elements of a plugin package without importing it: element names are read from
+    the registry files of its elements packages (see
+    [`write_element_registry()`][onecode.write_element_registry]) and the package is imported
+    on first access to one of its attributes, typically when one of its elements is used or
+    extracted. Packages whose registry files are missing or stale are imported right away, so that
+    their elements are registered by [`import_input()`][onecode.import_input] and
+    [`import_output()`][onecode.import_output].
+
+    Elements are registered under the top-level package name, e.g. `my_elements.MyInput`: the
+    plugin package must export its element functions, as `onecode_ext` does.
+
+    Args:
+        module_name: Python name of the plugin package.
+
+    Returns:
+        The plugin package, possibly not loaded yet.
+
+    Raises:
+        ModuleNotFoundError: if the plugin package cannot be found.
+
+    """
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    spec = importlib.util.find_spec(module_name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {module_name!r}", name=module_name)
+
+    entries = []
+    for location in spec.submodule_search_locations or []:
+        for init_file, _ in find_element_packages(location):
+            registry = load_element_registry(init_file)
+            if registry is None:
+                return importlib.import_module(module_name)
+
+            entries += registry
+
+    if spec.loader is None or not hasattr(spec.loader, 'exec_module'):     # pragma: no cover
+        return importlib.import_module(module_name)
+
+    this_module = module_name.split('.')[0]
+    for entry in entries:
+        Project().register_element(f'{this_module}.{entry["kind"]}')
+
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    _LAZY_PLUGINS[module_name] = module
+
+    if '.' in module_name:
+        parent, name = module_name.rsplit('.', 1)
+        setattr(sys.modules[parent], name, module)
+
+    return module
+
+
+@check_type
+def register_element_plugins() -> Dict[str, ModuleType]:
+    """
+    Register the elements of all the plugin packages declared under the `onecode.elements` entry
+    point group (see [`element_plugins()`][onecode.element_plugins] and
+    [`register_element_plugin()`][onecode.register_element_plugin]). Plugins that cannot be
+    found are skipped with a warning.
+
+    Returns:
+        The plugin packages, possibly not loaded yet, per Python name.
+
+    """
+    modules = {}
+    for name, module_name in element_plugins().items():
+        try:
+            modules[module_name] = register_element_plugin(module_name)
+        except ImportError as e:
+            print(f'[Warning] Ignoring elements plugin {name}: {e}')
+
+    return modules
+
+
+@contextmanager
+def detached_element_plugins() -> Iterator[None]:
+    """
+    Context manager removing the plugin packages not imported yet from `sys.modules`, and
+    restoring them on exit: tools importing modules with their own import hooks, such as the
+    call graph analysis of [`process_call_graph()`][onecode.cli.utils.process_call_graph], would
+    otherwise load these packages without registering their elements.
+
+    """
+    # loading a lazy module turns it into a regular module
+    detached = {
+        name: module for name, module in _LAZY_PLUGINS.items()
+        if sys.modules.get(name) is module and type(module) is not ModuleType
+    }
+    for name in detached:
+        del sys.modules[name]
+
+    try:
+        yield
+
+    finally:
+        sys.modules.update(detached)
@@ -0,0 +1,270 @@
+# SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
+# SPDX-License-Identifier: MIT
+
+import functools
+import importlib
+import json
+import os
+import sys
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..base.decorator import check_type
+from ..base.enums import ElementType
+from ..base.project import Project
+
+# Name of the registry file generated in each elements package directory.
+ELEMENT_REGISTRY_FILE = '_elements.json'
+
+# Registry files are written with this schema version: files with another version are ignored.
+ELEMENT_REGISTRY_VERSION = 1
+
+# Registry entries of the registered elements, per elements package and class name.
+_LAZY_CLASSES: Dict[str, Dict[str, Dict[str, str]]] = {}
+
+
+def _element_modules(package_dir: str) -> List[str]:
+    return sorted(
+        f[:-3] for f in os.listdir(package_dir)
+        if f.endswith('.py') and f != '__init__.py' and os.path.isfile(os.path.join(package_dir, f))
+    )
+
+
+@check_type
+def discover_elements(
+    init_file: str,
+    element_type: ElementType
+) -> List[Dict[str, str]]:
+    """
+    Discover the elements of a package from its files, without importing them: each module
+    located in the same folder as the `init_file` path defines an element class named after the
+    Pascal-case of its filename (e.g. `file_input.py` => `class FileInput`).
+
+    Args:
+        init_file: Path to the `__init__.py` file of the elements package.
+        element_type: Type of the elements of the package.
+
+    Returns:
+        The registry entries, one per element: `function` (snake-case name of the element
+        function), `kind` (element class name), `module` (module name within the package) and
+        `type` (`INPUT` or `OUTPUT`).
+
+    """
+    import pydash
+
+    return [
+        {
+            "function": module,
+            "kind": pydash.pascal_case(module),
+            "module": module,
+            "type": str(element_type),
+        } for module in _element_modules(os.path.dirname(os.path.abspath(init_file)))
+    ]
+
+
+@check_type
+def load_element_registry(init_file: str) -> Optional[List[Dict[str, str]]]:
+    """
+    Load the registry file of an elements package (see
+    [`write_element_registry()`][onecode.write_element_registry]).
+
+    Args:
+        init_file: Path to the `__init__.py` file of the elements package.
+
+    Returns:
+        The registry entries, or None if the registry file is missing, invalid or stale, i-e
+            element modules were added or removed since it was generated.
+
+    """
+    package_dir = os.path.dirname(os.path.abspath(init_file))
+
+    try:
+        with open(os.path.join(package_dir, ELEMENT_REGISTRY_FILE)) as f:
+            registry = json.load(f)
+
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(registry, dict) or registry.get("version") != ELEMENT_REGISTRY_VERSION:
+        return None
+
+    entries = registry.get("elements", [])
+    if sorted(e["module"] for e in entries) != _element_modules(package_dir):
+        return None
+
+    return entries
+
+
+@check_type
+def write_element_registry(
+    init_file: str,
+    element_type: ElementType
+) -> str:
+    """
+    Generate the registry file of an elements package, typically at build time, so that
+    [`import_input()`][onecode.import_input] and [`import_output()`][onecode.import_output]
+    register its elements without discovering them.
+
+    Args:
+        init_file: Path to the `__init__.py` file of the elements package.
+        element_type: Type of the elements of the package.
+
+    Returns:
+        The path to the registry file.
+
+    """
+    registry_file = os.path.join(os.path.dirname(os.path.abspath(init_file)), ELEMENT_REGISTRY_FILE)
+    with open(registry_file, 'w') as f:
+        json.dump(
+            {
+                "version": ELEMENT_REGISTRY_VERSION,
+                "elements": discover_elements(init_file, element_type)
+            },
+            f,
+            indent=4
+        )
+        f.write('\n')
+
+    return registry_file
+
+
+@check_type
+def find_element_packages(path: str) -> List[Tuple[str, ElementType]]:
+    """
+    Find the elements packages located under the given folder, i-e packages whose `__init__.py`
+    registers its elements with [`import_input()`][onecode.import_input] or
+    [`import_output()`][onecode.import_output]. Packages are found from their files, without
+    importing them.
+
+    Args:
+        path: Path to the folder to look for elements packages into.
+
+    Returns:
+        The path to the `__init__.py` file of each elements package, along with the type of its
+            elements.
+
+    """
+    packages = []
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        if '__init__.py' not in files:
+            continue
+
+        init_file = os.path.join(root, '__init__.py')
+        with open(init_file) as f:
+            code = f.read()
+
+        if 'import_input(' in code:
+            packages.append((init_file, ElementType.INPUT))
+        elif 'import_output(' in code:
+            packages.append((init_file, ElementType.OUTPUT))
+
+    return packages
+
+
+@check_type
+def get_element_class(
+    package_name: str,
+    name: str
+) -> type:
+    """
+    Get an element class registered by [`register_elements()`][onecode.register_elements],
+    importing its module on first access. Element classes of sub-packages are looked up too, so
+    that this function can serve as the module-level `__getattr__()` of parent packages.
+
+    Args:
+        package_name: Python name of the elements package, or of one of its parent packages.
+        name: Element class name.
+
+    Returns:
+        The element class.
+
+    Raises:
+        AttributeError: if no element class with this name is registered in the package.
+
+    """
+    for package, classes in _LAZY_CLASSES.items():
+        if name in classes and (package == package_name or package.startswith(f'{package_name}.')):
+            entry = classes[name]
+            module = sys.modules[package]
+            function = vars(module).get(entry["function"])
+
+            cls = getattr(importlib.import_module(f'{package}.{entry["module"]}'), name)
+            setattr(module, name, cls)
+
+            # importing the submodule binds it to the package, shadowing the element function
+            if function is not None:
+                setattr(module, entry["function"], function)
+
+            return cls
+
+    raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+
+
+def _element_function(
+    package_name: str,
+    name: str,
+    element_type: ElementType
+) -> Callable:
+    cls = None
+
+    def _x(*args, **kwargs):
+        nonlocal cls
+        if cls is None:
+            cls = getattr(sys.modules[package_name], name)
+
+        if element_type == ElementType.OUTPUT and not args and not kwargs:
+            return getattr(cls, "static_call")(cls)
+
+        return cls(*args, **kwargs)()
+
+    return _x
+
+
+@check_type
+def register_elements(
+    init_file: str,
+    module_name: str,
+    element_type: ElementType
+) -> None:
+    """
+    Register the elements of a package, as listed by its registry file (see
+    [`write_element_registry()`][onecode.write_element_registry]) or discovered from its files
+    if the registry is missing or stale (see [`discover_elements()`][onecode.discover_elements]).
+    This is the common implementation of [`import_input()`][onecode.import_input] and
+    [`import_output()`][onecode.import_output].
+
+    Element modules are not imported: the element functions and types are exported right away,
+    while element classes are imported on first call or access, so that large element packages
+    do not slow down startup.
+
+    Args:
+        init_file: Path to the `__init__.py` file of the elements package.
+        module_name: Python name of the elements package.
+        element_type: Type of the elements of the package.
+
+    """
+    module = sys.modules[module_name]
+    this_module = module.__name__.split('.')[0]
+
+    entries = load_element_registry(init_file)
+    if entries is None:
+        entries = discover_elements(init_file, element_type)
+
+    classes = _LAZY_CLASSES.setdefault(module_name, {})
+    for entry in entries:
+        Project().register_element(f'{this_module}.{entry["kind"]}')
+        classes[entry["kind"]] = entry
+
+        setattr(module, entry["function"], _element_function(
+            module_name,
+            entry["kind"],
+            ElementType(entry["type"])
+        ))
+        setattr(module, f'{entry["function"]}_type', ElementType(entry["type"]))
+
+    # element classes are imported on first access (PEP 562), from this package or its parents
+    parts = module_name.split('.')
+    for i in range(len(parts), 0, -1):
+        package = sys.modules.get('.'.join(parts[:i]))
+        if package is not None and '__getattr__' not in vars(package):
+            package.__getattr__ = functools.partial(get_element_class, package.__name__)
@@ -0,0 +1,378 @@
+# SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+import pickle
+import shutil
+from typing import Any, Dict, List, Optional
+
+from .. import __version__
+from ..base.checksum import content_hasher, file_digest
+from ..base.decorator import check_type
+from ..base.project import Project
+
+
+def _link_or_copy(
+    src: str,
+    dst: str
+) -> None:
+    """
+    Internal function hard-linking a file, or copying it when hard links are not supported
+    (e.g. across devices).
+
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _file_fingerprint(path: str) -> Optional[List[int]]:
+    """
+    Internal function returning the size and modification time (in ns) of a file, or None if it
+    does not exist.
+
+    """
+    if not os.path.isfile(path):
+        return None
+
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _value_fingerprint(value: Any) -> str:
+    """
+    Internal function hashing a value through its pickled representation.
+
+    Raises:
+        pickle.PicklingError, TypeError, AttributeError: if the value cannot be pickled.
+
+    """
+    hasher = content_hasher()
+    hasher.update(pickle.dumps(value, protocol=4))
+    return hasher.hexdigest()
+
+
+class FlowCache:
+    """
+    Cache of flow results across runs, typically used by the OneCode project `main()` when the
+    config option `FLOW_CACHE` is True (or `python main.py --cache`).
+
+    While a flow is executed, the input elements it resolves are recorded (see
+    [`Project.recorded_inputs`][onecode.Project.recorded_inputs]). The flow results (output
+    files, manifest and resolved input values) are then stored under `<data_root>/.cache/flows`,
+    keyed by:
+
+    - the hash of the project code, i-e all Python files of the `flows` folder, and the OneCode
+        version,
+    - the outputs folder (see [`Project.output_root`][onecode.Project.output_root]),
+    - the values found in the Project data for each recorded input element prior to its
+        resolution (e.g. the values from the parameters file),
+    - the size and modification time of the files read by the input elements (e.g. `FileInput`
+        and `CsvReader`).
+
+    On the next runs, if all of these are unchanged, the flow results are restored rather than
+    executing the flow again: output files are hard-linked from the cache when possible.
+
+    !!! warning
+        Flows must be deterministic: results depending on anything else than their code and
+        their input elements (random numbers, time, external resources, etc.) would be restored
+        as-is from the cache.
+
+    Output files modified in-place after being cached (e.g. through their hard link when running
+    the flow without cache) are detected through their size, modification time and content hash:
+    the corresponding cache entry is then discarded.
+
+    """
+
+    @check_type
+    def __init__(
+        self,
+        project_path: str,
+        max_entries: int = 8
+    ):
+        """
+        Args:
+            project_path: Path to the root of the OneCode project.
+            max_entries: Maximum number of cache entries kept per flow: least recently used ones
+                are evicted first.
+
+        """
+        self._project_path = project_path
+        self._max_entries = max_entries
+        self._source_digest = None
+
+    @property
+    def root(self) -> str:
+        """
+        Returns:
+            The path to the folder storing the flow cache entries.
+
+        """
+        return os.path.join(Project().data_root, '.cache', 'flows')
+
+    def _source(self) -> str:
+        """
+        Internal function hashing the project code along with the OneCode version, computed
+        once.
+
+        """
+        if self._source_digest is None:
+            hasher = content_hasher()
+            hasher.update(__version__.encode())
+            flows_dir = os.path.join(self._project_path, 'flows')
+
+            for root, dirs, files in os.walk(flows_dir):
+                dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+                for filename in sorted(f for f in files if f.endswith('.py')):
+                    path = os.path.join(root, filename)
+                    hasher.update(os.path.relpath(path, flows_dir).encode())
+                    with open(path, 'rb') as f:
+                        hasher.update(f.read())
+
+            self._source_digest = hasher.hexdigest()
+
+        return self._source_digest
+
+    def _entries(
+        self,
+        flow: str
+    ) -> List[str]:
+        """
+        Internal function listing the cache entries of a flow, most recently used first.
+
+        """
+        flow_dir = os.path.join(self.root, flow)
+        if not os.path.isdir(flow_dir):
+            return []
+
+        entries = [
+            os.path.join(flow_dir, e) for e in os.listdir(flow_dir)
+            if os.path.isfile(os.path.join(flow_dir, e, 'key.json'))
+        ]
+
+        return sorted(
+            entries,
+            key=lambda e: os.path.getmtime(os.path.join(e, 'key.json')),
+            reverse=True
+        )
+
+    def _check_outputs(
+        self,
+        entry: str,
+        key: Dict
+    ) -> bool:
+        """
+        Internal function checking that the cached outputs of an entry were not modified, e.g.
+        when overwritten in-place through a hard link. Outputs whose size or modification time
+        changed are hashed: if their content is unchanged, the entry is updated accordingly.
+
+        """
+        changed = False
+        for output in key["outputs"]:
+            stored = os.path.join(entry, 'files', output["stored"])
+            fingerprint = _file_fingerprint(stored)
+
+            if fingerprint != output["fingerprint"]:
+                if fingerprint is None or file_digest(stored) != output["hash"]:
+                    return False
+
+                output["fingerprint"] = fingerprint
+                changed = True
+
+        if changed:
+            with open(os.path.join(entry, 'key.json'), 'w') as f:
+                json.dump(key, f)
+
+        return True
+
+    @check_type
+    def restore(
+        self,
+        flow: str
+    ) -> bool:
+        """
+        Restore the results of the given flow if a valid cache entry exists for the current
+        Project data and input files. It must be called before running the flow, once the
+        output manifest has been cleared.
+
+        Args:
+            flow: ID of the flow.
+
+        Returns:
+            True if the results were restored, in which case the flow must not be executed.
+
+        """
+        data = Project().data if Project().data is not None else {}
+
+        for entry in self._entries(flow):
+            with open(os.path.join(entry, 'key.json')) as f:
+                key = json.load(f)
+
+            if key["source"] != self._source() or key["output_root"] != Project().output_root:
+                continue
+
+            try:
+                if any(
+                    fingerprint != (_value_fingerprint(data[k]) if k in data else None)
+                    for k, fingerprint in key["inputs"].items()
+                ):
+                    continue
+            except (pickle.PicklingError, TypeError, AttributeError):
+                continue
+
+            if any(_file_fingerprint(p) != fp for p, fp in key["files"].items()):
+                continue
+
+            if not self._check_outputs(entry, key):
+                shutil.rmtree(entry, ignore_errors=True)
+                continue
+
+            for output in key["outputs"]:
+                if os.path.lexists(output["path"]):
+                    os.remove(output["path"])
+
+                os.makedirs(os.path.dirname(output["path"]), exist_ok=True)
+                _link_or_copy(os.path.join(entry, 'files', output["stored"]), output["path"])
+
+            shutil.copyfile(os.path.join(entry, 'MANIFEST.txt'), Project().get_output_manifest())
+
+            with open(os.path.join(entry, 'data.pkl'), 'rb') as f:
+                for k, v in pickle.load(f).items():
+                    Project().add_data(k, v)
+
+            # mark as recently used
+            os.utime(os.path.join(entry, 'key.json'))
+
+            return True
+
+        return False
+
+    @check_type
+    def start(
+        self,
+        flow: str
+    ) -> None:
+        """
+        Start recording the input elements resolved by the given flow. It must be called right
+        before running the flow. Output files hard-linked to cache entries are replaced by a copy
+        beforehand, so that the flow overwriting them in-place does not alter the cache.
+
+        Args:
+            flow: ID of the flow.
+
+        """
+        for entry in self._entries(flow):
+            with open(os.path.join(entry, 'key.json')) as f:
+                key = json.load(f)
+
+            for output in key["outputs"]:
+                path = output["path"]
+                stored = os.path.join(entry, 'files', output["stored"])
+
+                if os.path.isfile(path) and os.path.isfile(stored) and \
+                        os.path.samefile(path, stored):
+                    shutil.copy2(stored, f'{path}.tmp')
+                    os.replace(f'{path}.tmp', path)
+
+        Project().recorded_inputs = {}
+
+    @check_type
+    def store(
+        self,
+        flow: str
+    ) -> bool:
+        """
+        Stop recording and store the results of the given flow. It must be called right after
+        running the flow. Results cannot be stored when the recorded input values cannot be
+        pickled, or when outputs are not regular files (e.g. folders).
+
+        Args:
+            flow: ID of the flow.
+
+        Returns:
+            True if the results were stored.
+
+        """
+        recorded_inputs = Project().recorded_inputs
+        Project().recorded_inputs = None
+        if recorded_inputs is None:
+            return False
+
+        data = Project().data if Project().data is not None else {}
+        try:
+            inputs = {
+                k: _value_fingerprint(prior) if in_data else None
+                for k, (in_data, prior, _) in recorded_inputs.items()
+            }
+            values = pickle.dumps({k: data[k] for k in recorded_inputs if k in data}, protocol=4)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return False
+
+        files = {
+            path: _file_fingerprint(path)
+            for _, _, paths in recorded_inputs.values() for path in paths
+        }
+
+        manifest = Project().get_output_manifest()
+        output_files = []
+        if os.path.exists(manifest):
+            with open(manifest) as f:
+                for line in f:
+                    output = json.loads(line)
+                    path = output.get("value")
+                    if output.get("kind") != "FileOutput" or not isinstance(path, str) or \
+                            not os.path.lexists(path):
+                        continue
+
+                    elif not os.path.isfile(path):
+                        return False
+
+                    elif path not in output_files:
+                        output_files.append(path)
+
+        key = {
+            "source": self._source(),
+            "output_root": Project().output_root,
+            "inputs": inputs,
+            "files": files,
+        }
+
+        hasher = content_hasher()
+        hasher.update(json.dumps(key, sort_keys=True).encode())
+        entry = os.path.join(self.root, flow, hasher.hexdigest())
+
+        tmp_entry = f'{entry}.tmp'
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+        os.makedirs(os.path.join(tmp_entry, 'files'))
+
+        key["outputs"] = []
+        for i, path in enumerate(output_files):
+            stored = f'{i}{os.path.splitext(path)[1]}'
+            _link_or_copy(path, os.path.join(tmp_entry, 'files', stored))
+            key["outputs"].append({
+                "path": path,
+                "stored": stored,
+                "fingerprint": _file_fingerprint(os.path.join(tmp_entry, 'files', stored)),
+                "hash": file_digest(os.path.join(tmp_entry, 'files', stored)),
+            })
+
+        if os.path.exists(manifest):
+            shutil.copyfile(manifest, os.path.join(tmp_entry, 'MANIFEST.txt'))
+        else:
+            open(os.path.join(tmp_entry, 'MANIFEST.txt'), 'w').close()
+
+        with open(os.path.join(tmp_entry, 'data.pkl'), 'wb') as f:
+            f.write(values)
+
+        with open(os.path.join(tmp_entry, 'key.json'), 'w') as f:
+            json.dump(key, f)
+
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp_entry, entry)
+
+        for evicted in self._entries(flow)[self._max_entries:]:
+            shutil.rmtree(evicted, ignore_errors=True)
+
+        return True
@@ -0,0 +1,245 @@
+# SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
+# SPDX-License-Identifier: MIT
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..base.logger import Logger
+from ..base.project import Project
+
+
+class _FlowFilter(logging.Filter):
+    """
+    Internal logging filter tagging records with the flow they are emitted from, so that they
+    can be told apart once forwarded to the parent process.
+
+    """
+
+    def filter(
+        self,
+        record: logging.LogRecord
+    ) -> bool:
+        record.flow = Project().current_flow
+        return True
+
+
+def flow_dependencies(workflows: List[Dict]) -> Dict[str, List[str]]:
+    """
+    Get the dependencies of each flow, as declared in their `depends_on` attribute of the OneCode
+    project configuration file.
+
+    !!! example
+        ```json
+        [
+            {"file": "preprocess", "label": "Preprocess", "attributes": {}},
+            {"file": "model", "label": "Model", "attributes": {"depends_on": ["preprocess"]}}
+        ]
+        ```
+
+    Args:
+        workflows: List of flows from the OneCode project configuration file.
+
+    Returns:
+        A dictionnary mapping each flow ID to the IDs of the flows it depends on.
+
+    Raises:
+        ValueError: if a flow depends on an unknown flow, or if dependencies are circular.
+
+    """
+    ids = [wfl['file'] for wfl in workflows]
+    deps = {}
+
+    for wfl in workflows:
+        depends_on = wfl.get('attributes', {}).get('depends_on', [])
+        if isinstance(depends_on, str):
+            depends_on = [depends_on]
+
+        unknown = [d for d in depends_on if d not in ids]
+        if unknown:
+            raise ValueError(f"Flow {wfl['file']} depends on unknown flow(s): {unknown}")
+
+        deps[wfl['file']] = list(depends_on)
+
+    sort_flows(workflows, deps)
+    return deps
+
+
+def sort_flows(
+    workflows: List[Dict],
+    deps: Optional[Dict[str, List[str]]] = None
+) -> List[Dict]:
+    """
+    Sort the flows so that each flow comes after the ones it depends on. Otherwise, flows keep
+    the order of the OneCode project configuration file.
+
+    Args:
+        workflows: List of flows from the OneCode project configuration file.
+        deps: Dependencies of each flow (see [`flow_dependencies()`][onecode.flow_dependencies]).
+            If None, they are read from the flow attributes.
+
+    Returns:
+        The sorted list of flows.
+
+    Raises:
+        ValueError: if dependencies are circular.
+
+    """
+    if deps is None:
+        return sort_flows(workflows, flow_dependencies(workflows))
+
+    remaining = list(workflows)
+    done = set()
+    ordered = []
+
+    while remaining:
+        ready = next(
+            (wfl for wfl in remaining if all(d in done for d in deps.get(wfl['file'], []))),
+            None
+        )
+        if ready is None:
+            raise ValueError(
+                f"Circular dependencies between flows: {[wfl['file'] for wfl in remaining]}"
+            )
+
+        remaining.remove(ready)
+        done.add(ready['file'])
+        ordered.append(ready)
+
+    return ordered
+
+
+def _run_flow_process(
+    run_flow: Callable[[Dict], Any],
+    wfl: Dict,
+    state: Tuple[Any, Optional[Dict], Dict, str],
+    log_queue: Optional[Any]
+) -> Tuple[Any, Optional[Dict]]:
+    """
+    Internal function running a flow in a worker process, after restoring the Project state
+    from the parent process. Logs are forwarded to the parent process through the queue, if any.
+
+    """
+    mode, data, config, data_root = state
+
+    Project().reset(keep_registered_elements=True)
+    Project()._set_data_root(data_root)
+    Project().mode = mode
+    Project().data = data
+    for k, v in config.items():
+        Project().set_config(k, v)
+
+    Logger().reset()
+    if log_queue is not None:
+        handler = QueueHandler(log_queue)
+        handler.addFilter(_FlowFilter())
+        Logger().add_handler(handler)
+
+    result = run_flow(wfl)
+    return result, Project().data
+
+
+def run_flows(
+    workflows: List[Dict],
+    run_flow: Callable[[Dict], Any],
+    flow_name: Optional[str] = None,
+    jobs: int = 1,
+    logger: Optional[logging.Handler] = None
+) -> List[Any]:
+    """
+    Run the flows according to their dependencies (see
+    [`flow_dependencies()`][onecode.flow_dependencies]), typically used by the OneCode project
+    `main()`.
+
+    With more than one job, flows are scheduled on a pool of processes as soon as the flows they
+    depend on are completed, so that independent flows run concurrently. Each process starts
+    from the Project state of the main process (mode, config and data merged from the
+    completed flows), runs one flow at a time and sends its data back once completed. Logs are
+    emitted by each process, tagged with their flow, and forwarded to the given handler.
+
+    Args:
+        workflows: List of flows from the OneCode project configuration file.
+        run_flow: Function running a single flow, given its entry in the configuration file. It
+            must be picklable (i-e defined at the top-level of a module) when running with more
+            than one job.
+        flow_name: Run only the flow specified by its ID. If None provided, all flows will run.
+        jobs: Maximum number of flows running concurrently. Set to 0 to use all available
+            cores.
+        logger: Logging handler the flow logs are forwarded to when running with more than one
+            job. When running sequentially, the handler must be added to the OneCode Logger
+            beforehand.
+
+    Returns:
+        The results of `run_flow()`, in the order of [`sort_flows()`][onecode.sort_flows].
+
+    Raises:
+        ValueError: if a flow depends on an unknown flow, or if dependencies are circular.
+
+    """
+    deps = flow_dependencies(workflows)
+    ordered = [
+        wfl for wfl in sort_flows(workflows, deps) if flow_name is None or flow_name == wfl['file']
+    ]
+
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+
+    jobs = min(jobs, len(ordered))
+    if jobs <= 1:
+        return [run_flow(wfl) for wfl in ordered]
+
+    # dependencies on flows not selected are considered fulfilled
+    selected = set(wfl['file'] for wfl in ordered)
+    pending = {wfl['file']: set(deps[wfl['file']]) & selected for wfl in ordered}
+    results = {}
+
+    manager = multiprocessing.Manager() if logger is not None else None
+    log_queue = manager.Queue() if manager is not None else None
+    listener = QueueListener(log_queue, logger, respect_handler_level=True) \
+        if log_queue is not None else None
+
+    if listener is not None:
+        listener.start()
+
+    try:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            running = {}
+            while pending or running:
+                for wfl in ordered:
+                    flow = wfl['file']
+                    if flow in pending and not pending[flow]:
+                        del pending[flow]
+                        state = (
+                            Project().mode,
+                            Project().data,
+                            dict(Project().config),
+                            Project().data_root
+                        )
+                        future = executor.submit(_run_flow_process, run_flow, wfl, state, log_queue)
+                        running[future] = flow
+
+                completed, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    flow = running.pop(future)
+                    try:
+                        results[flow], data = future.result()
+                    except BaseException:
+                        for f in running:
+                            f.cancel()
+                        raise
+
+                    for k, v in (data or {}).items():
+                        Project().add_data(k, v)
+
+                    for remaining in pending.values():
+                        remaining.discard(flow)
+
+    finally:
+        if listener is not None:
+            listener.stop()
+            manager.shutdown()
+
+    return [results[wfl['file']] for wfl in ordered]
@@ -1,15 +1,9 @@
 # SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
 # SPDX-License-Identifier: MIT
 
-import os
-import sys
-from glob import glob
-
-import pydash
-
 from ..base.decorator import check_type
 from ..base.enums import ElementType
-from ..base.project import Project
+from .element_registry import register_elements
 
 
 @check_type
@@ -20,10 +14,13 @@ def import_output(
     """
     Use this function to register your `OutputElement`. Here is what it does for you in details.
 
-    For each file located in the same folder as the `init_file` path:
+    For each element listed in the registry file of the package (see
+    [`write_element_registry()`][onecode.write_element_registry]), or for each file located in
+    the same folder as the `init_file` path if the registry is missing or stale:
 
-    1. import the corresponding class: the class name must be the Pascal-case of the filename
-        (e.g. `file_output.py` => `class FileOutput`)
+    1. locate the corresponding class: the class name must be the Pascal-case of the filename
+        (e.g. `file_output.py` => `class FileOutput`). The class is only imported on
+        first use (see [`register_elements()`][onecode.register_elements]).
     2. register the class as an element, i-e it will be recognized by the OneCode interpreter
     3. export the class as-is (allow for subclassing by a third-party)
     4. export a new function matching the filename: it wrapps around the class for convenience
@@ -75,31 +72,4 @@ def import_output(
             available for importing using regular Python import statements.
 
    """
-    this_module = sys.modules[module_name].__name__.split('.')[0]
-    for _filename in [
-        os.path.basename(f)[:-3] for f in glob(os.path.join(os.path.dirname(init_file), "*.py"))
-        if os.path.isfile(f) and not f.endswith("__init__.py") and f.endswith(".py")
-    ]:
-        _ent = pydash.pascal_case(_filename)
-        Project().register_element(f'{this_module}.{_ent}')
-
-        _module = __import__('.'.join([module_name, _filename]), fromlist=[_filename])
-        _cls = getattr(_module, _ent)
-
-        try:
-            def _xdef(cls):
-                def _x(*args, **kwargs):    # pragma: no cover
-                    empty_ctor = not args and not kwargs
-                    return getattr(cls, "static_call")(cls) if empty_ctor \
-                        else cls(*args, **kwargs)()
-                return _x
-
-            def _typedef():
-                return ElementType.OUTPUT
-
-            setattr(sys.modules[module_name], _filename, _xdef(_cls))
-            setattr(sys.modules[module_name], f'{_filename}_type', _typedef())
-            setattr(sys.modules[module_name], _ent, _cls)
-
-        except AttributeError:   # pragma: no cover
-            pass
+    register_elements(init_file, module_name, ElementType.OUTPUT)
@@ -22,6 +22,9 @@ def register_ext_module(
 
     Note that a `onecode_ext` module is shipped by default with any OneCode project. As soon as the
     developer creates new elements as part of this module, the `onecode_ext` will be registered.
+    Run `onecode-registry` from the project root to generate the registry files of its elements
+    packages, so that they are registered without being discovered (see
+    [`write_element_registry()`][onecode.write_element_registry]).
 
     !!! info
         It is not required to call this function explicitely. It is already done automatically as
@@ -35,9 +38,13 @@ def register_ext_module(
 
     """
     code_ext_path = os.path.join(project_path, 'flows', module_name)
-    py_files = [f for f in Path(code_ext_path).rglob("*.[pP][yY]") if f.name != '__init__.py']
 
-    if len(py_files) > 0:
+    # stop at the first Python file rather than listing the whole extension
+    has_code = any(
+        f.name != '__init__.py' for f in Path(code_ext_path).rglob("*.[pP][yY]")
+    )
+
+    if has_code:
         spec = importlib.util.spec_from_file_location(
             module_name,
             os.path.join(code_ext_path, "__init__.py")
@@ -0,0 +1,239 @@
+# SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
+# SPDX-License-Identifier: MIT
+
+import functools
+import importlib.util
+import inspect
+import os
+import pickle
+import sys
+import uuid
+from typing import Any, Callable, Optional
+
+from .. import __version__
+from ..base.checksum import content_hasher
+from ..base.logger import Logger
+from ..base.project import Project
+
+# Serializers supported by `cached()`, mapped to their file extension.
+SERIALIZERS = {
+    'pickle': '.pkl',
+    'parquet': '.parquet',
+}
+
+# Default maximum size (in bytes) of the step cache.
+DEFAULT_CACHE_SIZE = 1024 ** 3
+
+
+def _update_fingerprint(
+    hasher: Any,
+    value: Any
+) -> None:
+    """
+    Internal function feeding a value to a hash object. NumPy arrays and Pandas DataFrames/Series
+    are hashed from their memory buffer (respectively with `pd.util.hash_pandas_object()`)
+    rather than pickled, containers are walked through recursively.
+
+    Raises:
+        pickle.PicklingError, TypeError, AttributeError: if a value cannot be pickled.
+
+    """
+    # NumPy and Pandas are not imported by OneCode: values cannot be arrays/DataFrames otherwise
+    np = sys.modules.get('numpy')
+    pd = sys.modules.get('pandas')
+
+    if np is not None and isinstance(value, np.ndarray) and value.dtype != object:
+        hasher.update(f'ndarray{value.dtype.str}{value.shape}'.encode())
+        hasher.update(np.ascontiguousarray(value).reshape(-1).view(np.uint8))
+
+    elif pd is not None and isinstance(value, (pd.DataFrame, pd.Series)):
+        hasher.update(type(value).__name__.encode())
+        if isinstance(value, pd.DataFrame):
+            _update_fingerprint(hasher, [str(c) for c in value.columns])
+            _update_fingerprint(hasher, [str(d) for d in value.dtypes])
+        else:
+            _update_fingerprint(hasher, (str(value.name), str(value.dtype)))
+
+        hasher.update(pd.util.hash_pandas_object(value, index=True).to_numpy())
+
+    elif isinstance(value, (list, tuple)):
+        hasher.update(f'{type(value).__name__}{len(value)}'.encode())
+        for v in value:
+            _update_fingerprint(hasher, v)
+
+    elif isinstance(value, dict):
+        hasher.update(f'dict{len(value)}'.encode())
+        for k, v in value.items():
+            _update_fingerprint(hasher, k)
+            _update_fingerprint(hasher, v)
+
+    else:
+        hasher.update(pickle.dumps(value, protocol=4))
+
+
+def _function_source(func: Callable) -> str:
+    """
+    Internal function returning the source code of a function, or its bytecode representation
+    when the source is not available (e.g. interactive sessions).
+
+    """
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        return repr(func.__code__.co_code) + repr(func.__code__.co_consts)
+
+
+def _evict(
+    cache_dir: str,
+    max_size: int
+) -> None:
+    """
+    Internal function removing the least recently used entries of the step cache until its size
+    is below the given maximum. Entries are sorted by modification time, updated on each hit.
+
+    """
+    entries = []
+    for e in os.scandir(cache_dir):
+        if e.is_file() and os.path.splitext(e.name)[1] in SERIALIZERS.values():
+            st = e.stat()
+            entries.append((st.st_mtime_ns, st.st_size, e.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_size:
+            break
+
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:     # pragma: no cover
+            pass
+
+
+def cached(
+    func: Optional[Callable] = None,
+    serializer: str = 'pickle',
+    max_size: int = DEFAULT_CACHE_SIZE
+) -> Callable:
+    """
+    Decorator storing the results of a function under `<data_root>/.cache/steps`, typically
+    used on expensive intermediate steps of a flow: as long as the function code and its
+    arguments are unchanged, the result is loaded from the cache instead of being recomputed.
+
+    The cache key is derived from the function source code, the OneCode version and the
+    arguments fingerprints: NumPy arrays and Pandas DataFrames/Series are hashed directly from
+    their data, other values from their pickled representation. Function calls with arguments
+    that cannot be pickled are not cached.
+
+    Once a result is stored, the least recently used results are evicted until the cache size
+    is below `max_size`.
+
+    !!! example
+        ```py
+        import onecode
+
+        @onecode.cached
+        def heavy_step(df, factor):
+            ...
+
+        @onecode.cached(serializer='parquet', max_size=10 * 1024 ** 3)
+        def heavy_dataframe_step(df):
+            ...
+        ```
+
+    !!! warning
+        Functions must be deterministic: results depending on anything else than their code
+        and arguments (global variables, called functions, files, random numbers, etc.) would be
+        loaded as-is from the cache.
+
+    Args:
+        func: Function to cache.
+        serializer: Either `pickle` to store any picklable result, or `parquet` to store
+            Pandas DataFrames in the columnar Parquet format (requires `pyarrow`, i-e
+            `pip install onecode[performance]`): other results are pickled.
+        max_size: Maximum size of the step cache (in bytes).
+
+    Raises:
+        ValueError: if the serializer is not supported.
+        ImportError: if the `parquet` serializer is used without `pyarrow` installed.
+
+    """
+    if serializer not in SERIALIZERS:
+        raise ValueError(
+            f'Invalid serializer {serializer}, must be one of {list(SERIALIZERS.keys())}'
+        )
+
+    elif serializer == 'parquet' and \
+            importlib.util.find_spec('pyarrow') is None:     # pragma: no cover
+        raise ImportError('The parquet serializer requires pyarrow to be installed')
+
+    def decorator(f: Callable) -> Callable:
+        source = content_hasher()
+        source.update(__version__.encode())
+        source.update(f'{f.__module__}.{f.__qualname__}'.encode())
+        source.update(_function_source(f).encode())
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            hasher = source.copy()
+            try:
+                _update_fingerprint(hasher, args)
+                _update_fingerprint(hasher, sorted(kwargs.items()))
+            except (pickle.PicklingError, TypeError, AttributeError):
+                Logger.debug(f'{f.__qualname__}: arguments cannot be fingerprinted, not cached')
+                return f(*args, **kwargs)
+
+            cache_dir = os.path.join(Project().data_root, '.cache', 'steps')
+            entry = os.path.join(cache_dir, f'{f.__qualname__}-{hasher.hexdigest()}')
+
+            for ext in dict.fromkeys([SERIALIZERS[serializer], SERIALIZERS['pickle']]):
+                try:
+                    if ext == SERIALIZERS['parquet']:
+                        import pandas as pd
+                        result = pd.read_parquet(entry + ext)
+                    else:
+                        with open(entry + ext, 'rb') as fi:
+                            result = pickle.load(fi)
+
+                except FileNotFoundError:
+                    continue
+
+                except Exception as e:
+                    # corrupted entry (e.g. interrupted write): recompute it
+                    Logger.debug(f'{f.__qualname__}: invalid cache entry ({e})')
+                    continue
+
+                # mark as recently used
+                os.utime(entry + ext)
+                return result
+
+            result = f(*args, **kwargs)
+
+            os.makedirs(cache_dir, exist_ok=True)
+            pd = sys.modules.get('pandas')
+            ext = SERIALIZERS[serializer] if pd is not None and isinstance(result, pd.DataFrame) \
+                else SERIALIZERS['pickle']
+            tmp_file = f'{entry}.{uuid.uuid4().hex}.tmp'
+
+            try:
+                if ext == SERIALIZERS['parquet']:
+                    result.to_parquet(tmp_file)
+                else:
+                    with open(tmp_file, 'wb') as fo:
+                        pickle.dump(result, fo, protocol=4)
+
+                os.replace(tmp_file, entry + ext)
+
+            except Exception as e:
+                Logger.debug(f'{f.__qualname__}: result cannot be cached ({e})')
+                if os.path.exists(tmp_file):
+                    os.remove(tmp_file)
+
+                return result
+
+            _evict(cache_dir, max_size)
+            return result
+
+        return wrapper
+
+    return decorator if func is None else decorator(func)
@@ -1,9 +1,102 @@
 # SPDX-FileCopyrightText: 2023-2024 DeepLime <contact@deeplime.io>
 # SPDX-License-Identifier: MIT
 
-from typing import Any
+import functools
+from typing import Any, Callable, Optional, Tuple, Union, get_args, get_origin
 
-from typeguard import check_type
+# Numeric tower (PEP 484): integers are accepted for floats, and both for complex numbers.
+_NUMERIC_TOWER = {
+    float: (float, int),
+    complex: (complex, float, int),
+}
+
+
+def _classes(t: Any) -> Optional[Tuple[type, ...]]:
+    # classes matching a plain class or a union of plain classes, None for other typings
+    if t is Any:
+        return None
+
+    elif t is None or t is type(None):
+        return (type(None),)
+
+    elif get_origin(t) is Union:
+        classes = [_classes(arg) for arg in get_args(t)]
+        return None if None in classes else tuple(c for cls in classes for c in cls)
+
+    # protocols are checked structurally by typeguard
+    elif isinstance(t, type) and get_origin(t) is None and not getattr(t, '_is_protocol', False):
+        return _NUMERIC_TOWER.get(t, (t,))
+
+    return None
+
+
+def _typeguard_validator(t: Any) -> Callable[[Any], bool]:
+    def _validate(obj: Any) -> bool:
+        # imported on demand to keep `import onecode` light
+        from typeguard import check_type
+
+        try:
+            check_type(value=obj, expected_type=t)
+            return True
+
+        except Exception:
+            return False
+
+    return _validate
+
+
+def _compile_validator(t: Any) -> Callable[[Any], bool]:
+    if t is Any:
+        return lambda obj: True
+
+    classes = _classes(t)
+    if classes is not None:
+        return lambda obj: isinstance(obj, classes)
+
+    origin, args = get_origin(t), get_args(t)
+    if origin is Union:
+        validators = tuple(type_validator(arg) for arg in args)
+        return lambda obj: any(validate(obj) for validate in validators)
+
+    elif origin is list and len(args) == 1:
+        item_classes = _classes(args[0])
+        if item_classes is not None:
+            return lambda obj: isinstance(obj, list) and all(
+                isinstance(v, item_classes) for v in obj
+            )
+
+        validate_item = type_validator(args[0])
+        return lambda obj: isinstance(obj, list) and all(validate_item(v) for v in obj)
+
+    return _typeguard_validator(t)
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_validator(t: Any) -> Callable[[Any], bool]:
+    return _compile_validator(t)
+
+
+def type_validator(t: Any) -> Callable[[Any], bool]:
+    """
+    Get a function checking whether objects are of the given type, compiled once per type:
+    built-in types and classes, `Optional`, `Union` and `List` of them are checked with
+    `isinstance()`, while other typings are checked with `typeguard`. As with `typeguard`, integers
+    are accepted as floating point numbers, but all the items of a `List` are checked (rather than
+    its first item only).
+
+    Args:
+        t: Typing to verify: either a built-in type or a Python `typing`.
+
+    Returns:
+        A function returning True if its argument matches the type, otherwise False.
+
+    """
+    try:
+        return _cached_validator(t)
+
+    # unhashable typing, e.g. `Annotated` with unhashable metadata
+    except TypeError:
+        return _compile_validator(t)
 
 
 def is_type(
@@ -12,7 +105,7 @@ def is_type(
 ) -> bool:
     """
     Check whether the given object is of a certain type. This function is typically used by
-    InputElement to validate values.
+    InputElement to validate values (see [`type_validator()`][onecode.type_validator]).
 
     Args:
         obj: Object to test typing against.
@@ -22,9 +115,4 @@ def is_type(
         True if the object match the type, otherwise False.
 
     """
-    try:
-        check_type(value=obj, expected_type=t)
-        return True
-
-    except Exception:
-        return False
+    return type_validator(t)(obj)
@@ -0,0 +1,92 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from onecode import Env
+from onecode.cli.create import create
+from tests.utils.flow_cli import _clean_flow, _generate_flow_name
+
+_FLOW = """import onecode
+
+
+def run():
+    with open("runs.txt", 'a') as f:
+        f.write("x")
+
+    x = onecode.slider('x', 0.5, min=0, max=1, step=0.1)
+    with open(onecode.file_input('data', 'data.txt')) as f:
+        data = f.read()
+
+    with open(onecode.file_output('out', 'out.txt'), 'w') as f:
+        f.write(f'{data} {x}')
+"""
+
+
+def _run(flow_dir: str, args: str = '') -> str:
+    os.system(f'cd "{flow_dir}" && {Env.ONECODE_DO_TYPECHECK}=1 python main.py {args}')
+
+    with open(os.path.join(flow_dir, 'runs.txt')) as f:
+        runs = len(f.read())
+
+    with open(os.path.join(flow_dir, 'data', 'outputs', 'out.txt')) as f:
+        return runs, f.read()
+
+
+@pytest.mark.emulations
+def test_flow_cache():
+    flow_name, flow_folder, flow_id = _generate_flow_name()
+
+    tmp = _clean_flow(flow_folder)
+    create(tmp, flow_name, cli=False)
+
+    flow_dir = os.path.join(tmp, flow_folder)
+    flow_file = os.path.join(flow_dir, 'flows', f'{flow_id}.py')
+    data_file = os.path.join(flow_dir, 'data', 'data.txt')
+    params_file = os.path.join(flow_dir, 'params.json')
+
+    with open(flow_file, 'w') as f:
+        f.write(_FLOW)
+
+    with open(data_file, 'w') as f:
+        f.write('OneCode')
+
+    # first run is stored, then restored
+    assert _run(flow_dir, '--cache') == (1, 'OneCode 0.5')
+    assert _run(flow_dir, '--cache') == (1, 'OneCode 0.5')
+
+    with open(os.path.join(flow_dir, 'data', 'outputs', flow_id, 'MANIFEST.txt')) as f:
+        manifest = [json.loads(line) for line in f]
+    assert [m["key"] for m in manifest] == ['out']
+
+    # without cache, flow always runs
+    assert _run(flow_dir) == (2, 'OneCode 0.5')
+
+    # parameters change
+    with open(params_file, 'w') as f:
+        json.dump({"x": 0.8, "data": "data.txt"}, f)
+    assert _run(flow_dir, f'--cache "{params_file}"') == (3, 'OneCode 0.8')
+    assert _run(flow_dir, f'--cache "{params_file}"') == (3, 'OneCode 0.8')
+
+    # previous entry is still valid
+    assert _run(flow_dir, '--cache') == (3, 'OneCode 0.5')
+
+    # input file change
+    with open(data_file, 'w') as f:
+        f.write('OneCode!')
+    assert _run(flow_dir, '--cache') == (4, 'OneCode! 0.5')
+    assert _run(flow_dir, '--cache') == (4, 'OneCode! 0.5')
+
+    # source change
+    with open(flow_file, 'a') as f:
+        f.write('\n')
+    assert _run(flow_dir, '--cache') == (5, 'OneCode! 0.5')
+
+    # output overwritten in place invalidates the entry sharing its content
+    with open(os.path.join(flow_dir, 'data', 'outputs', 'out.txt'), 'w') as f:
+        f.write('Tampered')
+    assert _run(flow_dir, '--cache') == (6, 'OneCode! 0.5')
+    assert _run(flow_dir, '--cache') == (6, 'OneCode! 0.5')
+
+    shutil.rmtree(flow_dir)
@@ -177,3 +177,50 @@ def test_single_flow_execution_in_multi_flows_with_params():
         )
 
     shutil.rmtree(flow_dir)
+
+
+@pytest.mark.emulations
+def test_parallel_flows_execution():
+    flow_name, flow_folder, flow_id = _generate_flow_name()
+
+    tmp = _clean_flow(flow_folder)
+    flow_dir = os.path.join(tmp, flow_folder)
+
+    create(tmp, flow_name, cli=False)
+    add(os.path.join(tmp, flow_folder), 'New Flow', None, False)
+    add(os.path.join(tmp, flow_folder), 'Another Flow', None, False)
+
+    for flow in [flow_id, 'new_flow', 'another_flow']:
+        with open(os.path.join(flow_dir, 'flows', f'{flow}.py'), 'a') as f:
+            f.write(f"""
+    import time
+    start = time.time()
+    x = onecode.slider("{flow}_x", 0.5, min=0, max=1, step=0.1)
+    time.sleep(1)
+
+    with open("{flow}.txt", 'w') as f:
+        f.write(f"{{start}} {{time.time()}} {{sorted(onecode.Project().data)}}")
+""")
+
+    # another_flow depends on the two other flows
+    with open(os.path.join(flow_dir, Env.ONECODE_CONFIG_FILE)) as f:
+        workflows = json.load(f)
+
+    workflows[2]["attributes"]["depends_on"] = [flow_id, 'new_flow']
+    with open(os.path.join(flow_dir, Env.ONECODE_CONFIG_FILE), 'w') as f:
+        json.dump(workflows, f)
+
+    os.system(f'cd "{flow_dir}" && {Env.ONECODE_DO_TYPECHECK}=1 python main.py --jobs 2')
+
+    times = {}
+    for flow in [flow_id, 'new_flow', 'another_flow']:
+        with open(os.path.join(flow_dir, f'{flow}.txt')) as f:
+            start, end, data = f.read().split(' ', 2)
+            times[flow] = (float(start), float(end), data)
+
+    assert times[flow_id][0] < times['new_flow'][1]
+    assert times['new_flow'][0] < times[flow_id][1]
+    assert times['another_flow'][0] >= max(times[flow_id][1], times['new_flow'][1])
+    assert times['another_flow'][2] == str(sorted([f'{flow_id}_x', 'new_flow_x', 'another_flow_x']))
+
+    shutil.rmtree(flow_dir)
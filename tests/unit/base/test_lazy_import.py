@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import onecode
+
+_SCRIPT = """
+import json
+import sys
+
+import onecode
+
+loaded = lambda: sorted(m for m in ('pandas', 'numpy', 'typeguard', 'onecode.elements',
+                                    'onecode.utils') if m in sys.modules)
+result = {"base": loaded()}
+
+onecode.Project().reset()
+onecode.Logger.info('OneCode')
+result["project"] = loaded()
+
+onecode.FlowCache
+result["utils"] = loaded()
+
+onecode.slider
+result["elements"] = loaded()
+
+onecode.CsvReader
+result["csv_reader"] = loaded()
+
+print(json.dumps(result))
+"""
+
+
+def test_lazy_import():
+    result = subprocess.run(
+        [sys.executable, '-c', _SCRIPT],
+        env={**os.environ, "PYTHONPATH": os.path.dirname(os.path.dirname(onecode.__file__))},
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    assert json.loads(result.stdout.splitlines()[-1]) == {
+        "base": [],
+        "project": [],
+        "utils": ['onecode.utils'],
+        "elements": ['onecode.elements', 'onecode.utils'],
+        "csv_reader": ['numpy', 'onecode.elements', 'onecode.utils', 'pandas'],
+    }
+
+
+def test_lazy_attributes():
+    namespace = {}
+    exec('from onecode import *', namespace)
+
+    for name in ('Project', 'Mode', 'slider', 'Slider', 'file_output', 'FlowCache', 'cached'):
+        assert namespace[name] is getattr(onecode, name)
+
+    assert {'slider', 'FlowCache', 'Logger'} <= set(dir(onecode))
+    assert 'onecode.Slider' in onecode.Project().registered_elements
+
+    with pytest.raises(AttributeError) as excinfo:
+        onecode.not_an_attribute
+    assert str(excinfo.value) == "module 'onecode' has no attribute 'not_an_attribute'"
@@ -5,7 +5,7 @@ import sys
 
 import pytest
 
-from onecode import ConfigOption, Env, Mode, Project
+from onecode import ConfigOption, Env, Mode, Project, file_digest
 from tests.utils.flow_cli import _clean_flow, _generate_flow_name
 
 
@@ -31,6 +31,8 @@ def test_empty_project():
         ConfigOption.FLUSH_STDOUT: False,
         ConfigOption.LOGGER_COLOR: True,
         ConfigOption.LOGGER_TIMESTAMP: True,
+        ConfigOption.ENRICH_MANIFEST: False,
+        ConfigOption.FLOW_CACHE: False,
     }
     assert p.data_root == os.getcwd()
     assert p.get_input_path('test.txt') == os.path.join(os.getcwd(), 'test.txt')
@@ -71,6 +73,8 @@ def test_project_reset():
         ConfigOption.FLUSH_STDOUT: True,
         ConfigOption.LOGGER_COLOR: True,
         ConfigOption.LOGGER_TIMESTAMP: True,
+        ConfigOption.ENRICH_MANIFEST: False,
+        ConfigOption.FLOW_CACHE: False,
     }
     assert p.data_root == data_path
     assert p.get_input_path('test.txt') == os.path.join(data_path, 'test.txt')
@@ -97,7 +101,9 @@ def test_project_reset():
     assert p.config == {
         ConfigOption.FLUSH_STDOUT: False,
         ConfigOption.LOGGER_COLOR: True,
-        ConfigOption.LOGGER_TIMESTAMP: True
+        ConfigOption.LOGGER_TIMESTAMP: True,
+        ConfigOption.ENRICH_MANIFEST: False,
+        ConfigOption.FLOW_CACHE: False
     }
     assert p.data_root == os.getcwd()
     assert p.get_input_path('test.txt') == os.path.join(os.getcwd(), 'test.txt')
@@ -133,6 +139,58 @@ def test_output_manifest():
         pass
 
 
+def test_enrich_output_manifest():
+    _, folder, flow_id = _generate_flow_name()
+    tmp = _clean_flow(folder)
+    folder_path = os.path.join(tmp, folder)
+    data_path = os.path.join(folder_path, 'data')
+
+    os.makedirs(data_path)
+    os.environ[Env.ONECODE_PROJECT_DATA] = data_path
+
+    Project().reset()
+    p = Project()
+    p.current_flow = flow_id
+
+    # nothing to enrich yet
+    p.enrich_output_manifest()
+
+    files = []
+    for i in range(3):
+        files.append(p.get_output_path(os.path.join(flow_id, f'file{i}.txt')))
+        with open(files[-1], 'w') as f:
+            f.write(f'OneCode {i}')
+
+    outputs = [
+        {"key": "file0", "value": files[0], "kind": "FileOutput"},
+        {"key": "file1", "value": files[1], "kind": "FileOutput"},
+        {"key": "file0_again", "value": files[0], "kind": "FileOutput"},
+        {"key": "missing", "value": p.get_output_path('missing.txt'), "kind": "FileOutput"},
+        {"key": "other", "value": files[2], "kind": "OtherOutput"},
+    ]
+    for output in outputs:
+        p.write_output(output)
+
+    p.enrich_output_manifest(workers=2)
+
+    with open(p.get_output_manifest()) as f:
+        enriched = [json.loads(line) for line in f]
+
+    assert [e["key"] for e in enriched] == [o["key"] for o in outputs]
+    for entry in enriched[:3]:
+        assert entry["size"] == 9
+        assert entry["mtime"] == os.path.getmtime(entry["value"])
+        assert entry["hash"] == file_digest(entry["value"])
+
+    assert enriched[0]["hash"] == enriched[2]["hash"] != enriched[1]["hash"]
+    assert enriched[3:] == outputs[3:]
+
+    try:
+        shutil.rmtree(folder_path)
+    except Exception:
+        pass
+
+
 def test_set_mode():
     p = Project()
 
@@ -209,6 +267,8 @@ def test_config_option():
         ConfigOption.FLUSH_STDOUT: False,
         ConfigOption.LOGGER_COLOR: True,
         ConfigOption.LOGGER_TIMESTAMP: True,
+        ConfigOption.ENRICH_MANIFEST: False,
+        ConfigOption.FLOW_CACHE: False,
         'XX': 56.4
     }
 
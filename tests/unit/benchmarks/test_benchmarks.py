@@ -0,0 +1,76 @@
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+
+import benchmarks.run
+
+from benchmarks.generate import generate_project
+from benchmarks.run import BENCHMARKS, compare, run_benchmarks
+from onecode.cli.extract import extract_json
+
+
+def test_generate_project():
+    project_path = os.path.join(tempfile.gettempdir(), 'onecode_bench_generate')
+    generate_project(project_path, flows=2, elements=6, helpers=1, depth=2, csv_rows=10)
+
+    json_file = os.path.join(project_path, 'params.json')
+    extract_json(project_path, json_file)
+
+    with open(json_file) as f:
+        params = json.load(f)
+
+    assert sorted(params) == sorted([
+        'f0_csv', 'f0_e0', 'f0_e1', 'f0_e2',
+        'f1_csv', 'f1_e0', 'f1_e1', 'f1_e2',
+        'h0_e0', 'h0_e1', 'h0_e2',
+    ])
+
+    with open(os.path.join(project_path, 'data', 'input_0.csv')) as f:
+        assert len(f.readlines()) == 11
+
+    shutil.rmtree(project_path)
+
+
+def test_run_benchmarks(monkeypatch):
+    monkeypatch.setattr(benchmarks.run, "_REGISTERED_OUTPUTS", 10)
+    monkeypatch.setattr(benchmarks.run, "_BATCH_RUNS", 2)
+    monkeypatch.setattr(benchmarks.run, "_ELEMENT_CALLS", 10)
+    monkeypatch.setattr(benchmarks.run, "_COUNT_VALUES", 10)
+
+    project_path = os.path.join(tempfile.gettempdir(), 'onecode_bench_run')
+    generate_project(project_path, flows=2, elements=14, helpers=1, depth=2, csv_rows=10)
+
+    results = run_benchmarks(project_path, repeat=2)
+
+    assert list(results) == list(BENCHMARKS)
+    for r in results.values():
+        assert len(r["runs"]) == 2
+        assert r["min"] <= r["median"]
+
+    for flow in ('flow_0', 'flow_1'):
+        with open(os.path.join(project_path, 'data', 'outputs', flow, 'MANIFEST.txt')) as f:
+            assert len(f.readlines()) == 2
+
+    shutil.rmtree(project_path)
+
+
+def test_compare():
+    baseline = {
+        "version": 1,
+        "parameters": {"flows": 1},
+        "benchmarks": {"a": {"median": 1.}, "b": {"median": 1.}, "c": {"median": 1.}}
+    }
+    current = {
+        "version": 1,
+        "parameters": {"flows": 1},
+        "benchmarks": {"a": {"median": 1.1}, "b": {"median": 1.5}, "d": {"median": 1.}}
+    }
+
+    report = compare(current, baseline, tolerance=0.2)
+    assert [(r["name"], r["regression"]) for r in report] == [("a", False), ("b", True)]
+
+    with pytest.raises(ValueError):
+        compare({**current, "parameters": {"flows": 2}}, baseline)
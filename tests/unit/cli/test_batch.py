@@ -0,0 +1,105 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from onecode.cli.batch import SUMMARY_FILE, load_parameter_sets, run_batch
+from onecode.cli.create import create
+from tests.utils.flow_cli import _clean_flow, _generate_flow_name
+
+_FLOW = """import onecode
+
+
+def run():
+    x = onecode.slider('x', 0.5, min=0, max=1, step=0.1)
+    with open(onecode.file_input('data', 'data.txt')) as f:
+        data = f.read()
+
+    with open(onecode.file_output('out', 'out.txt'), 'w') as f:
+        f.write(f'{data} {x}')
+
+    print(f'x = {x}')
+"""
+
+
+def _create_project():
+    flow_name, folder, flow_id = _generate_flow_name()
+    tmp = _clean_flow(folder)
+    create(tmp, flow_name, cli=False)
+
+    folder_path = os.path.join(tmp, folder)
+    with open(os.path.join(folder_path, 'flows', f'{flow_id}.py'), 'w') as f:
+        f.write(_FLOW)
+
+    with open(os.path.join(folder_path, 'data', 'data.txt'), 'w') as f:
+        f.write('OneCode')
+
+    return folder_path, flow_id
+
+
+@pytest.mark.parametrize("jsonl", [False, True])
+def test_run_batch(jsonl):
+    folder_path, flow_id = _create_project()
+    data_path = os.path.join(folder_path, 'data')
+    output_path = os.path.join(folder_path, 'batch')
+
+    param_sets = [{"x": 0.2, "data": "data.txt"}, {"x": 2, "data": "data.txt"}, {"x": 0.7}]
+    if jsonl:
+        params_path = os.path.join(folder_path, 'params.jsonl')
+        with open(params_path, 'w') as f:
+            f.write('\n'.join(json.dumps(p) for p in param_sets) + '\n\n')
+        names = ['0', '1', '2']
+    else:
+        params_path = os.path.join(folder_path, 'params')
+        os.makedirs(params_path)
+        names = ['a', 'b', 'c']
+        for name, p in zip(names, param_sets):
+            with open(os.path.join(params_path, f'{name}.json'), 'w') as f:
+                json.dump(p, f)
+
+    summary = run_batch(folder_path, data_path, params_path, output_path, processes=2)
+
+    assert list(summary["run"]) == names
+    assert list(summary["status"]) == ['success', 'failed', 'success']
+    assert summary["error"][1].startswith('ValueError: [x]')
+    assert (summary["duration"] >= 0).all()
+    assert os.path.exists(os.path.join(output_path, SUMMARY_FILE))
+
+    for name, expected in [(names[0], 'OneCode 0.2'), (names[2], 'OneCode 0.7')]:
+        run_path = os.path.join(output_path, name)
+        with open(os.path.join(run_path, 'outputs', 'out.txt')) as f:
+            assert f.read() == expected
+
+        with open(os.path.join(run_path, 'outputs', flow_id, 'MANIFEST.txt')) as f:
+            assert json.loads(f.readline())["value"] == os.path.join(run_path, 'outputs', 'out.txt')
+
+        with open(os.path.join(run_path, 'run.log')) as f:
+            assert f'x = {expected.split()[1]}' in f.read()
+
+    with open(os.path.join(output_path, names[1], 'run.log')) as f:
+        assert 'Traceback' in f.read()
+
+    # outputs are not written to the data folder
+    assert not os.path.exists(os.path.join(data_path, 'outputs', 'out.txt'))
+
+    shutil.rmtree(folder_path)
+
+
+def test_load_parameter_sets_errors():
+    folder_path, _ = _create_project()
+
+    with pytest.raises(FileNotFoundError) as excinfo:
+        load_parameter_sets(os.path.join(folder_path, 'missing'))
+    assert str(excinfo.value) == f"Parameters path {os.path.join(folder_path, 'missing')} " \
+        "does not exist"
+
+    params_path = os.path.join(folder_path, 'params.jsonl')
+    with open(params_path, 'w') as f:
+        f.write('{"x": 1}\n[1, 2]\n')
+
+    with pytest.raises(ValueError) as excinfo:
+        load_parameter_sets(params_path)
+    assert str(excinfo.value) == "Parameter set 1 is not a JSON object"
+
+    shutil.rmtree(folder_path)
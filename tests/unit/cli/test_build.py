@@ -49,3 +49,26 @@ Processing Step3...
     assert gt_1 == app_ui or gt_2 == app_ui
 
     os.remove(json_file)
+
+
+@working_directory(__file__)
+def test_valid_build_compact():
+    tmp = tempfile.gettempdir()
+    json_file = os.path.join(tmp, 'valid_app_ui_compact.json')
+    extract_gui(os.path.join('..', '..', 'data', 'flow_1'), json_file, compact=True)
+
+    with open(os.path.join('..', '..', 'data', 'flow_1', 'ground_truth_app_ui_order1.json')) as f:
+        gt_1 = json.load(f)
+
+    with open(os.path.join('..', '..', 'data', 'flow_1', 'ground_truth_app_ui_order2.json')) as f:
+        gt_2 = json.load(f)
+
+    with open(json_file) as f:
+        content = f.read()
+
+    app_ui = json.loads(content)
+
+    assert '\n' not in content
+    assert gt_1 == app_ui or gt_2 == app_ui
+
+    os.remove(json_file)
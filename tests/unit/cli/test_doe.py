@@ -0,0 +1,122 @@
+import io
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from onecode.cli.batch import load_parameter_sets
+from onecode.cli.doe import generate_design, parameter_domains, write_design
+
+_SCHEMA = {
+    "x": {"key": "x", "kind": "Slider", "value": 0.5, "min": 0., "max": 1., "step": 0.1},
+    "n": {"key": "n", "kind": "NumberInput", "value": 2, "min": 1, "max": 4, "step": None},
+    "mode": {
+        "key": "mode",
+        "kind": "Dropdown",
+        "value": "a",
+        "options": ["a", "b", "c"],
+        "multiple": False,
+    },
+    "flag": {"key": "flag", "kind": "Checkbox", "value": True},
+    "free": {"key": "free", "kind": "NumberInput", "value": 1.5, "min": None, "max": None},
+    "dyn": {"key": "dyn", "kind": "Slider", "value": 1, "min": 0, "max": "$x$", "step": 1},
+    "many": {"key": "many", "kind": "Slider", "value": [1], "min": 0, "max": 5, "count": 1},
+    "name": {"key": "name", "kind": "TextInput", "value": "OneCode"},
+}
+
+
+def test_parameter_domains():
+    domains = parameter_domains(_SCHEMA)
+    assert [k for k, d in domains.items() if d is not None] == ['x', 'n', 'mode', 'flag']
+
+    domains = parameter_domains(_SCHEMA, ['mode'])
+    assert [k for k, d in domains.items() if d is not None] == ['mode']
+
+    with pytest.raises(ValueError) as excinfo:
+        parameter_domains(_SCHEMA, ['x', 'dyn', 'name', 'unknown'])
+    assert str(excinfo.value) == "Parameters cannot be swept: ['dyn', 'name', 'unknown']"
+
+
+def test_full_factorial():
+    design = list(generate_design(_SCHEMA, 'full', levels=3, chunk_size=7))
+
+    # 11 steps x 3 levels x 3 options x 2 booleans
+    assert len(design) == 11 * 3 * 3 * 2
+    assert design[0] == {
+        "x": 0.0, "n": 1, "mode": "a", "flag": False,
+        "free": 1.5, "dyn": 1, "many": [1], "name": "OneCode"
+    }
+    assert design[1]["flag"] is True
+    assert sorted({p["x"] for p in design}) == [round(0.1 * i, 1) for i in range(11)]
+    assert sorted({p["n"] for p in design}) == [1, 2, 4]
+    assert all(isinstance(p["n"], int) for p in design)
+    assert len({(p["x"], p["n"], p["mode"], p["flag"]) for p in design}) == len(design)
+
+    assert list(generate_design(_SCHEMA, 'full', keys=['flag'])) == [
+        {**{k: v["value"] for k, v in _SCHEMA.items()}, "flag": False},
+        {**{k: v["value"] for k, v in _SCHEMA.items()}, "flag": True},
+    ]
+
+
+@pytest.mark.parametrize("method", ['random', 'lhs'])
+def test_sampling(method):
+    design = list(generate_design(_SCHEMA, method, samples=100, seed=42, chunk_size=30))
+
+    assert len(design) == 100
+    assert design == list(generate_design(_SCHEMA, method, samples=100, seed=42))
+    assert design != list(generate_design(_SCHEMA, method, samples=100, seed=0))
+
+    x = np.array([p["x"] for p in design])
+    assert ((x >= 0) & (x <= 1)).all()
+    assert np.allclose(x * 10, np.round(x * 10))
+    assert {p["n"] for p in design} <= {1, 2, 3, 4}
+    assert {p["mode"] for p in design} == {"a", "b", "c"}
+    assert {p["flag"] for p in design} == {False, True}
+
+
+def test_latin_hypercube_strata():
+    schema = {
+        "u": {"key": "u", "kind": "NumberInput", "value": 0., "min": 0., "max": 1., "step": None}
+    }
+    u = np.array([p["u"] for p in generate_design(schema, 'lhs', samples=50, chunk_size=16)])
+
+    # each of the 50 strata is sampled exactly once
+    assert sorted(np.floor(u * 50).astype(int)) == list(range(50))
+
+
+def test_generate_design_errors():
+    with pytest.raises(ValueError) as excinfo:
+        generate_design(_SCHEMA, 'sobol')
+    assert str(excinfo.value) == "Invalid design method sobol, must be one of " \
+        "['full', 'random', 'lhs']"
+
+    with pytest.raises(ValueError) as excinfo:
+        generate_design(_SCHEMA, 'lhs')
+    assert str(excinfo.value) == "Number of samples is required for lhs designs"
+
+
+def test_write_design(tmp_path, monkeypatch):
+    schema_file = os.path.join(tmp_path, 'schema.json')
+    with open(schema_file, 'w') as f:
+        json.dump(_SCHEMA, f)
+
+    params_file = os.path.join(tmp_path, 'params.jsonl')
+    assert write_design(schema_file, params_file, 'random', samples=20, seed=1) == 20
+
+    param_sets = load_parameter_sets(params_file)
+    assert [name for name, _ in param_sets] == [f'{i:02d}' for i in range(20)]
+    assert [p for _, p in param_sets] == list(generate_design(_SCHEMA, 'random', 20, seed=1))
+
+    # streamed through standard output and input
+    with open(params_file, 'rb') as f:
+        expected = f.read()
+
+    stdout = io.TextIOWrapper(io.BytesIO())
+    monkeypatch.setattr(sys, 'stdout', stdout)
+    write_design(schema_file, '-', 'random', samples=20, seed=1)
+    assert stdout.buffer.getvalue() == expected
+
+    monkeypatch.setattr(sys, 'stdin', io.StringIO(expected.decode()))
+    assert [p for _, p in load_parameter_sets('-')] == [p for _, p in param_sets]
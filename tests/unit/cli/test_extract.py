@@ -113,3 +113,21 @@ Processing Step3...
 """ == captured.out
 
     os.remove(json_file)
+
+
+@working_directory(__file__)
+def test_valid_extract_all_compact():
+    tmp = tempfile.gettempdir()
+    json_file = os.path.join(tmp, 'valid_extraction_compact.json')
+    extract_json(os.path.join('..', '..', 'data', 'flow_1'), json_file, all=True, compact=True)
+
+    with open(os.path.join('..', '..', 'data', 'flow_1', 'ground_truth_all.json')) as f:
+        gt = json.load(f)
+
+    with open(json_file) as f:
+        content = f.read()
+
+    assert '\n' not in content
+    assert gt == json.loads(content)
+
+    os.remove(json_file)
@@ -0,0 +1,28 @@
+import os
+import shutil
+
+from onecode import ElementType, discover_elements, load_element_registry
+from onecode.cli.registry import write_element_registries
+
+
+def test_write_element_registries(tmp_path):
+    data_path = os.path.join(os.path.dirname(__file__), '..', '..', 'data')
+    ext_module = os.path.join(tmp_path, 'onecode_ext')
+    shutil.copytree(
+        os.path.join(data_path, 'flow_1', 'flows', 'onecode_ext'),
+        ext_module,
+        ignore=shutil.ignore_patterns('__pycache__')
+    )
+
+    registry_files = write_element_registries(str(tmp_path))
+    assert registry_files == [
+        os.path.join(ext_module, 'input_elements', '_elements.json'),
+        os.path.join(ext_module, 'output_elements', '_elements.json'),
+    ]
+
+    input_init = os.path.join(ext_module, 'input_elements', '__init__.py')
+    assert load_element_registry(input_init) == discover_elements(input_init, ElementType.INPUT)
+    assert [e["kind"] for e in load_element_registry(input_init)] == ['EmptyInput']
+
+    output_init = os.path.join(ext_module, 'output_elements', '__init__.py')
+    assert load_element_registry(output_init) == []
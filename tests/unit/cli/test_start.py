@@ -0,0 +1,101 @@
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import pytest
+
+import onecode
+from onecode.cli.create import create
+from onecode.cli.start import SOCKET_FILE, submit
+from tests.utils.flow_cli import _clean_flow, _generate_flow_name
+
+_FLOW = """import os
+
+import onecode
+
+print(f'imported in {os.getpid()}')
+
+
+def run():
+    x = onecode.slider('x', 0.5, min=0, max=1, step=0.1)
+    onecode.Logger.info(f'x = {x}')
+
+    with open(onecode.file_output('out', 'out.txt'), 'w') as f:
+        f.write(f'{x}')
+
+    print(f'run in {os.getpid()}')
+"""
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='fork() is not available')
+def test_serve():
+    flow_name, folder, flow_id = _generate_flow_name()
+    tmp = _clean_flow(folder)
+    create(tmp, flow_name, cli=False)
+
+    folder_path = os.path.join(tmp, folder)
+    with open(os.path.join(folder_path, 'flows', f'{flow_id}.py'), 'w') as f:
+        f.write(_FLOW)
+
+    params_file = os.path.join(folder_path, 'params.json')
+    with open(params_file, 'w') as f:
+        json.dump({"x": 0.2}, f)
+
+    socket_path = os.path.join(folder_path, SOCKET_FILE)
+    server = subprocess.Popen(
+        [sys.executable, '-c', f'from onecode.cli.start import serve; serve({folder_path!r}, '
+            f'{os.path.join(folder_path, "data")!r})'],
+        env={**os.environ, "PYTHONPATH": os.path.dirname(os.path.dirname(onecode.__file__))},
+        stdout=subprocess.PIPE,
+        text=True
+    )
+
+    try:
+        # flows are imported once by the server
+        assert server.stdout.readline().startswith('imported in')
+        assert server.stdout.readline().strip().endswith(f'served on {socket_path}')
+
+        stream = io.StringIO()
+        status = submit(params_file, socket_path=socket_path, stream=stream)
+        manifest = os.path.join(folder_path, 'data', 'outputs', flow_id, 'MANIFEST.txt')
+        assert status == {"status": "success", "manifest": manifest}
+
+        logs = stream.getvalue()
+        assert 'x = 0.2' in logs
+        assert 'imported in' not in logs
+        assert f'run in {server.pid}' not in logs
+        with open(os.path.join(folder_path, 'data', 'outputs', 'out.txt')) as f:
+            assert f.read() == '0.2'
+
+        # default values, outputs elsewhere
+        output_path = os.path.join(folder_path, 'other')
+        stream = io.StringIO()
+        status = submit(flow_name=flow_id, socket_path=socket_path, output_path=output_path,
+                        stream=stream)
+        assert status["manifest"] == os.path.join(output_path, flow_id, 'MANIFEST.txt')
+        assert 'x = 0.5' in stream.getvalue()
+
+        # errors are reported, the server keeps running
+        with open(params_file, 'w') as f:
+            json.dump({"x": 2}, f)
+
+        stream = io.StringIO()
+        status = submit(params_file, socket_path=socket_path, stream=stream)
+        assert status["status"] == 'failed'
+        assert status["error"].startswith('ValueError: [x]')
+        assert 'Traceback' in stream.getvalue()
+
+        assert submit(socket_path=socket_path, stream=io.StringIO())["status"] == 'success'
+
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    time.sleep(0.1)
+    assert not os.path.exists(socket_path)
+
+    shutil.rmtree(folder_path)
@@ -1,10 +1,13 @@
+import json
 import os
+import tempfile
 
 import pytest
 from datatest import working_directory
 
 from onecode import Project, register_ext_module
-from onecode.cli import process_call_graph
+from onecode.cli import dump_json, process_call_graph
+from onecode.cli import utils as cli_utils
 
 
 def test_invalid_call_graph():
@@ -22,3 +25,26 @@ def test_register_ext_module():
 
     Project().reset()
     assert 'onecode_ext.EmptyInput' not in Project().registered_elements
+
+
+@pytest.mark.parametrize("backend", ["default", "stdlib"])
+def test_dump_json_compact(monkeypatch, backend):
+    if backend == "stdlib":
+        monkeypatch.setattr(cli_utils, "orjson", None)
+
+    data = {"x": [1, 2.5, None, True], "y": {"z": "é"}}
+    json_file = os.path.join(tempfile.gettempdir(), f'dump_json_{backend}.json')
+
+    dump_json(data, json_file, compact=True)
+    with open(json_file, encoding='utf-8') as f:
+        compact = f.read()
+
+    dump_json(data, json_file)
+    with open(json_file, encoding='utf-8') as f:
+        indented = f.read()
+
+    assert ' ' not in compact
+    assert len(compact) < len(indented)
+    assert json.loads(compact) == json.loads(indented) == data
+
+    os.remove(json_file)
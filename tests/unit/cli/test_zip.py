@@ -1,11 +1,18 @@
+import io
+import json
 import os
 import shutil
+import tarfile
+import zipfile
+import zlib
 
+import pytest
 from datatest import working_directory
 
 from onecode import Env, FileOutput, Mode, Project
+from onecode.cli import zip as onecode_zip
 from onecode.cli.create import create
-from onecode.cli.zip import zip_output
+from onecode.cli.zip import split_output, tar_output, zip_output
 from tests.utils.flow_cli import _clean_flow, _generate_flow_name
 
 
@@ -64,3 +71,488 @@ Archiving test2: {test2} => {os.path.join('outputs', 'test2.txt')}
         shutil.rmtree(folder_path)
     except Exception:
         pass
+
+
+def test_crc32_combine():
+    a = b'OneCode' * 1000
+    b = bytes(range(256)) * 17
+
+    assert onecode_zip._crc32_combine(zlib.crc32(a), zlib.crc32(b), len(b)) == zlib.crc32(a + b)
+    assert onecode_zip._crc32_combine(zlib.crc32(a), zlib.crc32(b''), 0) == zlib.crc32(a)
+
+
+@pytest.mark.parametrize("compression_level", [0, 6])
+@working_directory(__file__)
+def test_zip_parallel(monkeypatch, compression_level):
+    # small chunks so that files are split across several workers
+    monkeypatch.setattr(onecode_zip, "_CHUNK_SIZE", 1000)
+
+    _, folder, flow_id = _generate_flow_name()
+    tmp = _clean_flow(folder)
+
+    folder_path = os.path.join(tmp, folder)
+    data_path = os.path.join(folder_path, 'data')
+
+    create(tmp, folder, cli=False)
+
+    os.environ[Env.ONECODE_PROJECT_DATA] = data_path
+    Project().reset()
+    Project().mode = Mode.EXECUTE
+    Project().current_flow = flow_id
+
+    contents = {
+        "empty": b'',
+        "small": b'Test1',
+        "chunk": b'x' * 1000,
+        "multi": (b'OneCode rocks! ' * 500) + os.urandom(2000),
+    }
+    for key, content in contents.items():
+        with open(FileOutput(key=key, value=f"{key}.bin")(), 'wb') as f:
+            f.write(content)
+
+    zip_file = os.path.join(folder_path, 'data.zip')
+    zip_output(
+        folder_path,
+        data_path,
+        zip_file,
+        compression_level=compression_level,
+        workers=3,
+        max_memory=2000
+    )
+
+    with zipfile.ZipFile(zip_file) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == [f'outputs/{key}.bin' for key in contents]
+
+        for key, content in contents.items():
+            assert zf.read(f'outputs/{key}.bin') == content
+
+    try:
+        shutil.rmtree(folder_path)
+    except Exception:
+        pass
+
+
+def test_select_compression(tmp_path):
+    text = tmp_path / 'file.dat'
+    text.write_bytes(b'OneCode rocks! ' * 10000)
+
+    noise = tmp_path / 'noise.dat'
+    noise.write_bytes(os.urandom(100000))
+
+    image = tmp_path / 'image.png'
+    image.write_bytes(b'OneCode rocks! ' * 10000)
+
+    parquet = tmp_path / 'table.parquet'
+    parquet.write_bytes(b'OneCode rocks! ' * 10000)
+
+    select = onecode_zip._select_compression
+    assert select(str(text), None, 6) == (zipfile.ZIP_DEFLATED, None)
+    assert select(str(text), None, 0) == (zipfile.ZIP_STORED, None)
+    assert select(str(noise), 'text/plain', 6) == (zipfile.ZIP_DEFLATED, None)
+    assert select(str(image), None, 6) == (zipfile.ZIP_STORED, 'mimetype image/png')
+    assert select(str(parquet), None, 6) == (zipfile.ZIP_STORED, 'extension .parquet')
+
+    compress_type, reason = select(str(noise), None, 6)
+    assert compress_type == zipfile.ZIP_STORED
+    assert reason.startswith('sampled compression ratio')
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@working_directory(__file__)
+def test_zip_store_incompressible(capsys, workers):
+    _, folder, flow_id = _generate_flow_name()
+    tmp = _clean_flow(folder)
+
+    folder_path = os.path.join(tmp, folder)
+    data_path = os.path.join(folder_path, 'data')
+
+    create(tmp, folder, cli=False)
+
+    os.environ[Env.ONECODE_PROJECT_DATA] = data_path
+    Project().reset()
+    Project().mode = Mode.EXECUTE
+    Project().current_flow = flow_id
+
+    noise = os.urandom(100000)
+    contents = {
+        "text.txt": b'OneCode rocks! ' * 10000,
+        "image.png": noise,
+        "noise.bin": noise,
+    }
+    for filename, content in contents.items():
+        with open(FileOutput(key=filename, value=filename)(), 'wb') as f:
+            f.write(content)
+
+    zip_file = os.path.join(folder_path, 'data.zip')
+    zip_output(folder_path, data_path, zip_file, 6, verbose=True, workers=workers)
+
+    with zipfile.ZipFile(zip_file) as zf:
+        assert zf.testzip() is None
+        assert [i.compress_type for i in zf.infolist()] == [
+            zipfile.ZIP_DEFLATED,
+            zipfile.ZIP_STORED,
+            zipfile.ZIP_STORED
+        ]
+
+        for filename, content in contents.items():
+            assert zf.read(f'outputs/{filename}') == content
+
+    logs = capsys.readouterr().out.strip().split('\n')
+    assert 'Storing image_png without compression: mimetype image/png' in logs
+    assert logs[-2].startswith('Storing noise_bin without compression: sampled compression ratio')
+    assert logs[-1].startswith('Stored 2 incompressible file(s) (200000 bytes) as-is')
+
+    zip_output(folder_path, data_path, zip_file, 6, compress_all=True)
+    with zipfile.ZipFile(zip_file) as zf:
+        assert all(i.compress_type == zipfile.ZIP_DEFLATED for i in zf.infolist())
+
+    try:
+        shutil.rmtree(folder_path)
+    except Exception:
+        pass
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@working_directory(__file__)
+def test_zip_incremental(capsys, workers):
+    _, folder, flow_id = _generate_flow_name()
+    tmp = _clean_flow(folder)
+
+    folder_path = os.path.join(tmp, folder)
+    data_path = os.path.join(folder_path, 'data')
+
+    create(tmp, folder, cli=False)
+
+    os.environ[Env.ONECODE_PROJECT_DATA] = data_path
+    Project().reset()
+    Project().mode = Mode.EXECUTE
+    Project().current_flow = flow_id
+
+    def _write_outputs(contents):
+        manifest = Project().get_output_manifest()
+        if os.path.exists(manifest):
+            os.remove(manifest)
+
+        for filename, content in contents.items():
+            output_file = FileOutput(key=filename, value=filename)()
+            if content is not None:
+                with open(output_file, 'wb') as f:
+                    f.write(content)
+
+    contents = {
+        "removed.txt": b'Removed' * 1000,
+        "same.txt": b'Same' * 1000,
+        "modified.txt": b'Modified' * 1000,
+        "touched.txt": b'Touched' * 1000,
+    }
+    _write_outputs(contents)
+
+    zip_file = os.path.join(folder_path, 'data.zip')
+    zip_output(folder_path, data_path, zip_file, 6)
+
+    with zipfile.ZipFile(zip_file) as zf:
+        same_crc = zf.getinfo('outputs/same.txt').CRC
+
+    # same size but different content and time
+    touched_file = Project().get_output_path('touched.txt')
+    with open(touched_file, 'wb') as f:
+        f.write(b'TOUCHED' * 1000)
+    st = os.stat(touched_file)
+    os.utime(touched_file, (st.st_atime, st.st_mtime + 10))
+
+    contents = {
+        "same.txt": None,
+        "modified.txt": b'Modified again' * 1000,
+        "touched.txt": None,
+        "added.txt": b'Added' * 1000,
+    }
+    _write_outputs(contents)
+    capsys.readouterr()
+
+    zip_output(
+        folder_path,
+        data_path,
+        zip_file,
+        6,
+        verbose=True,
+        workers=workers,
+        incremental=True,
+        check_crc=True
+    )
+
+    logs = capsys.readouterr().out
+    assert 'Removing outputs/removed.txt' in logs
+    assert 'Incremental update: 1 member(s) unchanged, 3 to write, 1 removed' in logs
+
+    with zipfile.ZipFile(zip_file) as zf:
+        assert zf.testzip() is None
+        assert sorted(zf.namelist()) == [
+            'outputs/added.txt',
+            'outputs/modified.txt',
+            'outputs/same.txt',
+            'outputs/touched.txt'
+        ]
+        assert zf.getinfo('outputs/same.txt').CRC == same_crc
+        assert zf.getinfo('outputs/same.txt').header_offset == 0
+
+        for filename in zf.namelist():
+            with open(os.path.join(data_path, filename), 'rb') as f:
+                assert zf.read(filename) == f.read()
+
+    # nothing changed: archive is left as-is
+    capsys.readouterr()
+    zip_output(folder_path, data_path, zip_file, 6, verbose=True, incremental=True)
+    assert 'Incremental update: 4 member(s) unchanged, 0 to write, 0 removed' in \
+        capsys.readouterr().out
+
+    with zipfile.ZipFile(zip_file) as zf:
+        assert zf.testzip() is None
+        assert len(zf.namelist()) == 4
+
+    try:
+        shutil.rmtree(folder_path)
+    except Exception:
+        pass
+
+
+@pytest.mark.parametrize("compression,workers", [
+    (None, 1),
+    ('gz', 1),
+    ('gz', 3),
+    ('zst', 1),
+    ('zst', 2),
+])
+@working_directory(__file__)
+def test_tar(monkeypatch, compression, workers):
+    if compression == 'zst':
+        zstandard = pytest.importorskip('zstandard')
+
+    # small chunks so that the stream is split across several workers
+    monkeypatch.setattr(onecode_zip, "_CHUNK_SIZE", 1000)
+
+    _, folder, flow_id = _generate_flow_name()
+    tmp = _clean_flow(folder)
+
+    folder_path = os.path.join(tmp, folder)
+    data_path = os.path.join(folder_path, 'data')
+
+    create(tmp, folder, cli=False)
+
+    os.environ[Env.ONECODE_PROJECT_DATA] = data_path
+    Project().reset()
+    Project().mode = Mode.EXECUTE
+    Project().current_flow = flow_id
+
+    contents = {
+        "small": b'Test1',
+        "multi": (b'OneCode rocks! ' * 500) + os.urandom(2000),
+    }
+    for key, content in contents.items():
+        with open(FileOutput(key=key, value=f"{key}.bin")(), 'wb') as f:
+            f.write(content)
+
+    tar_file = os.path.join(folder_path, 'data.tar')
+    tar_output(
+        folder_path,
+        data_path,
+        tar_file,
+        6,
+        compression=compression,
+        workers=workers,
+        max_memory=2000
+    )
+
+    if compression == 'zst':
+        with open(tar_file, 'rb') as f:
+            tar = tarfile.open(fileobj=zstandard.ZstdDecompressor().stream_reader(f), mode='r|')
+            members = {m.name: tar.extractfile(m).read() for m in tar}
+    else:
+        with tarfile.open(tar_file, 'r') as tar:
+            members = {m.name: tar.extractfile(m).read() for m in tar}
+
+    assert members == {f'outputs/{key}.bin': content for key, content in contents.items()}
+
+    try:
+        shutil.rmtree(folder_path)
+    except Exception:
+        pass
+
+
+@working_directory(__file__)
+def test_tar_stdout(capsysbinary):
+    _, folder, flow_id = _generate_flow_name()
+    tmp = _clean_flow(folder)
+
+    folder_path = os.path.join(tmp, folder)
+    data_path = os.path.join(folder_path, 'data')
+
+    create(tmp, folder, cli=False)
+
+    os.environ[Env.ONECODE_PROJECT_DATA] = data_path
+    Project().reset()
+    Project().mode = Mode.EXECUTE
+    Project().current_flow = flow_id
+
+    with open(FileOutput(key="test1", value="test1.txt")(), 'w') as f:
+        f.write('Test1')
+
+    capsysbinary.readouterr()
+    tar_output(folder_path, data_path, '-', 6, compression='gz', verbose=True)
+
+    captured = capsysbinary.readouterr()
+    assert b'Archiving test1' in captured.err
+
+    with tarfile.open(fileobj=io.BytesIO(captured.out), mode='r:gz') as tar:
+        assert tar.extractfile('outputs/test1.txt').read() == b'Test1'
+
+    with pytest.raises(ValueError):
+        tar_output(folder_path, data_path, '-', 6, compression='bz2')
+
+    try:
+        shutil.rmtree(folder_path)
+    except Exception:
+        pass
+
+
+@pytest.mark.parametrize("archive_format", ['zip', 'tar.gz'])
+@working_directory(__file__)
+def test_deduplicate(capsys, archive_format):
+    _, folder, flow_id = _generate_flow_name()
+    tmp = _clean_flow(folder)
+
+    folder_path = os.path.join(tmp, folder)
+    data_path = os.path.join(folder_path, 'data')
+
+    create(tmp, folder, cli=False)
+
+    os.environ[Env.ONECODE_PROJECT_DATA] = data_path
+    Project().reset()
+    Project().mode = Mode.EXECUTE
+    Project().current_flow = flow_id
+
+    table = b'OneCode rocks! ' * 1000
+    contents = {
+        "table1.csv": table,
+        "other.csv": b'x' * len(table),
+        "table2.csv": table,
+        "table3.csv": table,
+        "small.csv": b'small',
+    }
+    for filename, content in contents.items():
+        with open(FileOutput(key=filename, value=filename)(), 'wb') as f:
+            f.write(content)
+
+    capsys.readouterr()
+    archive = os.path.join(folder_path, f'data.{archive_format}')
+    if archive_format == 'zip':
+        zip_output(folder_path, data_path, archive, 6, workers=2, deduplicate=True)
+    else:
+        tar_output(folder_path, data_path, archive, 6, 'gz', workers=2, deduplicate=True)
+
+    assert f'Deduplicated 2 file(s): {2 * len(table)} bytes not archived again' in \
+        capsys.readouterr().out
+
+    duplicates = {
+        'outputs/table2.csv': 'outputs/table1.csv',
+        'outputs/table3.csv': 'outputs/table1.csv',
+    }
+
+    if archive_format == 'zip':
+        with zipfile.ZipFile(archive) as zf:
+            assert zf.namelist() == [
+                'outputs/table1.csv',
+                'outputs/other.csv',
+                'outputs/small.csv',
+                onecode_zip.DUPLICATES_INDEX
+            ]
+            assert json.loads(zf.read(onecode_zip.DUPLICATES_INDEX)) == duplicates
+
+    else:
+        with tarfile.open(archive, 'r') as tar:
+            assert [m.name for m in tar if m.islnk()] == list(duplicates)
+            for filename, content in contents.items():
+                assert tar.extractfile(f'outputs/{filename}').read() == content
+
+    try:
+        shutil.rmtree(folder_path)
+    except Exception:
+        pass
+
+
+@pytest.mark.parametrize("archive_format,per_flow,max_volume_size,processes,volumes", [
+    ('zip', True, None, 1, ['flow_1', 'flow_2']),
+    ('zip', False, 7000, 2, ['001', '002']),
+    ('tar.gz', True, 7000, 2, ['flow_1.001', 'flow_1.002', 'flow_2.001']),
+])
+@working_directory(__file__)
+def test_split(archive_format, per_flow, max_volume_size, processes, volumes):
+    _, folder, _ = _generate_flow_name()
+    tmp = _clean_flow(folder)
+
+    folder_path = os.path.join(tmp, folder)
+    data_path = os.path.join(folder_path, 'data')
+
+    create(tmp, folder, cli=False)
+    with open(os.path.join(folder_path, Env.ONECODE_CONFIG_FILE), 'w') as f:
+        json.dump([
+            {"file": "flow_1", "label": "Flow 1", "attributes": {}},
+            {"file": "flow_2", "label": "Flow 2", "attributes": {}},
+        ], f)
+
+    os.environ[Env.ONECODE_PROJECT_DATA] = data_path
+    Project().reset()
+    Project().mode = Mode.EXECUTE
+
+    contents = {
+        "flow_1": {"a": os.urandom(2000), "b": os.urandom(2000), "c": os.urandom(2000)},
+        "flow_2": {"d": os.urandom(2000)},
+    }
+    for flow, outputs in contents.items():
+        Project().current_flow = flow
+        for key, content in outputs.items():
+            with open(FileOutput(key=key, value=f"{flow}/{key}.bin")(), 'wb') as f:
+                f.write(content)
+
+    to_file = os.path.join(folder_path, f'data.{archive_format}')
+    paths = split_output(
+        folder_path,
+        data_path,
+        to_file,
+        6,
+        archive_format,
+        per_flow=per_flow,
+        max_volume_size=max_volume_size,
+        processes=processes
+    )
+
+    volume_names = [f'data.{v}.{archive_format}' for v in volumes]
+    assert paths == [os.path.join(folder_path, v) for v in volume_names]
+    assert all(os.path.getsize(path) <= (max_volume_size or 1e9) for path in paths)
+
+    with open(os.path.join(folder_path, 'data.index.json')) as f:
+        index = json.load(f)
+
+    assert index["volumes"] == volume_names
+    assert [(o["flow"], o["key"]) for o in index["outputs"]] == [
+        (flow, key) for flow, outputs in contents.items() for key in outputs
+    ]
+
+    for entry in index["outputs"]:
+        volume = os.path.join(folder_path, entry["volume"])
+        if archive_format == 'zip':
+            with zipfile.ZipFile(volume) as zf:
+                content = zf.read(entry["path"])
+        else:
+            with tarfile.open(volume) as tar:
+                content = tar.extractfile(entry["path"]).read()
+
+        assert content == contents[entry["flow"]][entry["key"]]
+
+    with pytest.raises(ValueError):
+        split_output(folder_path, data_path, to_file, 6, archive_format)
+
+    try:
+        shutil.rmtree(folder_path)
+    except Exception:
+        pass
@@ -3,7 +3,7 @@ from typing import Any
 
 import pytest
 
-from onecode import InputElement, Project
+from onecode import InputElement, Mode, Project
 from tests.utils.format import strip
 
 
@@ -117,6 +117,30 @@ def test_extend_input_element_invalid_extra_args():
         ['disabled', '__eq__', '_value', 'kind']""") == str(excinfo.value)
 
 
+def test_extend_input_element_reserved_names(my_input_element):
+    class _MyChildElement(my_input_element):
+        threshold = 0.5
+
+        def child_method(self):
+            pass
+
+    # reserved names are computed once per class, from its own members too
+    assert {'_value', 'kind', 'extra'} & my_input_element._reserved_names == {'_value', 'kind'}
+    assert {'threshold', 'child_method'} <= _MyChildElement._reserved_names
+    assert 'threshold' not in my_input_element._reserved_names
+
+    with pytest.raises(AttributeError) as excinfo:
+        InputElement.__init__(_MyChildElement('test', 'x', None, 5), 'test', 'x', threshold=1)
+
+    assert "The following parameters are reserved: ['threshold']" == str(excinfo.value)
+
+    x = my_input_element('my test', 'test_value', None, 5)
+    y = my_input_element('my test', 'other_value', None, 6)
+    assert x.key == y.key == 'my_test'
+    assert (x.extra, y.extra) == (5, 6)
+    assert x._extra_args == {"extra": 5}
+
+
 def test_extend_invalid_key_input_element(my_input_element):
     with pytest.raises(ValueError) as excinfo:
         my_input_element(' ', 'test_value', None, 5)
@@ -137,3 +161,40 @@ def test_extend_invalid_call_method(my_input_element):
         x()
 
     assert "Unknown Project mode Fake" == str(excinfo.value)
+
+
+def test_extend_custom_mode(my_input_element):
+    class _MyModeElement(my_input_element):
+        def _my_mode(self):
+            return f'my mode {self.key}'
+
+        @staticmethod
+        def _my_static_mode():
+            return 'my static mode'
+
+    x = _MyModeElement('test', 'test_value', None, 5)
+
+    Project().mode = '_my_mode'
+    assert x() == 'my mode test'
+    assert '_my_mode' not in my_input_element._mode_handlers
+
+    Project().mode = '_my_static_mode'
+    assert x() == 'my static mode'
+
+    # patching classes updates the dispatch tables of their subclasses
+    Project().mode = Mode.CONSOLE
+    my_input_element._console = lambda self: 'patched'
+    assert x() == 'patched'
+
+    my_input_element._my_other_mode = lambda self: 'other mode'
+    assert '_my_other_mode' in _MyModeElement._reserved_names
+
+    Project().mode = '_my_other_mode'
+    assert x() == 'other mode'
+
+    del _MyModeElement._my_mode
+    Project().mode = '_my_mode'
+    with pytest.raises(ValueError) as excinfo:
+        x()
+
+    assert "Unknown Project mode _my_mode" == str(excinfo.value)
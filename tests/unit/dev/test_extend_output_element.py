@@ -124,3 +124,27 @@ def test_extend_invalid_call_method(my_output_element):
         x()
 
     assert "Unknown Project mode Fake" == str(excinfo.value)
+
+
+def test_extend_output_custom_mode(my_output_element):
+    class _MyModeElement(my_output_element):
+        def _my_mode(self):
+            return f'my mode {self.key}'
+
+        @staticmethod
+        def _my_static_mode():
+            return 'my static mode'
+
+    x = _MyModeElement('test', 'test_value', None, 5)
+
+    Project().mode = '_my_mode'
+    assert x() == 'my mode test'
+
+    # element classes only dispatch to static modes
+    Project().mode = '_my_static_mode'
+    assert x() == 'my static mode'
+    assert _MyModeElement.static_call(_MyModeElement) == 'my static mode'
+
+    _MyModeElement._my_mode = lambda self: 'patched'
+    Project().mode = '_my_mode'
+    assert x() == 'patched'
@@ -2,7 +2,9 @@ import json
 import os
 import shutil
 
-from onecode import Env, FileOutput, Mode, Project
+import pytest
+
+from onecode import Env, FileOutput, Mode, Project, file_outputs, file_stats
 from tests.utils.flow_cli import _clean_flow, _generate_flow_name
 
 
@@ -148,3 +150,155 @@ def test_extract_all_file_output():
     )
 
     assert widget() is None
+
+
+@pytest.mark.parametrize("mode,buffering,content", [
+    ('w', -1, 'Hello OneCode!\n' * 1000),
+    ('xb', -1, b'\x00\x01OneCode' * 1000),
+    ('wb', 0, b'\x00\x01OneCode' * 1000),
+])
+def test_execute_file_output_open(mode, buffering, content):
+    _, folder, flow_id = _generate_flow_name()
+    tmp = _clean_flow(folder)
+    folder_path = os.path.join(tmp, folder)
+    data_path = os.path.join(folder_path, 'data')
+    os.makedirs(data_path)
+    os.environ[Env.ONECODE_PROJECT_DATA] = data_path
+    Project().reset()
+    Project().mode = Mode.EXECUTE
+    Project().current_flow = flow_id
+
+    widget = FileOutput(
+        key="FileOutput",
+        value="test/my_file.txt",
+        tags=["Core"],
+        make_path=True
+    )
+
+    manifest = os.path.join(data_path, 'outputs', flow_id, 'MANIFEST.txt')
+    with widget.open(mode, buffering=buffering, newline='' if 'b' not in mode else None) as f:
+        f.write(content[:100])
+        f.write(content[100:])
+
+        # manifest entry is written on close only
+        assert not os.path.exists(manifest)
+
+    output_file = os.path.join(data_path, 'outputs', 'test', 'my_file.txt')
+    with open(manifest, 'r') as f:
+        assert json.loads(f.read()) == {
+            "key": "fileoutput",
+            "label": "FileOutput",
+            "value": output_file,
+            "tags": ["Core"],
+            "mimetype": 'text/plain',
+            "kind": "FileOutput",
+            **file_stats(output_file)
+        }
+
+    with pytest.raises(FileExistsError):
+        widget.open('x')
+
+    for invalid_mode in ['r', 'a', 'w+', 'wbt', 'wx']:
+        with pytest.raises(ValueError) as excinfo:
+            widget.open(invalid_mode)
+
+        assert f'[fileoutput] Invalid mode for writing output file: {invalid_mode}' == \
+            str(excinfo.value)
+
+    with pytest.raises(ValueError) as excinfo:
+        widget.open('w', buffering=0)
+
+    assert '[fileoutput] Unbuffered output file must be binary' == str(excinfo.value)
+
+    try:
+        shutil.rmtree(folder_path)
+    except Exception:
+        pass
+
+
+def test_console_file_output_open(tmp_path):
+    Project().mode = Mode.CONSOLE
+
+    widget = FileOutput(
+        key="FileOutput",
+        value=str(tmp_path / "my_file.txt")
+    )
+
+    with widget.open() as f:
+        f.write('Hello OneCode!')
+
+    # no manifest outside of execution modes
+    assert os.listdir(tmp_path) == ['my_file.txt']
+
+
+@pytest.mark.parametrize("mode", [Mode.EXECUTE, Mode.LOAD_THEN_EXECUTE])
+def test_execute_file_outputs(mode):
+    _, folder, flow_id = _generate_flow_name()
+    tmp = _clean_flow(folder)
+    folder_path = os.path.join(tmp, folder)
+    data_path = os.path.join(folder_path, 'data')
+    os.makedirs(data_path)
+    os.environ[Env.ONECODE_PROJECT_DATA] = data_path
+    Project().reset()
+    Project().mode = mode
+    Project().current_flow = flow_id
+
+    entries = [
+        {"key": "Tile 1", "value": "tiles/tile_1.png", "tags": ["Tile"], "zoom": 1},
+        {"key": "tile_2", "value": "tiles/tile_2.tar.gz", "label": "Tile 2"},
+        {"key": "readme", "value": "other/README", "make_path": False},
+    ]
+    paths = file_outputs(entries, make_path=True)
+
+    assert paths == [
+        os.path.join(data_path, 'outputs', 'tiles', 'tile_1.png'),
+        os.path.join(data_path, 'outputs', 'tiles', 'tile_2.tar.gz'),
+        os.path.join(data_path, 'outputs', 'other', 'README'),
+    ]
+    assert os.path.isdir(os.path.join(data_path, 'outputs', 'tiles'))
+    assert not os.path.exists(os.path.join(data_path, 'outputs', 'other'))
+
+    with open(os.path.join(data_path, 'outputs', flow_id, 'MANIFEST.txt'), 'r') as f:
+        batched = [json.loads(line) for line in f]
+
+    # same manifest as file_output() called for each entry
+    os.remove(os.path.join(data_path, 'outputs', flow_id, 'MANIFEST.txt'))
+    for entry in entries:
+        FileOutput(**entry)()
+
+    with open(os.path.join(data_path, 'outputs', flow_id, 'MANIFEST.txt'), 'r') as f:
+        assert batched == [json.loads(line) for line in f]
+
+    try:
+        shutil.rmtree(folder_path)
+    except Exception:
+        pass
+
+
+def test_file_outputs_errors():
+    Project().mode = Mode.EXECUTE
+    Project().current_flow = 'test'
+
+    with pytest.raises(ValueError) as excinfo:
+        file_outputs([{"key": "ok", "value": "ok.txt"}, {"key": " ", "value": "x.txt"}])
+
+    assert 'Key cannot be null' == str(excinfo.value)
+
+    with pytest.raises(ValueError) as excinfo:
+        file_outputs([{"key": "_x", "value": "x.txt"}])
+
+    assert 'Key starting with "_" are reserved: _x' == str(excinfo.value)
+
+    with pytest.raises(AttributeError) as excinfo:
+        file_outputs([{"key": "x", "value": "x.txt", "kind": "Other", "_value": 1}])
+
+    assert "The following parameters are reserved: ['kind', '_value']" == str(excinfo.value)
+
+
+def test_console_file_outputs():
+    Project().mode = Mode.CONSOLE
+
+    widgets = file_outputs([{"key": "x", "value": "x.txt"}, {"key": "y", "value": "y.png"}])
+
+    assert [type(w) for w in widgets] == [FileOutput, FileOutput]
+    assert [w.mimetype for w in widgets] == ['text/plain', 'image/png']
@@ -0,0 +1,99 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+from onecode import (
+    ElementType,
+    Project,
+    detached_element_plugins,
+    element_plugins,
+    register_element_plugin,
+    register_element_plugins
+)
+from onecode.cli.registry import write_element_registries
+
+_EXT_MODULE = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'data', 'flow_1', 'flows', 'onecode_ext'
+)
+
+
+@pytest.fixture
+def plugin_path(tmp_path, monkeypatch):
+    shutil.copytree(
+        _EXT_MODULE,
+        os.path.join(tmp_path, 'acme_elements'),
+        ignore=shutil.ignore_patterns('__pycache__')
+    )
+
+    dist_info = os.path.join(tmp_path, 'acme_elements-1.0.dist-info')
+    os.makedirs(dist_info)
+    with open(os.path.join(dist_info, 'METADATA'), 'w') as f:
+        f.write('Metadata-Version: 2.1\nName: acme-elements\nVersion: 1.0\n')
+    with open(os.path.join(dist_info, 'entry_points.txt'), 'w') as f:
+        f.write('[onecode.elements]\nacme = acme_elements\nmissing = missing_elements\n')
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield str(tmp_path)
+
+    for module in [m for m in sys.modules if m.split('.')[0] == 'acme_elements']:
+        del sys.modules[module]
+
+
+def test_element_plugins(plugin_path):
+    plugins = element_plugins()
+
+    assert plugins["acme"] == 'acme_elements'
+    assert plugins["missing"] == 'missing_elements'
+
+
+def test_register_element_plugins_lazily(plugin_path, capsys):
+    write_element_registries(plugin_path)
+
+    modules = register_element_plugins()
+    assert 'missing_elements' not in modules
+    assert 'Ignoring elements plugin missing' in capsys.readouterr().out
+
+    # elements registered, package not imported yet
+    assert 'acme_elements.EmptyInput' in Project().registered_elements
+    assert 'acme_elements.input_elements' not in sys.modules
+
+    package = modules['acme_elements']
+    assert package.empty_input_type == ElementType.INPUT
+    assert 'acme_elements.input_elements' in sys.modules
+    assert package.EmptyInput.__name__ == 'EmptyInput'
+
+    # already imported
+    assert register_element_plugin('acme_elements') is package
+
+
+def test_detached_element_plugins(plugin_path):
+    write_element_registries(plugin_path)
+    package = register_element_plugin('acme_elements')
+
+    with detached_element_plugins():
+        assert 'acme_elements' not in sys.modules
+
+    assert sys.modules['acme_elements'] is package
+    assert 'acme_elements.input_elements' not in sys.modules
+
+    # loaded plugins are left untouched
+    package.empty_input
+    with detached_element_plugins():
+        assert sys.modules['acme_elements'] is package
+
+
+def test_register_element_plugin_without_registry(plugin_path):
+    register_element_plugin('acme_elements')
+
+    # stale registries: the package is imported to register its elements
+    assert 'acme_elements.input_elements' in sys.modules
+    assert 'acme_elements.EmptyInput' in Project().registered_elements
+
+
+def test_register_missing_element_plugin():
+    with pytest.raises(ModuleNotFoundError) as excinfo:
+        register_element_plugin('missing_elements')
+
+    assert str(excinfo.value) == "No module named 'missing_elements'"
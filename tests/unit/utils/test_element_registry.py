@@ -0,0 +1,118 @@
+import importlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+import onecode
+from onecode import (
+    ElementType,
+    Project,
+    discover_elements,
+    get_element_class,
+    load_element_registry,
+    write_element_registry
+)
+from onecode.cli.registry import write_element_registries
+from onecode.utils.element_registry import ELEMENT_REGISTRY_FILE
+
+_EMPTY_INPUT = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'data', 'flow_1', 'flows', 'onecode_ext',
+    'input_elements', 'empty_input.py'
+)
+
+
+def _make_package(name):
+    root = tempfile.mkdtemp()
+    package_dir = os.path.join(root, name)
+    os.makedirs(package_dir)
+
+    with open(os.path.join(package_dir, '__init__.py'), 'w') as f:
+        f.write('from onecode import import_input\n\nimport_input(__file__, __name__)\n')
+    shutil.copy(_EMPTY_INPUT, package_dir)
+
+    return root, package_dir
+
+
+@pytest.mark.parametrize("element_type", [ElementType.INPUT, ElementType.OUTPUT])
+def test_onecode_registries_up_to_date(element_type):
+    init_file = os.path.join(
+        os.path.dirname(onecode.__file__), 'elements', str(element_type).lower(), '__init__.py'
+    )
+
+    # run `onecode-registry onecode/elements` if this fails
+    assert load_element_registry(init_file) == discover_elements(init_file, element_type)
+
+
+def test_element_registry():
+    root, package_dir = _make_package('registry_elements')
+    init_file = os.path.join(package_dir, '__init__.py')
+
+    assert load_element_registry(init_file) is None
+    assert discover_elements(init_file, ElementType.INPUT) == [{
+        "function": "empty_input",
+        "kind": "EmptyInput",
+        "module": "empty_input",
+        "type": "INPUT",
+    }]
+
+    assert write_element_registries(root) == [os.path.join(package_dir, ELEMENT_REGISTRY_FILE)]
+    assert load_element_registry(init_file) == discover_elements(init_file, ElementType.INPUT)
+
+    # stale registry: a new element module is not listed
+    shutil.copy(_EMPTY_INPUT, os.path.join(package_dir, 'other_input.py'))
+    assert load_element_registry(init_file) is None
+
+    write_element_registry(init_file, ElementType.INPUT)
+    assert len(load_element_registry(init_file)) == 2
+
+    # registry from another version is ignored
+    registry_file = os.path.join(package_dir, ELEMENT_REGISTRY_FILE)
+    with open(registry_file) as f:
+        registry = json.load(f)
+    with open(registry_file, 'w') as f:
+        json.dump({**registry, "version": 0}, f)
+    assert load_element_registry(init_file) is None
+
+    with open(registry_file, 'w') as f:
+        f.write('{')
+    assert load_element_registry(init_file) is None
+
+    shutil.rmtree(root)
+
+
+def test_lazy_element_classes():
+    root, package_dir = _make_package('lazy_elements')
+    write_element_registry(os.path.join(package_dir, '__init__.py'), ElementType.INPUT)
+
+    sys.path.insert(0, root)
+    try:
+        package = importlib.import_module('lazy_elements')
+
+        assert 'lazy_elements.EmptyInput' in Project().registered_elements
+        assert package.empty_input_type == ElementType.INPUT
+        assert 'lazy_elements.empty_input' not in sys.modules
+
+        assert package.empty_input('x') is None
+        assert 'lazy_elements.empty_input' in sys.modules
+        assert callable(package.empty_input)
+
+        assert package.EmptyInput is get_element_class('lazy_elements', 'EmptyInput')
+        assert package.EmptyInput.__module__ == 'lazy_elements.empty_input'
+
+        with pytest.raises(AttributeError) as excinfo:
+            package.NotAnElement
+        assert str(excinfo.value) == "module 'lazy_elements' has no attribute 'NotAnElement'"
+
+    finally:
+        sys.path.remove(root)
+        shutil.rmtree(root)
+
+
+def test_lazy_onecode_element_classes():
+    assert onecode.elements.Slider is sys.modules['onecode.elements.input.slider'].Slider
+    assert onecode.Slider is onecode.elements.Slider
+    assert callable(onecode.elements.input.slider)
@@ -0,0 +1,104 @@
+import logging
+import time
+
+import pytest
+
+from onecode import Logger, Mode, Project, flow_dependencies, run_flows, sort_flows
+
+
+def _flow(flow_id, depends_on=None, sleep=0):
+    attributes = {"sleep": sleep}
+    if depends_on is not None:
+        attributes["depends_on"] = depends_on
+
+    return {"file": flow_id, "label": flow_id, "attributes": attributes}
+
+
+def _run_flow(wfl):
+    Project().current_flow = wfl['file']
+    Logger.info(f"Running {wfl['file']}")
+
+    start = time.time()
+    time.sleep(wfl['attributes']['sleep'])
+    Project().add_data(wfl['file'], True)
+
+    return wfl['file'], start, time.time(), sorted(Project().data.keys())
+
+
+class _RecordsHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_flow_dependencies():
+    workflows = [_flow('c', ['b']), _flow('a'), _flow('b', 'a'), _flow('d')]
+
+    assert flow_dependencies(workflows) == {"c": ['b'], "a": [], "b": ['a'], "d": []}
+    assert [w['file'] for w in sort_flows(workflows)] == ['a', 'b', 'c', 'd']
+    assert [w['file'] for w in sort_flows([_flow('b'), _flow('a')])] == ['b', 'a']
+
+    with pytest.raises(ValueError) as excinfo:
+        flow_dependencies([_flow('a', ['x', 'b']), _flow('b')])
+    assert str(excinfo.value) == "Flow a depends on unknown flow(s): ['x']"
+
+    with pytest.raises(ValueError) as excinfo:
+        flow_dependencies([_flow('a', ['c']), _flow('b', ['a']), _flow('c', ['b']), _flow('d')])
+    assert str(excinfo.value) == "Circular dependencies between flows: ['a', 'b', 'c']"
+
+
+def test_run_flows_sequential():
+    Project().reset()
+    Project().mode = Mode.EXECUTE
+
+    results = run_flows([_flow('b', ['a']), _flow('a'), _flow('c')], _run_flow)
+    assert [r[0] for r in results] == ['a', 'b', 'c']
+    assert results[-1][3] == ['a', 'b', 'c']
+
+    assert run_flows([_flow('b', ['a']), _flow('a')], _run_flow, flow_name='b')[0][0] == 'b'
+
+
+def test_run_flows_parallel():
+    Project().reset()
+    Project().mode = Mode.LOAD_THEN_EXECUTE
+    Project().data = {"param": 1}
+    handler = _RecordsHandler()
+
+    results = run_flows(
+        [_flow('b', ['a'], 0.1), _flow('a', sleep=0.5), _flow('c', sleep=0.5)],
+        _run_flow,
+        jobs=3,
+        logger=handler
+    )
+    results = {r[0]: r[1:] for r in results}
+
+    # independent flows overlap, dependent flows wait
+    assert results['c'][0] < results['a'][1]
+    assert results['b'][0] >= results['a'][1]
+
+    # data from completed flows is passed on
+    assert results['a'][2] == ['a', 'param']
+    assert results['b'][2][:2] == ['a', 'b']
+    assert sorted(Project().data.keys()) == ['a', 'b', 'c', 'param']
+
+    # logs are forwarded, tagged with their flow
+    assert sorted((r.flow, r.getMessage()) for r in handler.records) == [
+        ('a', 'Running a'),
+        ('b', 'Running b'),
+        ('c', 'Running c'),
+    ]
+
+    # dependencies on flows not selected are ignored
+    results = run_flows([_flow('b', ['a']), _flow('a')], _run_flow, flow_name='b', jobs=2)
+    assert results[0][0] == 'b'
+
+    with pytest.raises(ZeroDivisionError):
+        run_flows([_flow('a'), _flow('b')], _failing_flow, jobs=2)
+
+
+def _failing_flow(wfl):
+    if wfl['file'] == 'b':
+        return 1 / 0
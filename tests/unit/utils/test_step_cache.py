@@ -0,0 +1,126 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from onecode import Env, Project, cached
+from tests.utils.flow_cli import _clean_flow, _generate_flow_name
+
+
+def _setup_data_root():
+    _, folder, _ = _generate_flow_name()
+    tmp = _clean_flow(folder)
+    data_path = os.path.join(tmp, folder, 'data')
+
+    os.makedirs(data_path)
+    os.environ[Env.ONECODE_PROJECT_DATA] = data_path
+    Project().reset()
+
+    return os.path.join(tmp, folder)
+
+
+def test_cached():
+    folder_path = _setup_data_root()
+    calls = []
+
+    @cached
+    def step(arr, df, factor=1):
+        calls.append(factor)
+        return {"sum": arr.sum() * factor, "df": df * factor}
+
+    arr = np.arange(10)
+    df = pd.DataFrame({"x": [1, 2, 3], "y": ['a', 'b', 'c']})
+
+    r1 = step(arr, df[['x']], factor=2)
+    r2 = step(arr.copy(), df[['x']].copy(), factor=2)
+    assert calls == [2]
+    assert r1["sum"] == r2["sum"] == 90
+    pd.testing.assert_frame_equal(r1["df"], r2["df"])
+
+    # any argument change is a cache miss
+    step(arr, df[['x']], factor=3)
+    step(arr[::-1], df[['x']], factor=2)
+    step(arr, df[['x']] + 1, factor=2)
+    step(arr, df[['x']].rename(columns={"x": "z"}), factor=2)
+    assert calls == [2, 3, 2, 2, 2]
+
+    step(arr, df[['x']], factor=3)
+    assert calls == [2, 3, 2, 2, 2]
+
+    # not picklable: always executed
+    @cached
+    def apply(func, x):
+        calls.append(func(x))
+
+    apply(lambda x: x, 1)
+    apply(lambda x: x, 1)
+    assert calls[-2:] == [1, 1]
+
+    # same name, different code
+    @cached
+    def step(arr, df, factor=1):    # noqa: F811
+        calls.append(-factor)
+        return None
+
+    assert step(arr, df[['x']], factor=2) is None
+    assert step(arr, df[['x']], factor=2) is None
+    assert calls[-1] == -2 and len(calls) == 8
+
+    assert os.path.isdir(os.path.join(Project().data_root, '.cache', 'steps'))
+
+    shutil.rmtree(folder_path)
+
+
+def test_cached_eviction():
+    folder_path = _setup_data_root()
+    calls = []
+
+    @cached(max_size=2500)
+    def step(i):
+        calls.append(i)
+        return np.full(100, i)   # ~ 1kB pickled
+
+    for i in range(3):
+        step(i)
+        # mtime resolution may be coarse: ensure a strict LRU order
+        for e in os.scandir(os.path.join(Project().data_root, '.cache', 'steps')):
+            os.utime(e.path, ns=(e.stat().st_mtime_ns - 10**9, e.stat().st_mtime_ns - 10**9))
+
+    # first result evicted, others kept
+    step(1)
+    step(2)
+    assert calls == [0, 1, 2]
+
+    step(0)
+    assert calls == [0, 1, 2, 0]
+
+    shutil.rmtree(folder_path)
+
+
+def test_cached_parquet():
+    pytest.importorskip('pyarrow')
+    folder_path = _setup_data_root()
+    calls = []
+
+    @cached(serializer='parquet')
+    def step(n):
+        calls.append(n)
+        return pd.DataFrame({"x": range(n)}) if n > 0 else n
+
+    pd.testing.assert_frame_equal(step(3), step(3))
+    assert step(0) == step(0) == 0
+    assert calls == [3, 0]
+
+    steps_dir = os.path.join(Project().data_root, '.cache', 'steps')
+    assert sorted(os.path.splitext(f)[1] for f in os.listdir(steps_dir)) == ['.parquet', '.pkl']
+
+    shutil.rmtree(folder_path)
+
+
+def test_cached_invalid_serializer():
+    with pytest.raises(ValueError) as excinfo:
+        cached(serializer='json')
+
+    assert str(excinfo.value) == "Invalid serializer json, must be one of ['pickle', 'parquet']"
@@ -0,0 +1,59 @@
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+import pytest
+from typeguard import check_type
+from typing_extensions import Annotated, Literal
+
+from onecode import is_type, type_validator
+
+_VALUES = [
+    None, True, 1, 1.5, 1 + 2j, 'a', b'a', np.float64(1), np.int64(1), [1, 2], [1, 'a'], ['a', 1],
+    (1,), {'a': 1}, pd.DataFrame()
+]
+
+
+def _typeguard_is_type(obj, t):
+    try:
+        check_type(value=obj, expected_type=t)
+        return True
+    except Exception:
+        return False
+
+
+@pytest.mark.parametrize("t", [
+    Any, bool, int, float, complex, str, bytes, list, pd.DataFrame, type(None), Optional[int],
+    Union[float, int], Union[str, int, float], Optional[Union[str, bool]], List[Any],
+    List[str], List[float], Dict[str, int], Literal['a', 1]
+])
+def test_type_validator_matches_typeguard(t):
+    validate = type_validator(t)
+
+    for value in _VALUES:
+        # unlike typeguard, all list items are checked
+        expected = _typeguard_is_type(value, t) and not (
+            t in (List[str], List[float]) and value in ([1, 'a'], ['a', 1])
+        )
+        assert validate(value) is expected, value
+        assert is_type(value, t) is expected, value
+
+
+def test_type_validator_lists():
+    validate = type_validator(List[Union[str, int, float]])
+
+    assert validate(['a', 1, 2.5] * 1000)
+    assert not validate(['a', 1, 2.5, None])
+    assert not validate(('a', 1))
+
+    assert type_validator(List[Optional[List[int]]])([[1], None, []])
+    assert not type_validator(List[Optional[List[int]]])([[1], None, ['a']])
+
+
+def test_type_validator_cache():
+    assert type_validator(Union[str, int]) is type_validator(Union[str, int])
+
+    # unhashable typings are not cached
+    t = Annotated[int, ['unhashable']]
+    assert type_validator(t)(1)
+    assert not type_validator(t)('a')